@@ -1,23 +1,35 @@
 from __future__ import annotations
 
+from dataclasses import replace
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
 from axlab.core.term import Term
 from axlab.interpretation import InterpretationConfig, interpret_axiom
 from axlab.interpretation.validation import validate_dossier_citations
 from axlab.pipeline.runner import (
+    BatteryResultCache,
+    RunOptions,
     compute_axiom_id,
     compute_run_id,
-    load_results,
-    load_results_as_battery,
-    load_run_from_store,
+    iter_results,
+    iter_results_as_battery,
+    iter_run_from_store,
+    load_result_entries,
+    load_run,
+    load_run_columns,
     load_run_manifest,
+    load_stored_result_entries,
+    replay_results,
+    replay_run_from_store,
     resolve_results_path,
     run_battery_and_persist,
-    serialize_battery_results,
+    upgrade_run_and_persist,
 )
 from axlab.pipeline.battery import analyze_axiom
+from axlab.pipeline.cache import ProofCache
+from axlab.pipeline.scheduler import RunBudget
 from axlab.api.state import EnvironmentState
 
 
@@ -34,6 +46,12 @@ def _finalize_dossier(dossier: Any) -> Dict[str, Any]:
     return data
 
 
+def _proof_cache(state: EnvironmentState) -> ProofCache | None:
+    if state.store is None:
+        return None
+    return ProofCache(state.store)
+
+
 def dispatch(state: EnvironmentState, request: Dict[str, Any]) -> Dict[str, Any]:
     action = request.get("action")
     payload = request.get("payload", {})
@@ -43,7 +61,11 @@ def dispatch(state: EnvironmentState, request: Dict[str, Any]) -> Dict[str, Any]
     if handler is None:
         return {"status": "error", "error": f"Unknown action: {action}"}
     try:
-        data = handler(state, payload)
+        if state.store is None:
+            data = handler(state, payload)
+        else:
+            with state.store.session():
+                data = handler(state, payload)
         return {"status": "ok", "data": data}
     except ActionError as exc:
         return {"status": "error", "error": str(exc)}
@@ -94,7 +116,22 @@ def _action_run_battery(state: EnvironmentState, payload: Dict[str, Any]) -> Dic
     axioms = _resolve_axioms(state, payload)
     if not axioms:
         raise ActionError("No axioms provided.")
-    run_id = compute_run_id(state.spec, axioms, state.battery_config)
+    workers = int(payload.get("workers", 1))
+    if workers < 1:
+        raise ActionError("workers must be >= 1.")
+    store_batch_size = int(payload.get("store_batch_size", 32))
+    if store_batch_size < 1:
+        raise ActionError("store_batch_size must be >= 1.")
+    store_queue_size = int(payload.get("store_queue_size", 64))
+    if store_queue_size < 1:
+        raise ActionError("store_queue_size must be >= 1.")
+    budget = None
+    if payload.get("budget") is not None:
+        try:
+            budget = RunBudget(**payload["budget"])
+        except TypeError as exc:
+            raise ActionError(f"Invalid budget: {exc}") from exc
+    run_id = compute_run_id(state.spec, axioms, state.battery_config, budget)
     output_dir = state.output_root / run_id
     manifest = run_battery_and_persist(
         state.spec,
@@ -102,37 +139,113 @@ def _action_run_battery(state: EnvironmentState, payload: Dict[str, Any]) -> Dic
         output_dir,
         config=state.battery_config,
         store=state.store,
+        options=RunOptions(
+            workers=workers,
+            use_result_cache=bool(payload.get("use_result_cache", True)),
+            profile=bool(payload.get("profile", False)),
+            store_batch_size=store_batch_size,
+            graded_novelty=bool(payload.get("graded_novelty", False)),
+            columnar=bool(payload.get("columnar", False)),
+            background_store=bool(payload.get("background_store", False)),
+            store_queue_size=store_queue_size,
+        ),
+        budget=budget,
     )
     state.run_history.append(manifest.run_id)
+    response = {
+        "run_id": manifest.run_id,
+        "axiom_count": manifest.axiom_count,
+        "results_path": manifest.results_path,
+    }
+    if manifest.profile is not None:
+        response["profile"] = manifest.profile
+    if manifest.schedule is not None:
+        response["schedule"] = manifest.schedule
+    if manifest.result_cache is not None:
+        response["result_cache"] = manifest.result_cache
+    return response
+
+
+def _action_upgrade_run(state: EnvironmentState, payload: Dict[str, Any]) -> Dict[str, Any]:
+    parent_run_id = payload.get("run_id")
+    if parent_run_id is None:
+        raise ActionError("Provide run_id.")
+    try:
+        config = replace(state.battery_config, **payload.get("battery_config", {}))
+    except TypeError as exc:
+        raise ActionError(f"Invalid battery_config: {exc}") from exc
+    workers = int(payload.get("workers", 1))
+    if workers < 1:
+        raise ActionError("workers must be >= 1.")
+    run_dir = payload.get("run_dir", state.output_root / str(parent_run_id))
+    try:
+        parent_manifest, parent_results = load_run(str(parent_run_id), state.store, run_dir)
+        run_id = compute_run_id(
+            state.spec,
+            [axiom for axiom, _ in parent_results],
+            config,
+            parent_run_id=parent_manifest.run_id,
+        )
+        manifest = upgrade_run_and_persist(
+            state.spec,
+            parent_manifest,
+            parent_results,
+            state.output_root / run_id,
+            config,
+            store=state.store,
+            options=RunOptions(workers=workers, profile=bool(payload.get("profile", False))),
+        )
+    except ValueError as exc:
+        raise ActionError(str(exc)) from exc
+    state.run_history.append(manifest.run_id)
     return {
         "run_id": manifest.run_id,
+        "parent_run_id": manifest.parent_run_id,
         "axiom_count": manifest.axiom_count,
         "results_path": manifest.results_path,
     }
 
 
+def _results_page(payload: Dict[str, Any]) -> Tuple[int, int | None]:
+    offset = int(payload.get("offset", 0))
+    if offset < 0:
+        raise ActionError("offset must be >= 0.")
+    if payload.get("limit") is None:
+        return offset, None
+    limit = int(payload["limit"])
+    if limit < 0:
+        raise ActionError("limit must be >= 0.")
+    return offset, offset + limit
+
+
 def _action_load_run(state: EnvironmentState, payload: Dict[str, Any]) -> Dict[str, Any]:
     include_results = bool(payload.get("include_results", False))
     run_id = payload.get("run_id")
     run_dir = payload.get("run_dir")
+    start, stop = _results_page(payload)
     if run_id is not None:
         if state.store is None:
             raise ActionError("Store is required to load by run_id.")
-        manifest, hydrated = load_run_from_store(state.store, str(run_id))
-        results_path = manifest.results_path
+        try:
+            if include_results:
+                manifest, results = replay_run_from_store(state.store, str(run_id), start, stop)
+            else:
+                manifest, _ = iter_run_from_store(state.store, str(run_id))
+        except ValueError as exc:
+            raise ActionError(str(exc)) from exc
         data = {
-            "manifest": manifest.__dict__,
-            "results_path": results_path,
+            "manifest": manifest.to_dict(),
+            "results_path": manifest.results_path,
         }
         if include_results:
-            data["results"] = serialize_battery_results(hydrated)
+            data["results"] = results
         return data
     if run_dir is not None:
         manifest = load_run_manifest(Path(run_dir) / "run.json")
         results_path = resolve_results_path(manifest.results_path, run_dir)
-        data = {"manifest": manifest.__dict__, "results_path": manifest.results_path}
+        data = {"manifest": manifest.to_dict(), "results_path": manifest.results_path}
         if include_results:
-            data["results"] = load_results(results_path)
+            data["results"] = list(islice(iter_results(results_path), start, stop))
         return data
     raise ActionError("Provide run_id or run_dir.")
 
@@ -140,21 +253,24 @@ def _action_load_run(state: EnvironmentState, payload: Dict[str, Any]) -> Dict[s
 def _action_replay_run(state: EnvironmentState, payload: Dict[str, Any]) -> Dict[str, Any]:
     run_id = payload.get("run_id")
     run_dir = payload.get("run_dir")
+    start, stop = _results_page(payload)
     if run_id is not None:
         if state.store is None:
             raise ActionError("Store is required to load by run_id.")
-        manifest, results = load_run_from_store(state.store, str(run_id))
+        try:
+            manifest, results = replay_run_from_store(state.store, str(run_id), start, stop)
+        except ValueError as exc:
+            raise ActionError(str(exc)) from exc
         return {
-            "manifest": manifest.__dict__,
-            "results": serialize_battery_results(results),
+            "manifest": manifest.to_dict(),
+            "results": results,
         }
     if run_dir is not None:
         manifest = load_run_manifest(Path(run_dir) / "run.json")
         results_path = resolve_results_path(manifest.results_path, run_dir)
-        results = load_results_as_battery(results_path)
         return {
-            "manifest": manifest.__dict__,
-            "results": serialize_battery_results(results),
+            "manifest": manifest.to_dict(),
+            "results": replay_results(manifest, results_path, start, stop),
         }
     raise ActionError("Provide run_id or run_dir.")
 
@@ -191,6 +307,51 @@ def _action_compare_metrics(state: EnvironmentState, payload: Dict[str, Any]) ->
     }
 
 
+def _action_rank_run(state: EnvironmentState, payload: Dict[str, Any]) -> Dict[str, Any]:
+    run_id = payload.get("run_id")
+    metric = payload.get("metric")
+    if run_id is None or metric is None:
+        raise ActionError("run_id and metric are required.")
+    k = int(payload.get("k", 10))
+    if k < 1:
+        raise ActionError("k must be >= 1.")
+    try:
+        columns = load_run_columns(str(run_id), state.store, payload.get("run_dir"))
+    except ValueError as exc:
+        raise ActionError(str(exc)) from exc
+    try:
+        name = f"metric.{metric}"
+        if name not in columns.columns:
+            raise ActionError(f"Run {run_id} has no numeric metric {metric}.")
+        ranked = columns.top_k(name, k, descending=bool(payload.get("descending", True)))
+    finally:
+        columns.close()
+    return {
+        "run_id": str(run_id),
+        "metric": metric,
+        "ranked": [{"axiom_id": axiom_id, "value": value} for axiom_id, value in ranked],
+    }
+
+
+def _declared_peer_ids(payload: Dict[str, Any], config: InterpretationConfig) -> List[str] | None:
+    # Neighbors rank every peer, so only the full run answers an undeclared peer
+    # set; with declared peers (or no neighbors) just those lines are decoded.
+    if config.neighbor_count <= 0:
+        return []
+    if payload.get("peer_ids") is None:
+        return None
+    return [str(axiom_id) for axiom_id in payload["peer_ids"]]
+
+
+def _streamed_peers(
+    results: Iterable[Tuple[Tuple[Term, Term], Any]], target: Tuple[str, Tuple[Term, Term], Any]
+) -> Iterator[Tuple[str, Tuple[Term, Term], Any]]:
+    # The target's own line yields the target object so neighbors skip it.
+    for (left, right), result in results:
+        axiom_id = compute_axiom_id(left, right)
+        yield target if axiom_id == target[0] else (axiom_id, (left, right), result)
+
+
 def _action_interpret(state: EnvironmentState, payload: Dict[str, Any]) -> Dict[str, Any]:
     config = InterpretationConfig.from_battery_config(state.battery_config)
     config_payload = payload.get("config")
@@ -206,69 +367,42 @@ def _action_interpret(state: EnvironmentState, payload: Dict[str, Any]) -> Dict[
     if target_axiom is not None and not isinstance(target_axiom, dict):
         raise ActionError("Axiom entries must be objects with left/right.")
 
-    if run_id is not None:
-        if state.store is None:
+    if run_id is not None or run_dir is not None:
+        if run_id is not None and state.store is None:
             raise ActionError("Store is required to load by run_id.")
-        manifest, results = load_run_from_store(state.store, str(run_id))
-        peer_results: List[Tuple[str, Tuple[Term, Term], Any]] = []
-        target_result = None
-        target_terms = None
-        for (left, right), result in results:
-            axiom_id = compute_axiom_id(left, right)
-            peer_results.append((axiom_id, (left, right), result))
-            if target_axiom_id is not None and axiom_id == target_axiom_id:
-                target_result = result
-                target_terms = (left, right)
-            if target_axiom is not None:
-                if left.serialize() == str(target_axiom.get("left")) and right.serialize() == str(
-                    target_axiom.get("right")
-                ):
-                    target_result = result
-                    target_terms = (left, right)
-                    target_axiom_id = axiom_id
-        if target_result is None or target_terms is None:
-            raise ActionError("Axiom not found in run results.")
-        dossier = interpret_axiom(
-            state.spec,
-            target_terms,
-            target_result,
-            config,
-            peer_results=peer_results,
-        )
-        return {
-            "run_id": manifest.run_id,
-            "axiom_id": target_axiom_id,
-            "dossier": _finalize_dossier(dossier),
-        }
-
-    if run_dir is not None:
-        manifest = load_run_manifest(Path(run_dir) / "run.json")
-        results_path = resolve_results_path(manifest.results_path, run_dir)
-        results = load_results_as_battery(results_path)
-        peer_results = []
-        target_result = None
-        target_terms = None
-        for (left, right), result in results:
-            axiom_id = compute_axiom_id(left, right)
-            peer_results.append((axiom_id, (left, right), result))
-            if target_axiom is not None:
-                if left.serialize() == str(target_axiom.get("left")) and right.serialize() == str(
-                    target_axiom.get("right")
-                ):
-                    target_result = result
-                    target_terms = (left, right)
-                    target_axiom_id = axiom_id
-            if target_axiom_id is not None and axiom_id == target_axiom_id:
-                target_result = result
-                target_terms = (left, right)
-        if target_result is None or target_terms is None:
+        if target_axiom is not None:
+            if "left" not in target_axiom or "right" not in target_axiom:
+                raise ActionError("Axiom not found in run results.")
+            target_axiom_id = compute_axiom_id(
+                Term.parse(str(target_axiom["left"])), Term.parse(str(target_axiom["right"]))
+            )
+        peer_ids = _declared_peer_ids(payload, config)
+        wanted = [str(target_axiom_id), *(peer_ids or [])]
+        if run_id is not None:
+            manifest, entries = load_stored_result_entries(state.store, str(run_id), wanted)
+        else:
+            manifest = load_run_manifest(Path(run_dir) / "run.json")
+            results_path = resolve_results_path(manifest.results_path, run_dir)
+            entries = load_result_entries(results_path, wanted)
+        if not entries or entries[0][0] != target_axiom_id:
             raise ActionError("Axiom not found in run results.")
+        target = entries[0]
+        peer_results: Iterable[Tuple[str, Tuple[Term, Term], Any]] = entries
+        if peer_ids is None:
+            # Undeclared peers are the whole run, streamed lazily so only the
+            # implications of each line are decoded.
+            if run_id is not None:
+                _, results = iter_run_from_store(state.store, str(run_id), lazy=True)
+            else:
+                results = iter_results_as_battery(results_path, lazy=True)
+            peer_results = _streamed_peers(results, target)
         dossier = interpret_axiom(
             state.spec,
-            target_terms,
-            target_result,
+            target[1],
+            target[2],
             config,
             peer_results=peer_results,
+            cache=_proof_cache(state),
         )
         return {
             "run_id": manifest.run_id,
@@ -282,9 +416,23 @@ def _action_interpret(state: EnvironmentState, payload: Dict[str, Any]) -> Dict[
         raise ActionError("Axiom entries require left and right.")
     left = Term.parse(str(target_axiom["left"]))
     right = Term.parse(str(target_axiom["right"]))
-    result = analyze_axiom(state.spec, left, right, state.battery_config)
+    cache = _proof_cache(state)
+    if state.store is not None:
+        result = BatteryResultCache(state.store, state.spec, state.battery_config).analyze(
+            left, right, proof_cache=cache
+        )
+    else:
+        result = analyze_axiom(state.spec, left, right, state.battery_config)
     axiom_id = compute_axiom_id(left, right)
-    dossier = interpret_axiom(state.spec, (left, right), result, config, peer_results=None)
+    dossier = interpret_axiom(
+        state.spec,
+        (left, right),
+        result,
+        config,
+        peer_results=None,
+        cache=cache,
+        archive=state.store,
+    )
     return {"axiom_id": axiom_id, "dossier": _finalize_dossier(dossier)}
 
 
@@ -293,8 +441,10 @@ _HANDLERS: Dict[str, Callable[[EnvironmentState, Dict[str, Any]], Dict[str, Any]
     "enumerate": _action_enumerate,
     "run_battery": _action_run_battery,
     "run": _action_run_battery,
+    "upgrade_run": _action_upgrade_run,
     "load_run": _action_load_run,
     "replay_run": _action_replay_run,
+    "rank_run": _action_rank_run,
     "compare_metrics": _action_compare_metrics,
     "compare": _action_compare_metrics,
     "interpret": _action_interpret,
@@ -29,12 +29,15 @@ class EnvironmentState:
         output_root: str | Path,
         store_root: str | Path | None = None,
         battery_config: BatteryConfig | None = None,
+        store_shard: str | None = None,
     ) -> "EnvironmentState":
         if battery_config is None:
             battery_config = BatteryConfig()
         output_path = Path(output_root)
         output_path.mkdir(parents=True, exist_ok=True)
         store = ArtifactStore(store_root) if store_root is not None else None
+        if store is not None and store_shard is not None:
+            store = store.shard(store_shard)
         terms = list(enumerate_terms(spec))
         term_count = len(terms)
         return cls(
@@ -67,7 +70,7 @@ class EnvironmentState:
     def to_dict(self) -> dict:
         return {
             "spec": self.spec.to_dict(),
-            "battery_config": self.battery_config.__dict__,
+            "battery_config": self.battery_config.to_dict(),
             "output_root": str(self.output_root),
             "store_root": str(self.store.root) if self.store is not None else None,
             "run_count": len(self.run_history),
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from axlab.store import ArtifactStore
+
+
+def _stable_json(data: object) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Remove unreachable artifacts from an ArtifactStore and compact it."
+    )
+    parser.add_argument("--store", required=True, help="ArtifactStore root directory.")
+    parser.add_argument(
+        "--grace-seconds",
+        type=float,
+        default=3600.0,
+        help="Keep anything written more recently than this (default: 3600).",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report what would be removed without removing it."
+    )
+    parser.add_argument(
+        "--vacuum", action="store_true", help="Rebuild indexes and vacuum the SQLite database."
+    )
+    parser.add_argument(
+        "--repack",
+        action="store_true",
+        help="Rewrite plain artifact files of compressed kinds as chunks.",
+    )
+    parser.add_argument("--output", help="Output JSON path for the report (defaults to stdout).")
+    args = parser.parse_args(argv)
+
+    if args.grace_seconds < 0:
+        raise SystemExit("--grace-seconds must be >= 0.")
+    if not (Path(args.store) / "store.db").exists():
+        raise SystemExit(f"No ArtifactStore at {args.store}.")
+    store = ArtifactStore(args.store)
+    report = store.collect_garbage(
+        grace_seconds=args.grace_seconds,
+        dry_run=args.dry_run,
+        vacuum=args.vacuum,
+        repack=args.repack,
+    )
+
+    output_text = _stable_json(report)
+    if args.output:
+        Path(args.output).write_text(output_text + "\n", encoding="utf-8")
+    else:
+        print(output_text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,17 +3,21 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from axlab.core.term import Term
 from axlab.core.universe_spec import UniverseSpec
 from axlab.interpretation import InterpretationConfig, interpret_axiom
 from axlab.pipeline.battery import BatteryConfig, BatteryResult, analyze_axiom
+from axlab.pipeline.cache import ProofCache
 from axlab.pipeline.runner import (
+    BatteryResultCache,
     compute_axiom_id,
-    load_results_as_battery,
-    load_run_from_store,
+    iter_results_as_battery,
+    iter_run_from_store,
+    load_result_entries,
     load_run_manifest,
+    load_stored_result_entries,
     resolve_results_path,
 )
 from axlab.store import ArtifactStore
@@ -61,42 +65,43 @@ def _battery_config_for_direct(overrides: Dict[str, object]) -> BatteryConfig:
     )
 
 
-def _resolve_target_axiom(
-    results: List[Tuple[Tuple[Term, Term], BatteryResult]],
-    axiom_id: Optional[str],
-    axiom_left: Optional[str],
-    axiom_right: Optional[str],
-) -> Tuple[str, Tuple[Term, Term], BatteryResult, List[Tuple[str, Tuple[Term, Term], BatteryResult]]]:
-    target_terms: Optional[Tuple[Term, Term]] = None
-    target_result: Optional[BatteryResult] = None
-    target_axiom_id: Optional[str] = None
-    peer_results: List[Tuple[str, Tuple[Term, Term], BatteryResult]] = []
+def _declared_peer_ids(
+    peer_ids: Optional[List[str]], overrides: Dict[str, object]
+) -> Optional[List[str]]:
+    # Neighbors rank every peer, so only the full run answers an undeclared peer
+    # set; with declared peers (or no neighbors) just those lines are decoded.
+    if InterpretationConfig().override(overrides).neighbor_count <= 0:
+        return []
+    return peer_ids
+
+
+def _streamed_peers(
+    results: Iterable[Tuple[Tuple[Term, Term], BatteryResult]],
+    target: Tuple[str, Tuple[Term, Term], BatteryResult],
+) -> Iterator[Tuple[str, Tuple[Term, Term], BatteryResult]]:
+    # The target's own line yields the target object so neighbors skip it.
     for (left, right), result in results:
-        current_id = compute_axiom_id(left, right)
-        peer_results.append((current_id, (left, right), result))
-        if axiom_id is not None and current_id == axiom_id:
-            target_terms = (left, right)
-            target_result = result
-            target_axiom_id = current_id
-        if axiom_left is not None and axiom_right is not None:
-            if left.serialize() == axiom_left and right.serialize() == axiom_right:
-                target_terms = (left, right)
-                target_result = result
-                target_axiom_id = current_id
-    if target_terms is None or target_result is None or target_axiom_id is None:
-        raise SystemExit("Axiom not found in run results.")
-    return target_axiom_id, target_terms, target_result, peer_results
+        axiom_id = compute_axiom_id(left, right)
+        yield target if axiom_id == target[0] else (axiom_id, (left, right), result)
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Interpret an axiom into a theory dossier.")
     parser.add_argument("--spec", help="Path to UniverseSpec JSON (for direct axioms).")
-    parser.add_argument("--store", help="ArtifactStore root directory.")
+    parser.add_argument(
+        "--store",
+        help="ArtifactStore root directory (with --spec, caches direct-axiom results).",
+    )
     parser.add_argument("--run-id", help="Run identifier to load from the store.")
     parser.add_argument("--run-dir", help="Directory containing run.json and results.jsonl.")
     parser.add_argument("--axiom-id", help="Axiom identifier to interpret.")
     parser.add_argument("--axiom-left", help="Left term of the axiom.")
     parser.add_argument("--axiom-right", help="Right term of the axiom.")
+    parser.add_argument(
+        "--peer-id",
+        action="append",
+        help="Peer axiom for nearest neighbors (repeatable; defaults to the whole run).",
+    )
     parser.add_argument("--output", help="Output JSON path (defaults to stdout).")
     parser.add_argument("--max-model-size", type=int, help="Override max model size.")
     parser.add_argument("--max-model-candidates", type=int, help="Override max model candidates.")
@@ -106,7 +111,7 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.run_dir and (args.store or args.run_id):
         raise SystemExit("Use either --run-dir or --store/--run-id.")
-    if args.store and not args.run_id:
+    if args.store and not args.run_id and args.spec is None:
         raise SystemExit("--run-id is required with --store.")
     if args.run_id and not args.store:
         raise SystemExit("--store is required with --run-id.")
@@ -119,26 +124,45 @@ def main(argv: list[str] | None = None) -> int:
     if args.run_dir or args.run_id:
         if args.axiom_id is None and args.axiom_left is None:
             raise SystemExit("Provide --axiom-id or --axiom-left/--axiom-right for runs.")
+        if args.axiom_left is not None:
+            target_id = compute_axiom_id(Term.parse(args.axiom_left), Term.parse(args.axiom_right))
+        else:
+            target_id = args.axiom_id
+        peer_ids = _declared_peer_ids(args.peer_id, overrides)
+        wanted = [target_id, *(peer_ids or [])]
+        cache = None
+        store = None
         if args.run_dir:
             run_dir = Path(args.run_dir)
             manifest = load_run_manifest(run_dir / "run.json")
             results_path = resolve_results_path(manifest.results_path, run_dir)
-            results = load_results_as_battery(results_path)
+            entries = load_result_entries(results_path, wanted)
         else:
             store = ArtifactStore(args.store)
-            manifest, results = load_run_from_store(store, args.run_id)
+            manifest, entries = load_stored_result_entries(store, args.run_id, wanted)
+            cache = ProofCache(store)
+        if not entries or entries[0][0] != target_id:
+            raise SystemExit("Axiom not found in run results.")
+        target = entries[0]
+        peer_results: Iterable[Tuple[str, Tuple[Term, Term], BatteryResult]] = entries
+        if peer_ids is None:
+            # Undeclared peers are the whole run, streamed lazily so only the
+            # implications of each line are decoded.
+            if store is not None:
+                _, results = iter_run_from_store(store, args.run_id, lazy=True)
+            else:
+                results = iter_results_as_battery(results_path, lazy=True)
+            peer_results = _streamed_peers(results, target)
 
         config = _config_from_manifest(manifest.battery_config, overrides)
         spec = UniverseSpec.from_dict(manifest.spec)
-        axiom_id, target_terms, target_result, peer_results = _resolve_target_axiom(
-            results, args.axiom_id, args.axiom_left, args.axiom_right
-        )
         dossier = interpret_axiom(
             spec,
-            target_terms,
-            target_result,
+            target[1],
+            target[2],
             config,
             peer_results=peer_results,
+            cache=cache,
         )
         dossier_data = dossier.to_dict()
         try:
@@ -147,7 +171,7 @@ def main(argv: list[str] | None = None) -> int:
             raise SystemExit(str(exc)) from exc
         payload = {
             "run_id": manifest.run_id,
-            "axiom_id": axiom_id,
+            "axiom_id": target_id,
             "dossier": dossier_data,
         }
     else:
@@ -160,9 +184,20 @@ def main(argv: list[str] | None = None) -> int:
         config = _config_from_args(overrides)
         left = Term.parse(args.axiom_left)
         right = Term.parse(args.axiom_right)
-        result = analyze_axiom(spec, left, right, battery_config)
+        cache = None
+        store = None
+        if args.store:
+            store = ArtifactStore(args.store)
+            cache = ProofCache(store)
+            result = BatteryResultCache(store, spec, battery_config).analyze(
+                left, right, proof_cache=cache
+            )
+        else:
+            result = analyze_axiom(spec, left, right, battery_config)
         axiom_id = compute_axiom_id(left, right)
-        dossier = interpret_axiom(spec, (left, right), result, config, peer_results=None)
+        dossier = interpret_axiom(
+            spec, (left, right), result, config, peer_results=None, cache=cache, archive=store
+        )
         dossier_data = dossier.to_dict()
         try:
             validate_dossier_citations(dossier_data)
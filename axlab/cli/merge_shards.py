@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from axlab.store import ArtifactStore
+
+
+def _stable_json(data: object) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Merge writer shards into an ArtifactStore.")
+    parser.add_argument("--store", required=True, help="ArtifactStore root directory.")
+    parser.add_argument(
+        "--shard",
+        action="append",
+        help="Shard to merge (repeatable; defaults to every shard of the store).",
+    )
+    parser.add_argument(
+        "--remove", action="store_true", help="Delete each shard once it has been merged."
+    )
+    parser.add_argument("--output", help="Output JSON path for the report (defaults to stdout).")
+    args = parser.parse_args(argv)
+
+    if not (Path(args.store) / "store.db").exists():
+        raise SystemExit(f"No ArtifactStore at {args.store}.")
+    store = ArtifactStore(args.store)
+    try:
+        report = store.merge_shards(args.shard, remove=args.remove)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    output_text = _stable_json(report)
+    if args.output:
+        Path(args.output).write_text(output_text + "\n", encoding="utf-8")
+    else:
+        print(output_text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
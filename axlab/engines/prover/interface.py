@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, Protocol, Sequence, Tuple
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
 
 from axlab.core.term import Term
 from axlab.core.universe_spec import UniverseSpec
@@ -15,6 +15,7 @@ class ProofSearchConfig:
     max_steps: int = 4
     max_terms: int = 500
     rule_ordering: str = "given"
+    strategy: str = "bfs"
 
 
 @dataclass(frozen=True)
@@ -31,6 +32,7 @@ class ProofArtifact:
     proof: Optional[str]
     counterexample: Optional[str]
     steps: Optional[List[ProofStep]]
+    stats: Optional[Dict[str, int]] = None
 
 
 class Prover(Protocol):
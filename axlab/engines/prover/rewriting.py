@@ -24,7 +24,14 @@ class RewritingProver:
         left, right = goal
         if left.serialize() == right.serialize():
             step = ProofStep("reflexivity", left.serialize(), right.serialize())
-            return ProofArtifact("proved", time.monotonic() - start, "reflexivity", None, [step])
+            return ProofArtifact(
+                "proved",
+                time.monotonic() - start,
+                "reflexivity",
+                None,
+                [step],
+                {"terms_expanded": 0, "rewrites": 0},
+            )
 
         rules = []
         for idx, (lhs, rhs) in enumerate(axioms):
@@ -32,18 +39,31 @@ class RewritingProver:
             rules.append((f"axiom_{idx}_sym", rhs, lhs))
         rules = _order_rules(rules, config.rule_ordering)
 
+        # Rewrites spent normalizing still count when the search falls back to BFS.
+        rewrites = 0
+        if config.strategy == "normalize":
+            artifact, rewrites = _prove_by_normalization(axioms, goal, config, start, deadline)
+            if artifact is not None:
+                return artifact
+
         queue = deque([(left, [])])
         seen = {left.serialize()}
         expanded = 0
 
+        def stats() -> dict:
+            return {"terms_expanded": expanded, "rewrites": rewrites}
+
         while queue:
             if time.monotonic() >= deadline:
-                return ProofArtifact("timeout", time.monotonic() - start, None, None, None)
+                return ProofArtifact(
+                    "timeout", time.monotonic() - start, None, None, None, stats()
+                )
             term, steps = queue.popleft()
             if len(steps) >= config.max_steps:
                 continue
             for rule_name, lhs, rhs in rules:
                 for rewritten in _rewrite_term(term, lhs, rhs):
+                    rewrites += 1
                     serialized = rewritten.serialize()
                     if serialized in seen:
                         continue
@@ -57,16 +77,138 @@ class RewritingProver:
                             "rewrite",
                             None,
                             next_steps,
+                            stats(),
                         )
                     seen.add(serialized)
                     queue.append((rewritten, next_steps))
                     expanded += 1
                     if expanded >= config.max_terms:
                         return ProofArtifact(
-                            "cutoff", time.monotonic() - start, None, None, None
+                            "cutoff", time.monotonic() - start, None, None, None, stats()
                         )
 
-        return ProofArtifact("unknown", time.monotonic() - start, None, None, None)
+        return ProofArtifact("unknown", time.monotonic() - start, None, None, None, stats())
+
+
+class _NormalizationAborted(Exception):
+    pass
+
+
+class _Normalizer:
+    def __init__(
+        self, rules: list[tuple[str, Term, Term]], max_rewrites: int, deadline: float
+    ) -> None:
+        self.rules = rules
+        self.max_rewrites = max_rewrites
+        self.deadline = deadline
+        self.rewrites = 0
+        self.memo: dict[str, tuple[Term, list[tuple[str, Term, Term]]]] = {}
+        self.active: set[str] = set()
+
+    def normalize(self, term: Term) -> tuple[Term, list[tuple[str, Term, Term]]]:
+        key = term.serialize()
+        cached = self.memo.get(key)
+        if cached is not None:
+            return cached
+        if key in self.active:
+            raise _NormalizationAborted("loop")
+        self.active.add(key)
+        try:
+            current, steps = self._normalize_args(term)
+            for rule_name, lhs, rhs in self.rules:
+                mapping = _match(lhs, current, {})
+                if mapping is None:
+                    continue
+                rewritten = _apply_substitution(rhs, mapping)
+                self._tick()
+                steps.append((rule_name, current, rewritten))
+                current, rest = self.normalize(rewritten)
+                steps.extend(rest)
+                break
+        finally:
+            self.active.discard(key)
+        self.memo[key] = (current, steps)
+        return current, steps
+
+    def _normalize_args(self, term: Term) -> tuple[Term, list[tuple[str, Term, Term]]]:
+        steps: list[tuple[str, Term, Term]] = []
+        if term.kind == "var":
+            return term, steps
+        args = list(term.args)
+        for idx, arg in enumerate(term.args):
+            normal_arg, arg_steps = self.normalize(arg)
+            for rule_name, before, after in arg_steps:
+                steps.append(
+                    (
+                        rule_name,
+                        Term.op(term.value, args[:idx] + [before] + args[idx + 1 :]),
+                        Term.op(term.value, args[:idx] + [after] + args[idx + 1 :]),
+                    )
+                )
+            args[idx] = normal_arg
+        return Term.op(term.value, args), steps
+
+    def _tick(self) -> None:
+        self.rewrites += 1
+        if self.rewrites > self.max_rewrites:
+            raise _NormalizationAborted("budget")
+        if time.monotonic() >= self.deadline:
+            raise _NormalizationAborted("timeout")
+
+
+def _prove_by_normalization(
+    axioms: Sequence[Tuple[Term, Term]],
+    goal: Tuple[Term, Term],
+    config: ProofSearchConfig,
+    start: float,
+    deadline: float,
+) -> Tuple[Optional[ProofArtifact], int]:
+    rules = _order_rules(_oriented_rules(axioms), config.rule_ordering)
+    normalizer = _Normalizer(rules, config.max_terms, deadline)
+    try:
+        left_normal, left_steps = normalizer.normalize(goal[0])
+        right_normal, right_steps = normalizer.normalize(goal[1])
+    except (_NormalizationAborted, RecursionError):
+        return None, normalizer.rewrites
+    if left_normal.serialize() != right_normal.serialize():
+        return None, normalizer.rewrites
+    steps = [
+        ProofStep(rule_name, before.serialize(), after.serialize())
+        for rule_name, before, after in left_steps
+    ]
+    steps.extend(
+        ProofStep(_inverse_rule(rule_name), after.serialize(), before.serialize())
+        for rule_name, before, after in reversed(right_steps)
+    )
+    stats = {"terms_expanded": len(normalizer.memo), "rewrites": normalizer.rewrites}
+    return (
+        ProofArtifact("proved", time.monotonic() - start, "normalize", None, steps, stats),
+        normalizer.rewrites,
+    )
+
+
+def _oriented_rules(axioms: Sequence[Tuple[Term, Term]]) -> list[tuple[str, Term, Term]]:
+    rules = []
+    for idx, (lhs, rhs) in enumerate(axioms):
+        if not _size_decreasing(lhs, rhs) and _size_decreasing(rhs, lhs):
+            rules.append((f"axiom_{idx}_sym", rhs, lhs))
+        else:
+            rules.append((f"axiom_{idx}", lhs, rhs))
+    return rules
+
+
+def _size_decreasing(lhs: Term, rhs: Term) -> bool:
+    if lhs.kind == "var" or lhs.size() <= rhs.size():
+        return False
+    lhs_vars = lhs.vars()
+    rhs_vars = rhs.vars()
+    return all(rhs_vars.count(name) <= lhs_vars.count(name) for name in set(rhs_vars))
+
+
+def _inverse_rule(rule_name: str) -> str:
+    if rule_name.endswith("_sym"):
+        return rule_name[: -len("_sym")]
+    return f"{rule_name}_sym"
 
 
 def _order_rules(
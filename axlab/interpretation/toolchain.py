@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
@@ -9,7 +10,10 @@ from axlab.core.universe_spec import UniverseSpec
 from axlab.engines.model_finder.interface import ModelSearchConfig
 from axlab.engines.model_finder.naive import find_model_with_constraints
 from axlab.pipeline.battery import BatteryConfig, BatteryResult
+from axlab.pipeline.cache import ProofCache, engine_name
 from axlab.pipeline.implications import ImplicationProbe, library_for_spec
+from axlab.pipeline.metrics import similarity_vector
+from axlab.store import ArtifactStore
 
 
 @dataclass(frozen=True)
@@ -134,8 +138,10 @@ def interpret_axiom(
     result: BatteryResult,
     config: InterpretationConfig,
     peer_results: Optional[
-        List[Tuple[str, Tuple[Term, Term], BatteryResult]]
+        Iterable[Tuple[str, Tuple[Term, Term], BatteryResult]]
     ] = None,
+    cache: Optional[ProofCache] = None,
+    archive: Optional[ArtifactStore] = None,
 ) -> TheoryDossier:
     left, right = axiom
     canon_left, canon_right = canonicalize_equation(left, right, spec)
@@ -143,14 +149,19 @@ def interpret_axiom(
     minimal_basis = [canonical_axiom]
 
     properties = _properties_from_implications(result.implications)
-    benchmark_identities = _run_benchmark_suite(spec, (canon_left, canon_right), config)
+    benchmark_identities = _run_benchmark_suite(spec, (canon_left, canon_right), config, cache)
     model_pretty = _pretty_models(spec, result.model_spectrum)
-    translations = _translation_search(spec, (canon_left, canon_right), result.implications, config)
-    nearest_neighbors = _nearest_neighbors(
-        result,
-        peer_results,
-        config.neighbor_count,
+    translations = _translation_search(
+        spec, (canon_left, canon_right), result.implications, config, cache
     )
+    if peer_results is None and archive is not None:
+        nearest_neighbors = _archive_neighbors(axiom, result, archive, config.neighbor_count)
+    else:
+        nearest_neighbors = _nearest_neighbors(
+            result,
+            peer_results,
+            config.neighbor_count,
+        )
     derived_laws = _derived_laws(properties, benchmark_identities)
     facts = _build_facts(result, properties, benchmark_identities, translations, nearest_neighbors)
     narrative = _compile_narrative(canonical_axiom, result, properties, benchmark_identities, facts)
@@ -237,7 +248,10 @@ def _benchmark_identities(spec: UniverseSpec) -> List[Tuple[str, Term, Term]]:
 
 
 def _run_benchmark_suite(
-    spec: UniverseSpec, axiom: Tuple[Term, Term], config: InterpretationConfig
+    spec: UniverseSpec,
+    axiom: Tuple[Term, Term],
+    config: InterpretationConfig,
+    cache: Optional[ProofCache] = None,
 ) -> List[BenchmarkIdentityResult]:
     search_config = ModelSearchConfig(
         max_candidates=config.max_model_candidates,
@@ -246,7 +260,7 @@ def _run_benchmark_suite(
     results: List[BenchmarkIdentityResult] = []
     for name, left, right in _benchmark_identities(spec):
         status, counterexample_size, counterexample_fingerprint = _implication_status(
-            spec, [axiom], (left, right), config.max_model_size, search_config
+            spec, [axiom], (left, right), config.max_model_size, search_config, cache
         )
         results.append(
             BenchmarkIdentityResult(
@@ -267,7 +281,32 @@ def _implication_status(
     identity: Tuple[Term, Term],
     max_model_size: int,
     search_config: ModelSearchConfig,
+    cache: Optional[ProofCache] = None,
 ) -> Tuple[str, Optional[int], Optional[str]]:
+    engine = engine_name(find_model_with_constraints)
+    if cache is not None:
+        cached = cache.lookup_implication(
+            spec, axioms, identity, engine, max_model_size, search_config
+        )
+        if cached is not None:
+            return cached[0]
+    outcome, decided_below = _search_implication(
+        spec, axioms, identity, max_model_size, search_config
+    )
+    if cache is not None:
+        cache.record_implication(
+            spec, axioms, identity, engine, max_model_size, search_config, outcome, decided_below
+        )
+    return outcome
+
+
+def _search_implication(
+    spec: UniverseSpec,
+    axioms: List[Tuple[Term, Term]],
+    identity: Tuple[Term, Term],
+    max_model_size: int,
+    search_config: ModelSearchConfig,
+) -> Tuple[Tuple[str, Optional[int], Optional[str]], bool]:
     counterexample_size = None
     counterexample_fingerprint = None
     cutoff = False
@@ -286,10 +325,10 @@ def _implication_status(
         if result.status in ("timeout", "cutoff"):
             cutoff = True
     if counterexample_size is not None:
-        return "counterexample", counterexample_size, counterexample_fingerprint
+        return ("counterexample", counterexample_size, counterexample_fingerprint), not cutoff
     if cutoff:
-        return "inconclusive", None, None
-    return "confirmed", None, None
+        return ("inconclusive", None, None), False
+    return ("confirmed", None, None), True
 
 
 def _pretty_models(spec: UniverseSpec, spectrum: Sequence[Any]) -> List[PrettyModel]:
@@ -336,6 +375,7 @@ def _translation_search(
     axiom: Tuple[Term, Term],
     implications: Sequence[ImplicationProbe],
     config: InterpretationConfig,
+    cache: Optional[ProofCache] = None,
 ) -> List[TranslationCandidate]:
     search_config = ModelSearchConfig(
         max_candidates=config.max_model_candidates,
@@ -359,6 +399,7 @@ def _translation_search(
                 axiom,
                 config.max_model_size,
                 search_config,
+                cache,
             )
             if theory_implies == "confirmed":
                 status = "equivalent"
@@ -383,29 +424,63 @@ def _translation_search(
 
 def _nearest_neighbors(
     result: BatteryResult,
-    peer_results: Optional[List[Tuple[str, Tuple[Term, Term], BatteryResult]]],
+    peer_results: Optional[Iterable[Tuple[str, Tuple[Term, Term], BatteryResult]]],
     count: int,
 ) -> List[NearestNeighbor]:
-    if not peer_results or count <= 0:
+    # Peers may be a stream over a whole run; only the best ``count`` are kept.
+    if peer_results is None or count <= 0:
         return []
     target_sig = _implication_signature(result.implications)
-    neighbors: List[NearestNeighbor] = []
-    for axiom_id, (left, right), peer in peer_results:
-        if peer is result:
-            continue
-        signature = _implication_signature(peer.implications)
-        distance, shared_confirmed = _signature_distance(target_sig, signature)
-        neighbors.append(
-            NearestNeighbor(
+
+    def candidates() -> Iterable[NearestNeighbor]:
+        for axiom_id, (left, right), peer in peer_results:
+            if peer is result:
+                continue
+            signature = _implication_signature(peer.implications)
+            distance, shared_confirmed = _signature_distance(target_sig, signature)
+            yield NearestNeighbor(
                 axiom_id=axiom_id,
                 left=left.serialize(),
                 right=right.serialize(),
                 distance=distance,
                 shared_confirmed=shared_confirmed,
             )
+
+    return heapq.nsmallest(count, candidates(), key=lambda item: (item.distance, item.axiom_id))
+
+
+def _archive_neighbors(
+    axiom: Tuple[Term, Term],
+    result: BatteryResult,
+    archive: ArtifactStore,
+    count: int,
+) -> List[NearestNeighbor]:
+    # LSH candidates from the whole store, re-ranked with the same signature
+    # distance as in-run neighbors. Over-fetch so that dropping repeats of one
+    # axiom across runs still leaves ``count`` neighbors.
+    if count <= 0:
+        return []
+    target = (axiom[0].serialize(), axiom[1].serialize())
+    target_sig = _implication_signature(result.implications)
+    vector = similarity_vector(result.model_spectrum, result.implications, result.metrics)
+    neighbors: Dict[str, NearestNeighbor] = {}
+    for (run_id, axiom_id), _ in archive.vector_index().query(vector, count * 4):
+        if axiom_id in neighbors:
+            continue
+        record = archive.load_axiom(run_id, axiom_id)
+        if record is None or (record.left_term, record.right_term) == target:
+            continue
+        signature = _implication_signature(archive.load_implications(run_id, axiom_id))
+        distance, shared_confirmed = _signature_distance(target_sig, signature)
+        neighbors[axiom_id] = NearestNeighbor(
+            axiom_id=axiom_id,
+            left=record.left_term,
+            right=record.right_term,
+            distance=distance,
+            shared_confirmed=shared_confirmed,
         )
-    neighbors.sort(key=lambda item: (item.distance, item.axiom_id))
-    return neighbors[:count]
+    ranked = sorted(neighbors.values(), key=lambda item: (item.distance, item.axiom_id))
+    return ranked[:count]
 
 
 def _implication_signature(implications: Sequence[ImplicationProbe]) -> Dict[str, int]:
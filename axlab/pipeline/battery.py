@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Callable, List, Optional, Tuple
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from axlab.core.canonicalization import canonicalize_equation
 from axlab.core.perturbation import enumerate_neighbor_axioms
@@ -16,8 +18,15 @@ from axlab.engines.model_finder.prunable import (
     find_model as find_model_prunable,
     find_model_with_constraints as find_model_with_constraints_prunable,
 )
-from axlab.pipeline.implications import ImplicationConfig, ImplicationProbe, run_implication_probes
+from axlab.pipeline.cache import ProofCache, engine_name, merge_signatures
+from axlab.pipeline.implications import (
+    ImplicationConfig,
+    ImplicationProbe,
+    library_for_spec,
+    run_implication_probes,
+)
 from axlab.pipeline.metrics import compute_metrics, compute_novelty_vs_archive
+from axlab.pipeline.profiling import Profiler
 
 
 @dataclass(frozen=True)
@@ -33,6 +42,21 @@ class BatteryConfig:
     perturbation_max_model_size: Optional[int] = None
     perturbation_max_model_candidates: Optional[int] = None
     perturbation_max_model_seconds: Optional[float] = None
+    early_exit: str = "none"
+    proof_strategy: str = "bfs"
+
+    def to_dict(self) -> dict:
+        # Fields added after run ids were first recorded are left out while at their
+        # defaults, so run ids and manifests of earlier configs do not change.
+        data = dict(self.__dict__)
+        for name in _LATER_CONFIG_FIELDS:
+            if data[name] == _CONFIG_DEFAULTS[name]:
+                del data[name]
+        return data
+
+
+_LATER_CONFIG_FIELDS = ("early_exit", "proof_strategy")
+_CONFIG_DEFAULTS = {item.name: item.default for item in fields(BatteryConfig)}
 
 
 @dataclass(frozen=True)
@@ -80,6 +104,54 @@ class BatteryResult:
     implications: List[ImplicationProbe]
     perturbation_neighbors: List[PerturbationNeighbor]
     metrics: dict[str, Any]
+    skipped_stages: List[str] = field(default_factory=list)
+    derived_stages: List[str] = field(default_factory=list)
+    profile: Optional[dict] = None
+    escalations: List[dict] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class BatteryStage:
+    name: str
+    depends_on: Tuple[str, ...]
+    cost: int
+
+
+# Features and degeneracy are always computed first; early-exit policies use them
+# to decide how the remaining stages run.
+BATTERY_STAGES: Tuple[BatteryStage, ...] = (
+    BatteryStage("spectrum", (), 1),
+    BatteryStage("implications", ("spectrum",), 2),
+    BatteryStage("perturbation", ("spectrum",), 3),
+)
+
+EARLY_EXIT_POLICIES = ("none", "degenerate")
+
+# Model-search outcomes that no larger budget can change.
+_DECISIVE_MODEL_STATUSES = {"found", "not_found"}
+
+_STAGE_RUN = "run"
+_STAGE_DERIVE = "derive"
+_STAGE_SKIP = "skip"
+
+
+@dataclass
+class _StageContext:
+    spec: UniverseSpec
+    left: Term
+    right: Term
+    config: BatteryConfig
+    degeneracy: DegeneracyReport
+    find_model_fn: Callable[..., Any]
+    find_model_with_constraints_fn: Callable[..., Any]
+    proof_cache: Optional[ProofCache]
+    profiler: Optional[Profiler] = None
+    previous: Optional[BatteryResult] = None
+    signatures: Optional[SignatureTable] = None
+    model_spectrum: List[ModelSpectrumEntry] = field(default_factory=list)
+    smallest_model_size: Optional[int] = None
+    implications: List[ImplicationProbe] = field(default_factory=list)
+    perturbation_neighbors: List[PerturbationNeighbor] = field(default_factory=list)
 
 
 def _symmetry_class(left: Term, right: Term) -> str:
@@ -109,13 +181,22 @@ def _neighbor_signature(
     max_size: int,
     search_config: ModelSearchConfig,
     find_model_fn: Callable[[UniverseSpec, Term, Term, int, ModelSearchConfig], Any],
+    profiler: Optional[Profiler] = None,
+    previous_statuses: Sequence[str] = (),
 ) -> tuple[List[str], Optional[int]]:
     statuses: List[str] = []
     smallest: Optional[int] = None
     for size in range(1, max_size + 1):
-        result = find_model_fn(spec, left, right, size, search_config)
-        statuses.append(result.status)
-        if smallest is None and result.status == "found":
+        if size <= len(previous_statuses) and previous_statuses[size - 1] in _DECISIVE_MODEL_STATUSES:
+            status = previous_statuses[size - 1]
+        else:
+            result = find_model_fn(spec, left, right, size, search_config)
+            if profiler is not None:
+                profiler.count("perturbation.searches")
+                profiler.count("perturbation.candidates", result.candidates)
+            status = result.status
+        statuses.append(status)
+        if smallest is None and status == "found":
             smallest = size
     return statuses, smallest
 
@@ -136,13 +217,354 @@ def _resolve_model_finder(
     raise ValueError(f"Unknown model finder: {name}")
 
 
+def _stage_order(stages: Tuple[BatteryStage, ...]) -> List[BatteryStage]:
+    ordered: List[BatteryStage] = []
+    placed: set[str] = set()
+    pending = sorted(stages, key=lambda stage: stage.cost)
+    while pending:
+        ready = next(
+            (stage for stage in pending if all(dep in placed for dep in stage.depends_on)),
+            None,
+        )
+        if ready is None:
+            raise ValueError("Battery stage dependencies contain a cycle.")
+        ordered.append(ready)
+        placed.add(ready.name)
+        pending.remove(ready)
+    return ordered
+
+
+_STAGE_ORDER = _stage_order(BATTERY_STAGES)
+
+
+def _stage_actions(policy: str, degeneracy: DegeneracyReport) -> Dict[str, str]:
+    if policy not in EARLY_EXIT_POLICIES:
+        raise ValueError(f"Unknown early-exit policy: {policy}")
+    actions = {stage.name: _STAGE_RUN for stage in _STAGE_ORDER}
+    if policy == "degenerate":
+        if degeneracy.trivial_identity:
+            actions["implications"] = _STAGE_DERIVE
+            actions["perturbation"] = _STAGE_SKIP
+        elif degeneracy.constant_collapse:
+            actions["spectrum"] = _STAGE_DERIVE
+            actions["implications"] = _STAGE_DERIVE
+            actions["perturbation"] = _STAGE_SKIP
+    for stage in _STAGE_ORDER:
+        if any(actions[dep] == _STAGE_SKIP for dep in stage.depends_on):
+            actions[stage.name] = _STAGE_SKIP
+    return actions
+
+
+def _implication_config(config: BatteryConfig) -> ImplicationConfig:
+    return ImplicationConfig(
+        max_model_size=config.implication_max_model_size or config.max_model_size,
+        max_model_candidates=config.implication_max_model_candidates or config.max_model_candidates,
+        max_model_seconds=config.implication_max_model_seconds or config.max_model_seconds,
+        proof_strategy=config.proof_strategy,
+    )
+
+
+def _spectrum_search(config: BatteryConfig) -> ModelSearchConfig:
+    return ModelSearchConfig(
+        max_candidates=config.max_model_candidates,
+        max_seconds=config.max_model_seconds,
+    )
+
+
+def _neighbor_search(config: BatteryConfig) -> ModelSearchConfig:
+    return ModelSearchConfig(
+        max_candidates=config.perturbation_max_model_candidates or config.max_model_candidates,
+        max_seconds=config.perturbation_max_model_seconds or config.max_model_seconds,
+    )
+
+
+class SignatureTable:
+    # Model-search signatures (statuses for sizes 1..n) the store held when the run
+    # started, by canonical equation and engine, so each equation is looked up
+    # once per run. Signatures searched during the run go to the cache for later
+    # runs but are never served back to this one: an axiom's result must not depend
+    # on which axioms were analyzed before it, or by the same worker. Only
+    # found/not_found statuses are reused, since every other status depends on the
+    # budget and on the form that was searched. The table also holds the run's
+    # probes of x0 = x0, which may carry outcomes from the run's cache.
+    def __init__(self) -> None:
+        self.signatures: Dict[Tuple[str, str], List[str]] = {}
+        self.tautology_probes: Dict[str, List[ImplicationProbe]] = {}
+
+    def get(self, key: Tuple[str, str]) -> Optional[List[str]]:
+        return self.signatures.get(key)
+
+    def remember(self, key: Tuple[str, str], statuses: Sequence[str]) -> None:
+        self.signatures[key] = list(statuses)
+
+
+def _signature_key(ctx: _StageContext, left: Term, right: Term) -> Tuple[str, str]:
+    canon_left, canon_right = canonicalize_equation(left, right, ctx.spec)
+    return f"{canon_left.serialize()}={canon_right.serialize()}", engine_name(ctx.find_model_fn)
+
+
+def _known_signature(ctx: _StageContext, left: Term, right: Term) -> List[str]:
+    key = _signature_key(ctx, left, right)
+    if ctx.signatures is not None:
+        known = ctx.signatures.get(key)
+        if known is not None:
+            return known
+    if ctx.proof_cache is None:
+        return []
+    # The cache defers its writes during a run, so this is the store as it was
+    # when the run started.
+    known = ctx.proof_cache.lookup_signature(
+        ctx.spec, (left, right), engine_name(ctx.find_model_fn)
+    ) or []
+    if ctx.signatures is not None:
+        # Misses are remembered too, so the store is asked once per equation.
+        ctx.signatures.remember(key, known)
+    return known
+
+
+def _answers(statuses: Sequence[str], max_size: int) -> bool:
+    return len(statuses) >= max_size and all(
+        status in _DECISIVE_MODEL_STATUSES for status in statuses[:max_size]
+    )
+
+
+def _record_signature(
+    ctx: _StageContext,
+    left: Term,
+    right: Term,
+    search_config: ModelSearchConfig,
+    statuses: Sequence[str],
+) -> None:
+    # Only signatures that add to what the store already knows reach the cache.
+    if not statuses or ctx.proof_cache is None:
+        return
+    known = _known_signature(ctx, left, right)
+    if merge_signatures(known, statuses) != known:
+        ctx.proof_cache.record_signature(
+            ctx.spec, (left, right), engine_name(ctx.find_model_fn), search_config, statuses
+        )
+
+
+def _run_spectrum(ctx: _StageContext, sizes: range) -> None:
+    search_config = _spectrum_search(ctx.config)
+    reusable = {}
+    if ctx.previous is not None:
+        reusable = {
+            entry.size: entry
+            for entry in ctx.previous.model_spectrum
+            if entry.status in _DECISIVE_MODEL_STATUSES
+        }
+    for size in sizes:
+        entry = reusable.get(size)
+        if entry is None:
+            result = ctx.find_model_fn(ctx.spec, ctx.left, ctx.right, size, search_config)
+            if ctx.profiler is not None:
+                ctx.profiler.count("spectrum.searches")
+                ctx.profiler.count("spectrum.candidates", result.candidates)
+            entry = ModelSpectrumEntry(
+                size=size,
+                status=result.status,
+                fingerprint=result.fingerprint,
+                candidates=result.candidates,
+                elapsed_seconds=result.elapsed_seconds,
+            )
+        ctx.model_spectrum.append(entry)
+        if ctx.smallest_model_size is None and entry.status == "found":
+            ctx.smallest_model_size = size
+
+
+def _stage_spectrum(ctx: _StageContext) -> None:
+    _run_spectrum(ctx, range(1, ctx.config.max_model_size + 1))
+
+
+def _derive_spectrum(ctx: _StageContext) -> None:
+    # x = t with x absent from t identifies any two elements, so only the
+    # one-element structure is a model; larger sizes are empty by construction.
+    _run_spectrum(ctx, range(1, min(1, ctx.config.max_model_size) + 1))
+    for size in range(2, ctx.config.max_model_size + 1):
+        ctx.model_spectrum.append(
+            ModelSpectrumEntry(
+                size=size,
+                status="not_found",
+                fingerprint=None,
+                candidates=0,
+                elapsed_seconds=0.0,
+            )
+        )
+
+
+def _stage_implications(ctx: _StageContext) -> None:
+    # Models found by the spectrum stage are free counterexamples for every theory
+    # they violate.
+    known_models = [
+        (entry.size, entry.fingerprint)
+        for entry in ctx.model_spectrum
+        if entry.status == "found" and entry.fingerprint is not None
+    ]
+    empty_sizes = [entry.size for entry in ctx.model_spectrum if entry.status == "not_found"]
+    implication_config = _implication_config(ctx.config)
+    theories = library_for_spec(ctx.spec)
+    kept = _reusable_probes(ctx.previous, implication_config.max_model_size)
+    probes = run_implication_probes(
+        ctx.spec,
+        (ctx.left, ctx.right),
+        implication_config,
+        theories=[theory for theory in theories if theory.name not in kept],
+        model_finder_with_constraints=ctx.find_model_with_constraints_fn,
+        cache=ctx.proof_cache,
+        known_models=known_models,
+        empty_sizes=empty_sizes,
+        profiler=ctx.profiler,
+    )
+    fresh = {probe.theory: probe for probe in probes}
+    ctx.implications = [
+        kept[theory.name] if theory.name in kept else fresh[theory.name] for theory in theories
+    ]
+
+
+def _reusable_probes(
+    previous: Optional[BatteryResult], max_model_size: int
+) -> Dict[str, ImplicationProbe]:
+    # A counterexample stays minimal under any larger size cap, and "confirmed"
+    # only carries over when it was checked at least as far as now requested.
+    if previous is None:
+        return {}
+    kept: Dict[str, ImplicationProbe] = {}
+    for probe in previous.implications:
+        if probe.status == "counterexample" and (probe.counterexample_size or 0) <= max_model_size:
+            kept[probe.theory] = replace(probe, checked_max_size=max_model_size)
+        elif probe.status == "confirmed" and probe.checked_max_size >= max_model_size:
+            kept[probe.theory] = replace(probe, checked_max_size=max_model_size)
+    return kept
+
+
+# Probes of x0 = x0 per spec, implication budget and model finder, least recently
+# used first, for analyses without a proof cache (whose probes depend only on the
+# key). Few keys are live at a time, so the table stays small.
+_TAUTOLOGY_PROBES: "OrderedDict[str, List[ImplicationProbe]]" = OrderedDict()
+_TAUTOLOGY_LIMIT = 32
+
+
+def _derive_implications(ctx: _StageContext) -> None:
+    implication_config = _implication_config(ctx.config)
+    if ctx.degeneracy.trivial_identity:
+        # Every structure satisfies a trivial identity, so all of them share the
+        # probes of x0 = x0; compute those once per spec and budget.
+        key = json.dumps(
+            {
+                "spec": ctx.spec.to_dict(),
+                "config": implication_config.__dict__,
+                "model_finder": ctx.config.model_finder,
+            },
+            sort_keys=True,
+        )
+        # Probes read through a proof cache depend on that cache, so they are
+        # only shared within the run that owns it.
+        if ctx.proof_cache is None:
+            probes = _TAUTOLOGY_PROBES.get(key)
+            if probes is not None:
+                _TAUTOLOGY_PROBES.move_to_end(key)
+        elif ctx.signatures is not None:
+            probes = ctx.signatures.tautology_probes.get(key)
+        else:
+            probes = None
+        if probes is None:
+            x0 = Term.var("x0")
+            probes = run_implication_probes(
+                ctx.spec,
+                (x0, x0),
+                implication_config,
+                model_finder_with_constraints=ctx.find_model_with_constraints_fn,
+                cache=ctx.proof_cache,
+                profiler=ctx.profiler,
+            )
+            if ctx.proof_cache is None:
+                _TAUTOLOGY_PROBES[key] = probes
+                if len(_TAUTOLOGY_PROBES) > _TAUTOLOGY_LIMIT:
+                    _TAUTOLOGY_PROBES.popitem(last=False)
+            elif ctx.signatures is not None:
+                ctx.signatures.tautology_probes[key] = probes
+        ctx.implications = list(probes)
+        return
+    # Constant collapse: the one-element model satisfies every law.
+    ctx.implications = [
+        ImplicationProbe(
+            theory=theory.name,
+            status="confirmed",
+            checked_max_size=implication_config.max_model_size,
+            counterexample_size=None,
+            counterexample_fingerprint=None,
+        )
+        for theory in library_for_spec(ctx.spec)
+    ]
+
+
+def _stage_perturbation(ctx: _StageContext) -> None:
+    config = ctx.config
+    neighbor_limit = config.perturbation_max_neighbors
+    neighbor_max_size = config.perturbation_max_model_size or config.max_model_size
+    neighbor_max_size = min(neighbor_max_size, config.max_model_size)
+    if neighbor_limit <= 0 or neighbor_max_size <= 0:
+        return
+    neighbor_axioms = enumerate_neighbor_axioms(
+        ctx.spec, ctx.left, ctx.right, limit=neighbor_limit
+    )
+    neighbor_search = _neighbor_search(config)
+    previous_statuses: Dict[str, List[str]] = {}
+    if ctx.previous is not None:
+        previous_statuses = {
+            _symmetry_class(neighbor.left, neighbor.right): neighbor.model_statuses
+            for neighbor in ctx.previous.perturbation_neighbors
+        }
+    for n_left, n_right in neighbor_axioms:
+        known = _known_signature(ctx, n_left, n_right)
+        if ctx.profiler is not None and _answers(known, neighbor_max_size):
+            ctx.profiler.count("perturbation.signature_hits")
+        reusable = merge_signatures(
+            known, previous_statuses.get(_symmetry_class(n_left, n_right), [])
+        )
+        statuses, neighbor_smallest = _neighbor_signature(
+            ctx.spec,
+            n_left,
+            n_right,
+            neighbor_max_size,
+            neighbor_search,
+            ctx.find_model_fn,
+            ctx.profiler,
+            reusable,
+        )
+        _record_signature(ctx, n_left, n_right, neighbor_search, statuses)
+        ctx.perturbation_neighbors.append(
+            PerturbationNeighbor(
+                left=n_left,
+                right=n_right,
+                model_statuses=statuses,
+                smallest_model_size=neighbor_smallest,
+            )
+        )
+
+
+_STAGE_HANDLERS: Dict[str, Dict[str, Callable[[_StageContext], None]]] = {
+    "spectrum": {_STAGE_RUN: _stage_spectrum, _STAGE_DERIVE: _derive_spectrum},
+    "implications": {_STAGE_RUN: _stage_implications, _STAGE_DERIVE: _derive_implications},
+    "perturbation": {_STAGE_RUN: _stage_perturbation},
+}
+
+
 def analyze_axiom(
     spec: UniverseSpec,
     left: Term,
     right: Term,
     config: BatteryConfig | None = None,
     archive_lookup: Optional[Callable[[str], Any]] = None,
+    proof_cache: Optional[ProofCache] = None,
+    profiler: Optional[Profiler] = None,
+    previous: Optional[BatteryResult] = None,
+    signatures: Optional[SignatureTable] = None,
 ) -> BatteryResult:
+    # ``previous`` is a result for the same axiom under a weaker budget: outcomes
+    # that no larger budget can change are reused instead of searched again.
+    # ``signatures`` is the run's table of model-search signatures.
     if config is None:
         config = BatteryConfig()
     canon_left, canon_right = canonicalize_equation(left, right, spec)
@@ -170,62 +592,35 @@ def analyze_axiom(
         constant_collapse=_constant_collapse(canon_left, canon_right),
     )
 
-    model_spectrum: List[ModelSpectrumEntry] = []
-    smallest_model_size: Optional[int] = None
-    search_config = ModelSearchConfig(
-        max_candidates=config.max_model_candidates,
-        max_seconds=config.max_model_seconds,
-    )
-    for size in range(1, config.max_model_size + 1):
-        result = find_model_fn(spec, canon_left, canon_right, size, search_config)
-        model_spectrum.append(
-            ModelSpectrumEntry(
-                size=size,
-                status=result.status,
-                fingerprint=result.fingerprint,
-                candidates=result.candidates,
-                elapsed_seconds=result.elapsed_seconds,
-            )
-        )
-        if smallest_model_size is None and result.status == "found":
-            smallest_model_size = size
-
-    implication_config = ImplicationConfig(
-        max_model_size=config.implication_max_model_size or config.max_model_size,
-        max_model_candidates=config.implication_max_model_candidates or config.max_model_candidates,
-        max_model_seconds=config.implication_max_model_seconds or config.max_model_seconds,
-    )
-    implications = run_implication_probes(
-        spec,
-        (canon_left, canon_right),
-        implication_config,
-        model_finder_with_constraints=find_model_with_constraints_fn,
+    ctx = _StageContext(
+        spec=spec,
+        left=canon_left,
+        right=canon_right,
+        config=config,
+        degeneracy=degeneracy,
+        find_model_fn=find_model_fn,
+        find_model_with_constraints_fn=find_model_with_constraints_fn,
+        proof_cache=proof_cache,
+        profiler=profiler,
+        previous=previous,
+        signatures=signatures,
     )
-
-    perturbation_neighbors: List[PerturbationNeighbor] = []
-    neighbor_limit = config.perturbation_max_neighbors
-    neighbor_max_size = config.perturbation_max_model_size or config.max_model_size
-    neighbor_max_size = min(neighbor_max_size, config.max_model_size)
-    if neighbor_limit > 0 and neighbor_max_size > 0:
-        neighbor_axioms = enumerate_neighbor_axioms(
-            spec, canon_left, canon_right, limit=neighbor_limit
-        )
-        neighbor_search = ModelSearchConfig(
-            max_candidates=config.perturbation_max_model_candidates or config.max_model_candidates,
-            max_seconds=config.perturbation_max_model_seconds or config.max_model_seconds,
-        )
-        for n_left, n_right in neighbor_axioms:
-            statuses, neighbor_smallest = _neighbor_signature(
-                spec, n_left, n_right, neighbor_max_size, neighbor_search, find_model_fn
-            )
-            perturbation_neighbors.append(
-                PerturbationNeighbor(
-                    left=n_left,
-                    right=n_right,
-                    model_statuses=statuses,
-                    smallest_model_size=neighbor_smallest,
-                )
-            )
+    skipped_stages: List[str] = []
+    derived_stages: List[str] = []
+    actions = _stage_actions(config.early_exit, degeneracy)
+    for stage in _STAGE_ORDER:
+        action = actions[stage.name]
+        if action == _STAGE_SKIP:
+            skipped_stages.append(stage.name)
+            continue
+        if action == _STAGE_DERIVE:
+            derived_stages.append(stage.name)
+        handler = _STAGE_HANDLERS[stage.name][action]
+        if profiler is None:
+            handler(ctx)
+        else:
+            with profiler.span(f"stage.{stage.name}"):
+                handler(ctx)
 
     novelty_vs_archive = None
     if archive_lookup is not None:
@@ -236,19 +631,26 @@ def analyze_axiom(
     metrics = compute_metrics(
         features,
         degeneracy,
-        model_spectrum,
-        implications,
-        smallest_model_size,
+        ctx.model_spectrum,
+        ctx.implications,
+        ctx.smallest_model_size,
         novelty_vs_archive=novelty_vs_archive,
-        perturbation_neighbors=perturbation_neighbors,
+        perturbation_neighbors=ctx.perturbation_neighbors,
+        skipped_stages=skipped_stages,
     )
 
-    return BatteryResult(
+    result = BatteryResult(
         features=features,
         degeneracy=degeneracy,
-        model_spectrum=model_spectrum,
-        smallest_model_size=smallest_model_size,
-        implications=implications,
-        perturbation_neighbors=perturbation_neighbors,
+        model_spectrum=ctx.model_spectrum,
+        smallest_model_size=ctx.smallest_model_size,
+        implications=ctx.implications,
+        perturbation_neighbors=ctx.perturbation_neighbors,
         metrics=metrics,
+        skipped_stages=skipped_stages,
+        derived_stages=derived_stages,
+        profile=profiler.to_dict() if profiler is not None else None,
     )
+    statuses = [entry.status for entry in ctx.model_spectrum]
+    _record_signature(ctx, canon_left, canon_right, _spectrum_search(config), statuses)
+    return result
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import replace
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from axlab.core.canonicalization import canonicalize_equation
+from axlab.core.term import Term
+from axlab.core.universe_spec import UniverseSpec
+from axlab.engines.model_finder.interface import ModelSearchConfig
+from axlab.engines.prover.interface import ProofArtifact, ProofSearchConfig, ProofStep
+from axlab.store import ArtifactStore
+
+
+_KIND_IMPLICATION = "implication"
+_KIND_PROOF = "proof"
+_KIND_SIGNATURE = "signature"
+
+# Proof outcomes that hold regardless of the budget that produced them.
+_BUDGET_FREE_PROOF_STATUSES = {"proved", "disproved"}
+
+# Model-search outcomes that hold regardless of the budget that produced them.
+_BUDGET_FREE_MODEL_STATUSES = {"found", "not_found"}
+
+ImplicationOutcome = Tuple[str, Optional[int], Optional[str]]
+
+# An outcome and whether it was produced under the requested budget.
+CachedImplication = Tuple[ImplicationOutcome, bool]
+
+
+def _stable_json(data: object) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+def _digest(data: object) -> str:
+    return hashlib.sha256(_stable_json(data).encode("utf-8")).hexdigest()
+
+
+def _equation_key(left: Term, right: Term, spec: UniverseSpec) -> str:
+    canon_left, canon_right = canonicalize_equation(left, right, spec)
+    return f"{canon_left.serialize()}={canon_right.serialize()}"
+
+
+def equation_pair_key(
+    spec: UniverseSpec, axioms: Sequence[Tuple[Term, Term]], goal: Tuple[Term, Term]
+) -> str:
+    premises = sorted({_equation_key(left, right, spec) for left, right in axioms})
+    return ";".join(premises) + "=>" + _equation_key(goal[0], goal[1], spec)
+
+
+def exact_pair_key(axioms: Sequence[Tuple[Term, Term]], goal: Tuple[Term, Term]) -> str:
+    # Rewriting proofs depend on the exact orientation and variable names of the
+    # equations, so proofs are keyed syntactically rather than canonically.
+    premises = [f"{left.serialize()}={right.serialize()}" for left, right in axioms]
+    return ";".join(premises) + "=>" + f"{goal[0].serialize()}={goal[1].serialize()}"
+
+
+def engine_name(fn: Callable[..., Any]) -> str:
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+def _scope_digest(spec: UniverseSpec, engine: str) -> str:
+    return _digest({"spec": spec.to_dict(), "engine": engine})
+
+
+def _implication_budget(max_model_size: int, search_config: ModelSearchConfig) -> dict:
+    return {
+        "max_model_size": max_model_size,
+        "max_model_candidates": search_config.max_candidates,
+        "max_model_seconds": search_config.max_seconds,
+    }
+
+
+def signature_budget(search_config: ModelSearchConfig) -> dict:
+    return {
+        "max_model_candidates": search_config.max_candidates,
+        "max_model_seconds": search_config.max_seconds,
+    }
+
+
+def merge_signatures(*signatures: Sequence[str]) -> List[str]:
+    # Per size, a found/not_found status from any signature wins. Other statuses
+    # depend on the budget and on the form of the equation that was searched, so
+    # they only hold a place and are never reused.
+    merged: List[str] = []
+    for statuses in signatures:
+        for index, status in enumerate(statuses):
+            if index == len(merged):
+                merged.append(status)
+            elif merged[index] not in _BUDGET_FREE_MODEL_STATUSES:
+                merged[index] = status
+    return merged
+
+
+def _proof_budget(config: ProofSearchConfig) -> dict:
+    return dict(config.__dict__)
+
+
+def _proof_to_payload(artifact: ProofArtifact) -> dict:
+    steps = None
+    if artifact.steps is not None:
+        steps = [
+            {"rule": step.rule, "left": step.left, "right": step.right}
+            for step in artifact.steps
+        ]
+    return {
+        "status": artifact.status,
+        "elapsed_seconds": artifact.elapsed_seconds,
+        "proof": artifact.proof,
+        "counterexample": artifact.counterexample,
+        "steps": steps,
+    }
+
+
+def _proof_from_payload(payload: dict) -> ProofArtifact:
+    steps = None
+    if payload.get("steps") is not None:
+        steps = [
+            ProofStep(step["rule"], step["left"], step["right"]) for step in payload["steps"]
+        ]
+    return ProofArtifact(
+        status=payload["status"],
+        elapsed_seconds=payload["elapsed_seconds"],
+        proof=payload["proof"],
+        counterexample=payload["counterexample"],
+        steps=steps,
+    )
+
+
+def _cached_proof(payload: dict) -> ProofArtifact:
+    # The stored elapsed time belongs to the run that searched; a hit costs nothing.
+    return replace(_proof_from_payload(payload), elapsed_seconds=0.0)
+
+
+def _implication_transfers(status: str, payload: dict, budget: dict, max_model_size: int) -> bool:
+    # A counterexample is what any budget that searches its size would find first,
+    # but only when the recording search decided every smaller size; past a cut-off
+    # size another budget might find a smaller one. An exhaustive "confirmed" over
+    # larger sizes covers every smaller size. An inconclusive outcome only ever
+    # answers the exact budget that produced it.
+    if status == "counterexample":
+        size = payload.get("counterexample_size")
+        return size is not None and size <= max_model_size and payload.get("decided_below") is True
+    if status == "confirmed":
+        return budget.get("max_model_size", 0) >= max_model_size
+    return False
+
+
+class ProofCache:
+    # A ``deferred`` cache keeps its writes in ``pending`` until ``flush``, so
+    # lookups only see what the store held before; runs use one so that worker
+    # processes and a sequential pass read the same entries.
+    def __init__(
+        self, store: ArtifactStore, read_only: bool = False, deferred: bool = False
+    ) -> None:
+        self.store = store
+        self.read_only = read_only
+        self.deferred = deferred
+        self.pending: List[tuple] = []
+
+    def _record(self, *row: Any) -> None:
+        if self.deferred:
+            self.pending.append(row)
+        else:
+            self.store.record_cached_results([row])
+
+    def take(self) -> List[tuple]:
+        rows, self.pending = self.pending, []
+        return rows
+
+    def flush(self, run_id: Optional[str] = None) -> None:
+        self.store.record_cached_results(self.take(), run_id)
+
+    def lookup_implication(
+        self,
+        spec: UniverseSpec,
+        axioms: Sequence[Tuple[Term, Term]],
+        goal: Tuple[Term, Term],
+        engine: str,
+        max_model_size: int,
+        search_config: ModelSearchConfig,
+    ) -> Optional[CachedImplication]:
+        # Only an outcome of the same budget is what a search would return now; one
+        # carried over from another budget is flagged so callers can say so.
+        budget = _implication_budget(max_model_size, search_config)
+        config_digest = _digest(budget)
+        records = self.store.load_cached_results(
+            _KIND_IMPLICATION,
+            equation_pair_key(spec, axioms, goal),
+            _scope_digest(spec, engine),
+        )
+        for record in records:
+            if record.config_digest == config_digest:
+                return _implication_outcome(record.status, record.payload), True
+        for record in records:
+            if _implication_transfers(record.status, record.payload, record.budget, max_model_size):
+                return _implication_outcome(record.status, record.payload), False
+        return None
+
+    def record_implication(
+        self,
+        spec: UniverseSpec,
+        axioms: Sequence[Tuple[Term, Term]],
+        goal: Tuple[Term, Term],
+        engine: str,
+        max_model_size: int,
+        search_config: ModelSearchConfig,
+        outcome: ImplicationOutcome,
+        decided_below: bool,
+    ) -> None:
+        if self.read_only:
+            return
+        status, counterexample_size, counterexample_fingerprint = outcome
+        budget = _implication_budget(max_model_size, search_config)
+        self._record(
+            _KIND_IMPLICATION,
+            equation_pair_key(spec, axioms, goal),
+            _scope_digest(spec, engine),
+            _digest(budget),
+            status,
+            budget,
+            {
+                "counterexample_size": counterexample_size,
+                "counterexample_fingerprint": counterexample_fingerprint,
+                "decided_below": decided_below,
+            },
+        )
+
+    def lookup_proof(
+        self,
+        spec: UniverseSpec,
+        axioms: Sequence[Tuple[Term, Term]],
+        goal: Tuple[Term, Term],
+        engine: str,
+        config: ProofSearchConfig,
+    ) -> Optional[ProofArtifact]:
+        config_digest = _digest(_proof_budget(config))
+        records = self.store.load_cached_results(
+            _KIND_PROOF,
+            exact_pair_key(axioms, goal),
+            _scope_digest(spec, engine),
+        )
+        for record in records:
+            if record.config_digest == config_digest:
+                return _cached_proof(record.payload)
+        for record in records:
+            if record.status in _BUDGET_FREE_PROOF_STATUSES:
+                return _cached_proof(record.payload)
+        return None
+
+    def record_proof(
+        self,
+        spec: UniverseSpec,
+        axioms: Sequence[Tuple[Term, Term]],
+        goal: Tuple[Term, Term],
+        engine: str,
+        config: ProofSearchConfig,
+        artifact: ProofArtifact,
+    ) -> None:
+        if self.read_only:
+            return
+        budget = _proof_budget(config)
+        self._record(
+            _KIND_PROOF,
+            exact_pair_key(axioms, goal),
+            _scope_digest(spec, engine),
+            _digest(budget),
+            artifact.status,
+            budget,
+            _proof_to_payload(artifact),
+        )
+
+    def lookup_signature(
+        self, spec: UniverseSpec, equation: Tuple[Term, Term], engine: str
+    ) -> Optional[List[str]]:
+        records = self.store.load_cached_results(
+            _KIND_SIGNATURE,
+            _equation_key(equation[0], equation[1], spec),
+            _scope_digest(spec, engine),
+        )
+        if not records:
+            return None
+        return merge_signatures(*(record.payload["statuses"] for record in records))
+
+    def record_signature(
+        self,
+        spec: UniverseSpec,
+        equation: Tuple[Term, Term],
+        engine: str,
+        search_config: ModelSearchConfig,
+        statuses: Sequence[str],
+    ) -> None:
+        # Signatures of different lengths are kept apart, so a shorter one never
+        # replaces a longer one recorded under the same budget.
+        if self.read_only:
+            return
+        budget = {**signature_budget(search_config), "max_model_size": len(statuses)}
+        self._record(
+            _KIND_SIGNATURE,
+            _equation_key(equation[0], equation[1], spec),
+            _scope_digest(spec, engine),
+            _digest(budget),
+            "signature",
+            budget,
+            {"statuses": list(statuses)},
+        )
+
+
+def _implication_outcome(status: str, payload: dict) -> ImplicationOutcome:
+    return status, payload.get("counterexample_size"), payload.get("counterexample_fingerprint")
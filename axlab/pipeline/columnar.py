@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import heapq
+import io
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+# File layout: MAGIC, a little-endian u32 header length, the JSON header, then
+# 8-byte aligned blocks. Column and dictionary offsets are relative to the
+# first block, so reading one column touches only the header and that block.
+MAGIC = b"AXCOLS01"
+COLUMNS_FORMAT = 1
+
+_TYPECODES = {"f64": "d", "u8": "B", "u32": "I"}
+_NUMERIC = (int, float)
+
+
+def _align(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+class _Dictionary:
+    # Code 0 is reserved for missing values.
+    def __init__(self) -> None:
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.codes) + 1
+            self.codes[value] = code
+        return code
+
+    def to_bytes(self) -> bytes:
+        return "\n".join(self.codes).encode("utf-8")
+
+
+def encode_columns(entries: Iterable[Tuple[str, dict]]) -> bytes:
+    strings = _Dictionary()
+    statuses = _Dictionary()
+    axiom_ids = bytearray()
+    columns: Dict[str, Tuple[str, Optional[str], List[Any]]] = {}
+    excluded: set = set()
+    rows = 0
+
+    def put(name: str, kind: str, dictionary: Optional[str], value: Any) -> None:
+        column = columns.get(name)
+        if column is None:
+            missing = math.nan if kind == "f64" else 0
+            column = columns[name] = (kind, dictionary, [missing] * rows)
+        column[2].append(value)
+
+    for axiom_id, entry in entries:
+        axiom_ids += bytes.fromhex(axiom_id)
+        put("left", "u32", "strings", strings.encode(entry["axiom"]["left"]))
+        put("right", "u32", "strings", strings.encode(entry["axiom"]["right"]))
+        put(
+            "symmetry_class",
+            "u32",
+            "strings",
+            strings.encode(entry["features"].get("symmetry_class")),
+        )
+        smallest = entry.get("smallest_model_size")
+        put("smallest_model_size", "f64", None, math.nan if smallest is None else smallest)
+        for item in entry.get("model_spectrum", []):
+            put(f"spectrum.{item['size']}", "u8", "statuses", statuses.encode(item["status"]))
+        for probe in entry.get("implications", []):
+            put(
+                f"implication.{probe['theory']}",
+                "u8",
+                "statuses",
+                statuses.encode(probe["status"]),
+            )
+        for name, value in (entry.get("metrics") or {}).items():
+            if value is None:
+                put(f"metric.{name}", "f64", None, math.nan)
+            elif isinstance(value, _NUMERIC):
+                put(f"metric.{name}", "f64", None, float(value))
+            else:
+                excluded.add(f"metric.{name}")
+        rows += 1
+        for kind, _, values in columns.values():
+            if len(values) < rows:
+                values.append(math.nan if kind == "f64" else 0)
+    if len(statuses.codes) > 255:
+        raise ValueError("Too many distinct statuses for a u8 column.")
+
+    blocks: List[bytes] = [bytes(axiom_ids)]
+    header_columns = [{"name": "axiom_id", "type": "b32", "dictionary": None}]
+    for name in sorted(columns):
+        if name in excluded:
+            continue
+        kind, dictionary, values = columns[name]
+        data = array(_TYPECODES[kind], values)
+        if sys.byteorder != "little":
+            data.byteswap()
+        blocks.append(data.tobytes())
+        header_columns.append({"name": name, "type": kind, "dictionary": dictionary})
+    header_dictionaries = {}
+    for name, dictionary in (("strings", strings), ("statuses", statuses)):
+        blocks.append(dictionary.to_bytes())
+        header_dictionaries[name] = {"count": len(dictionary.codes)}
+
+    offset = 0
+    placements = []
+    for block in blocks:
+        placements.append({"offset": offset, "size": len(block)})
+        offset = _align(offset + len(block))
+    for column, placement in zip(header_columns, placements):
+        column.update(placement)
+    for dictionary, placement in zip(header_dictionaries.values(), placements[len(header_columns) :]):
+        dictionary.update(placement)
+    header = json.dumps(
+        {
+            "format": COLUMNS_FORMAT,
+            "rows": rows,
+            "columns": header_columns,
+            "dictionaries": header_dictionaries,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(header)) + header
+    out = bytearray(prefix)
+    out += bytes(_align(len(prefix)) - len(prefix))
+    for block in blocks:
+        out += block
+        out += bytes(_align(len(block)) - len(block))
+    return bytes(out)
+
+
+class ColumnarResults:
+    def __init__(self, buffer: Any) -> None:
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a columnar results file.")
+        (header_size,) = struct.unpack_from("<I", view, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(view[start : start + header_size]))
+        if header["format"] != COLUMNS_FORMAT:
+            raise ValueError(f"Unsupported columnar format: {header['format']}")
+        self._view = view
+        self._base = _align(start + header_size)
+        self.rows: int = header["rows"]
+        self._columns = {column["name"]: column for column in header["columns"]}
+        self._dictionaries = header["dictionaries"]
+        self._decoded: Dict[str, List[Optional[str]]] = {}
+
+    @classmethod
+    def open(cls, path: str | Path) -> "ColumnarResults":
+        with Path(path).open("rb") as handle:
+            return cls.map(handle)
+
+    @classmethod
+    def map(cls, handle: BinaryIO) -> "ColumnarResults":
+        # The mapping outlives the handle, so callers may close it right away.
+        # Handles without a file behind them (compressed artifacts) are read whole.
+        try:
+            fileno = handle.fileno()
+        except (OSError, io.UnsupportedOperation):
+            return cls(handle.read())
+        return cls(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def close(self) -> None:
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def _block(self, placement: dict) -> memoryview:
+        start = self._base + placement["offset"]
+        return self._view[start : start + placement["size"]]
+
+    def raw(self, name: str) -> Any:
+        # Zero-copy typed view of a numeric or code column (a copy on big-endian
+        # hosts).
+        column = self._columns[name]
+        block = self._block(column)
+        if column["type"] == "b32":
+            return block
+        typecode = _TYPECODES[column["type"]]
+        if sys.byteorder == "little":
+            return block.cast(typecode)
+        data = array(typecode, block.tobytes())
+        data.byteswap()
+        return data
+
+    def _dictionary(self, name: str) -> List[Optional[str]]:
+        if name not in self._decoded:
+            placement = self._dictionaries[name]
+            values = bytes(self._block(placement)).decode("utf-8").split("\n")
+            self._decoded[name] = [None, *(values if placement["count"] else [])]
+        return self._decoded[name]
+
+    def column(self, name: str) -> List[Any]:
+        column = self._columns[name]
+        data = self.raw(name)
+        if column["type"] == "b32":
+            return [data[row * 32 : (row + 1) * 32].hex() for row in range(self.rows)]
+        if column["type"] == "f64":
+            return [None if math.isnan(value) else value for value in data]
+        dictionary = self._dictionary(column["dictionary"])
+        return [dictionary[code] for code in data]
+
+    def axiom_id(self, row: int) -> str:
+        return self._block(self._columns["axiom_id"])[row * 32 : (row + 1) * 32].hex()
+
+    def top_k(self, name: str, k: int = 10, descending: bool = True) -> List[Tuple[str, float]]:
+        # Ties keep file order; missing values never rank.
+        values = self.raw(name)
+        rows = (row for row in range(self.rows) if not math.isnan(values[row]))
+        if descending:
+            best = heapq.nsmallest(k, rows, key=lambda row: (-values[row], row))
+        else:
+            best = heapq.nsmallest(k, rows, key=lambda row: (values[row], row))
+        return [(self.axiom_id(row), values[row]) for row in best]
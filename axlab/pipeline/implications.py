@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, List, Optional, Sequence, Tuple
+import itertools
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 from axlab.core.term import Term
 from axlab.core.universe_spec import UniverseSpec
 from axlab.engines.model_finder.interface import ModelSearchArtifact, ModelSearchConfig
-from axlab.engines.prover.interface import ProofSearchConfig, ProofStep
+from axlab.engines.prover.interface import ProofArtifact, ProofSearchConfig, ProofStep
 from axlab.engines.prover.rewriting import RewritingProver
 from axlab.engines.model_finder.naive import find_model_with_constraints
+from axlab.pipeline.cache import ProofCache, engine_name
+from axlab.pipeline.profiling import Profiler
 
 
 @dataclass(frozen=True)
@@ -21,6 +24,8 @@ class ImplicationConfig:
     proof_max_steps: int = 4
     proof_max_terms: int = 500
     proof_rule_ordering: str = "given"
+    proof_strategy: str = "bfs"
+    infer_closure: bool = True
 
 
 @dataclass(frozen=True)
@@ -40,6 +45,7 @@ class ImplicationProbe:
     proof_status: Optional[str] = None
     proof_elapsed_seconds: Optional[float] = None
     proof_steps: Optional[List[ProofStep]] = None
+    derived_from: Optional[str] = None
 
 
 def _first_op_name(spec: UniverseSpec, arity: int) -> Optional[str]:
@@ -79,6 +85,108 @@ def _unary_theories(op_name: str) -> List[KnownTheory]:
     ]
 
 
+# Single-premise implications between members of the binary library. Each edge
+# holds for any binary operation, e.g. f(x,y) = x makes every bracketing of a
+# product collapse to its leftmost variable.
+_BINARY_IMPLIES: Dict[str, Tuple[str, ...]] = {
+    "left_projection": (
+        "associative",
+        "idempotent",
+        "left_alternative",
+        "right_alternative",
+        "flexible",
+        "left_self_distributive",
+        "right_self_distributive",
+        "medial",
+    ),
+    "right_projection": (
+        "associative",
+        "idempotent",
+        "left_alternative",
+        "right_alternative",
+        "flexible",
+        "left_self_distributive",
+        "right_self_distributive",
+        "medial",
+    ),
+    "associative": ("left_alternative", "right_alternative", "flexible"),
+    "commutative": ("flexible",),
+}
+
+
+def _theory_root(theory: KnownTheory) -> Term:
+    return theory.left if theory.left.kind == "op" else theory.right
+
+
+def implication_graph(theories: Sequence[KnownTheory]) -> Dict[int, Set[int]]:
+    positions = {
+        (theory.name, _theory_root(theory).value): idx for idx, theory in enumerate(theories)
+    }
+    graph: Dict[int, Set[int]] = {idx: set() for idx in range(len(theories))}
+    for idx, theory in enumerate(theories):
+        root = _theory_root(theory)
+        if len(root.args) != 2:
+            continue
+        for name in _BINARY_IMPLIES.get(theory.name, ()):
+            target = positions.get((name, root.value))
+            if target is not None:
+                graph[idx].add(target)
+    changed = True
+    while changed:
+        changed = False
+        for idx, targets in graph.items():
+            reachable = set(targets)
+            for target in targets:
+                reachable |= graph[target]
+            if reachable != targets:
+                graph[idx] = reachable
+                changed = True
+    return graph
+
+
+def _parse_fingerprint(fingerprint: str) -> Optional[Tuple[int, Dict[str, List[int]]]]:
+    size = None
+    tables: Dict[str, List[int]] = {}
+    for part in fingerprint.split(";"):
+        if "=" not in part:
+            continue
+        name, payload = part.split("=", 1)
+        if name == "n":
+            size = int(payload)
+        else:
+            tables[name] = [int(value) for value in payload.split(",")] if payload else []
+    if size is None:
+        return None
+    return size, tables
+
+
+def _evaluate(term: Term, size: int, tables: Dict[str, List[int]], env: Dict[str, int]) -> int:
+    if term.kind == "var":
+        return env[term.value]
+    values = [_evaluate(arg, size, tables, env) for arg in term.args]
+    table = tables[term.value]
+    if len(values) == 1:
+        return table[values[0]]
+    return table[values[0] * size + values[1]]
+
+
+def model_violates(fingerprint: str, equation: Tuple[Term, Term]) -> Optional[bool]:
+    parsed = _parse_fingerprint(fingerprint)
+    if parsed is None:
+        return None
+    size, tables = parsed
+    left, right = equation
+    names = sorted(set(left.vars()) | set(right.vars()))
+    try:
+        for values in itertools.product(range(size), repeat=len(names)):
+            env = dict(zip(names, values))
+            if _evaluate(left, size, tables, env) != _evaluate(right, size, tables, env):
+                return True
+    except (KeyError, IndexError):
+        return None
+    return False
+
+
 def library_for_spec(spec: UniverseSpec) -> List[KnownTheory]:
     theories: List[KnownTheory] = []
     binary = _first_op_name(spec, 2)
@@ -99,10 +207,13 @@ def run_implication_probes(
         [UniverseSpec, Sequence[Tuple[Term, Term]], int, ModelSearchConfig, Optional[Tuple[Term, Term]]],
         ModelSearchArtifact,
     ] = find_model_with_constraints,
+    cache: Optional[ProofCache] = None,
+    known_models: Sequence[Tuple[int, str]] = (),
+    empty_sizes: Sequence[int] = (),
+    profiler: Optional[Profiler] = None,
 ) -> List[ImplicationProbe]:
     if theories is None:
         theories = library_for_spec(spec)
-    probes: List[ImplicationProbe] = []
     search_config = ModelSearchConfig(
         max_candidates=config.max_model_candidates,
         max_seconds=config.max_model_seconds,
@@ -115,50 +226,233 @@ def run_implication_probes(
         max_model_size=config.max_model_size,
         max_model_candidates=config.max_model_candidates,
         rule_ordering=config.proof_rule_ordering,
+        strategy=config.proof_strategy,
     )
 
-    for theory in theories:
-        counterexample_size: Optional[int] = None
-        counterexample_fingerprint: Optional[str] = None
-        cutoff = False
-        for size in range(1, config.max_model_size + 1):
-            result = model_finder_with_constraints(
+    engine = engine_name(model_finder_with_constraints)
+    graph = implication_graph(theories) if config.infer_closure else None
+    # Theories that imply the most are probed first so their outcomes settle the
+    # rest; the returned probes keep library order either way.
+    order = list(range(len(theories)))
+    if graph is not None:
+        order.sort(key=lambda idx: -len(graph[idx]))
+    empty = set(empty_sizes)
+    resolved: Dict[int, ImplicationProbe] = {}
+    for idx in order:
+        theory = theories[idx]
+        if idx in resolved:
+            continue
+        goal = (theory.left, theory.right)
+        known = _known_counterexample(goal, known_models, empty, config.max_model_size)
+        if known is not None:
+            size, fingerprint = known
+            resolved[idx] = ImplicationProbe(
+                theory=theory.name,
+                status="counterexample",
+                checked_max_size=config.max_model_size,
+                counterexample_size=size,
+                counterexample_fingerprint=fingerprint,
+                derived_from="spectrum",
+            )
+            if profiler is not None:
+                profiler.count("implications.spectrum_hits")
+            continue
+        outcome = None
+        derived_from = None
+        if cache is not None:
+            cached = cache.lookup_implication(
+                spec, [axiom], goal, engine, config.max_model_size, search_config
+            )
+            if cached is not None:
+                outcome, same_budget = cached
+                if not same_budget:
+                    derived_from = "cache"
+                if profiler is not None:
+                    profiler.count("implications.cache_hits")
+        if outcome is None:
+            outcome, decided_below = _search_counterexample(
                 spec,
-                [axiom],
-                size,
+                axiom,
+                goal,
+                config.max_model_size,
                 search_config,
-                must_violate=(theory.left, theory.right),
+                model_finder_with_constraints,
+                profiler,
             )
-            if result.status == "found":
-                counterexample_size = size
-                counterexample_fingerprint = result.fingerprint
-                break
-            if result.status in ("timeout", "cutoff"):
-                cutoff = True
-        if counterexample_size is not None:
-            status = "counterexample"
-        elif cutoff:
-            status = "inconclusive"
-        else:
-            status = "confirmed"
+            if cache is not None:
+                cache.record_implication(
+                    spec,
+                    [axiom],
+                    goal,
+                    engine,
+                    config.max_model_size,
+                    search_config,
+                    outcome,
+                    decided_below,
+                )
+        status, counterexample_size, counterexample_fingerprint = outcome
         proof_status = None
         proof_elapsed = None
         proof_steps = None
         if status == "confirmed" and prover is not None:
-            artifact = prover.prove(spec, [axiom], (theory.left, theory.right), proof_config)
+            artifact = _prove(spec, axiom, goal, prover, proof_config, cache, profiler)
             proof_status = artifact.status
             proof_elapsed = artifact.elapsed_seconds
             proof_steps = artifact.steps
-        probes.append(
-            ImplicationProbe(
+        resolved[idx] = ImplicationProbe(
+            theory=theory.name,
+            status=status,
+            checked_max_size=config.max_model_size,
+            counterexample_size=counterexample_size,
+            counterexample_fingerprint=counterexample_fingerprint,
+            proof_status=proof_status,
+            proof_elapsed_seconds=proof_elapsed,
+            proof_steps=proof_steps,
+            derived_from=derived_from,
+        )
+        if graph is not None:
+            _propagate(theories, graph, idx, resolved[idx], resolved, empty)
+    if prover is not None:
+        # Only the model-search status is inferred up the implication graph; the
+        # proof a direct probe would attempt is still attempted.
+        for idx in sorted(resolved):
+            probe = resolved[idx]
+            if probe.status == "confirmed" and probe.proof_status is None:
+                goal = (theories[idx].left, theories[idx].right)
+                artifact = _prove(spec, axiom, goal, prover, proof_config, cache, profiler)
+                resolved[idx] = replace(
+                    probe,
+                    proof_status=artifact.status,
+                    proof_elapsed_seconds=artifact.elapsed_seconds,
+                    proof_steps=artifact.steps,
+                )
+    if profiler is not None:
+        profiler.count(
+            "implications.derived",
+            sum(
+                1
+                for probe in resolved.values()
+                if probe.derived_from not in (None, "spectrum", "cache")
+            ),
+        )
+    return [resolved[idx] for idx in range(len(theories))]
+
+
+def _known_counterexample(
+    goal: Tuple[Term, Term],
+    known_models: Sequence[Tuple[int, str]],
+    empty_sizes: Set[int],
+    max_model_size: int,
+) -> Optional[Tuple[int, str]]:
+    # A known model of the axiom is the answer a counterexample search would give
+    # only when it violates the goal and no smaller model of the axiom exists.
+    for size, fingerprint in sorted(known_models):
+        if size > max_model_size:
+            break
+        if any(smaller not in empty_sizes for smaller in range(2, size)):
+            break
+        if model_violates(fingerprint, goal):
+            return size, fingerprint
+    return None
+
+
+def _propagate(
+    theories: Sequence[KnownTheory],
+    graph: Dict[int, Set[int]],
+    source: int,
+    probe: ImplicationProbe,
+    resolved: Dict[int, ImplicationProbe],
+    empty_sizes: Set[int],
+) -> None:
+    if probe.status == "confirmed":
+        # Every model of the axiom up to the checked size satisfies the source
+        # theory, hence everything the source implies.
+        for target in sorted(graph[source]):
+            if target not in resolved:
+                resolved[target] = ImplicationProbe(
+                    theory=theories[target].name,
+                    status="confirmed",
+                    checked_max_size=probe.checked_max_size,
+                    counterexample_size=None,
+                    counterexample_fingerprint=None,
+                    derived_from=probe.theory,
+                )
+        return
+    if probe.status != "counterexample" or probe.counterexample_fingerprint is None:
+        return
+    size = probe.counterexample_size
+    # The model is only the smallest counterexample for another theory when no
+    # smaller model of the axiom can exist (one-element models satisfy every law).
+    if size is None or any(smaller not in empty_sizes for smaller in range(2, size)):
+        return
+    for target, theory in enumerate(theories):
+        if target in resolved:
+            continue
+        if model_violates(probe.counterexample_fingerprint, (theory.left, theory.right)):
+            resolved[target] = ImplicationProbe(
                 theory=theory.name,
-                status=status,
-                checked_max_size=config.max_model_size,
-                counterexample_size=counterexample_size,
-                counterexample_fingerprint=counterexample_fingerprint,
-                proof_status=proof_status,
-                proof_elapsed_seconds=proof_elapsed,
-                proof_steps=proof_steps,
+                status="counterexample",
+                checked_max_size=probe.checked_max_size,
+                counterexample_size=size,
+                counterexample_fingerprint=probe.counterexample_fingerprint,
+                derived_from=probe.theory,
             )
+
+
+def _search_counterexample(
+    spec: UniverseSpec,
+    axiom: Tuple[Term, Term],
+    goal: Tuple[Term, Term],
+    max_model_size: int,
+    search_config: ModelSearchConfig,
+    model_finder_with_constraints: Callable[..., ModelSearchArtifact],
+    profiler: Optional[Profiler] = None,
+) -> Tuple[Tuple[str, Optional[int], Optional[str]], bool]:
+    # Also reports whether every size below the outcome was decided, which is what
+    # lets a cached counterexample answer other budgets.
+    cutoff = False
+    for size in range(1, max_model_size + 1):
+        result = model_finder_with_constraints(
+            spec,
+            [axiom],
+            size,
+            search_config,
+            must_violate=goal,
         )
-    return probes
+        if profiler is not None:
+            profiler.count("implications.searches")
+            profiler.count("implications.candidates", result.candidates)
+        if result.status == "found":
+            return ("counterexample", size, result.fingerprint), not cutoff
+        if result.status in ("timeout", "cutoff"):
+            cutoff = True
+    if cutoff:
+        return ("inconclusive", None, None), False
+    return ("confirmed", None, None), True
+
+
+def _prove(
+    spec: UniverseSpec,
+    axiom: Tuple[Term, Term],
+    goal: Tuple[Term, Term],
+    prover: RewritingProver,
+    proof_config: ProofSearchConfig,
+    cache: Optional[ProofCache],
+    profiler: Optional[Profiler] = None,
+) -> ProofArtifact:
+    engine = type(prover).__name__
+    if cache is not None:
+        cached = cache.lookup_proof(spec, [axiom], goal, engine, proof_config)
+        if cached is not None:
+            if profiler is not None:
+                profiler.count("proofs.cache_hits")
+            return cached
+    if profiler is None:
+        artifact = prover.prove(spec, [axiom], goal, proof_config)
+    else:
+        with profiler.span("proofs"):
+            artifact = prover.prove(spec, [axiom], goal, proof_config)
+        profiler.count_stats("proofs", artifact.stats)
+    if cache is not None:
+        cache.record_proof(spec, [axiom], goal, engine, proof_config, artifact)
+    return artifact
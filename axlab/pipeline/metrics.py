@@ -1,6 +1,56 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Iterable, Optional
+import hashlib
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+SIMILARITY_DIMENSION = 64
+
+_IMPLICATION_WEIGHTS = {"confirmed": 1.0, "counterexample": -1.0}
+_SPECTRUM_WEIGHTS = {"found": 1.0, "not_found": -1.0}
+
+# Every key compute_metrics returns, in order.
+METRIC_KEYS = (
+    "left_size",
+    "right_size",
+    "total_size",
+    "left_depth",
+    "right_depth",
+    "max_depth",
+    "var_count",
+    "syntactic_complexity",
+    "smallest_model_size",
+    "trivial_identity",
+    "projection_collapse",
+    "constant_collapse",
+    "nontrivial_model_spectrum",
+    "model_found_count",
+    "model_not_found_count",
+    "model_timeout_count",
+    "model_cutoff_count",
+    "model_found_ratio",
+    "model_decisive_ratio",
+    "robustness_under_perturbation",
+    "perturbation_neighbor_count",
+    "perturbation_signature_agreement_ratio",
+    "perturbation_exact_signature_match_ratio",
+    "perturbation_smallest_model_size_match_ratio",
+    "model_candidate_total",
+    "model_elapsed_total",
+    "implication_confirmed_count",
+    "implication_counterexample_count",
+    "implication_inconclusive_count",
+    "implication_confirmed_ratio",
+    "implication_counterexample_ratio",
+    "implication_inconclusive_ratio",
+    "implication_proof_attempted_count",
+    "implication_proved_count",
+    "implication_proved_ratio",
+    "proof_step_total",
+    "proof_step_mean",
+    "proof_step_max",
+    "known_theory_distance",
+    "novelty_vs_archive",
+)
 
 
 def _ratio(numerator: int, denominator: int) -> Optional[float]:
@@ -41,6 +91,37 @@ def compute_novelty_vs_archive(
     return 0.0 if archive_lookup(symmetry_class) else 1.0
 
 
+def similarity_vector(
+    model_spectrum: list[Any], implications: list[Any], metrics: dict[str, Any]
+) -> list[float]:
+    # Named features (implication outcomes, spectrum statuses by size, ratio
+    # metrics) are hashed into a fixed number of signed slots, so vectors from
+    # different theory libraries and size caps stay comparable.
+    features: dict[str, float] = {}
+    for probe in implications:
+        features[f"implication.{probe.theory}"] = _IMPLICATION_WEIGHTS.get(probe.status, 0.0)
+    for entry in model_spectrum:
+        features[f"spectrum.{entry.size}"] = _SPECTRUM_WEIGHTS.get(entry.status, 0.0)
+    for name, value in metrics.items():
+        if name.endswith("_ratio") and isinstance(value, float):
+            features[f"metric.{name}"] = value
+    vector = [0.0] * SIMILARITY_DIMENSION
+    for name, value in sorted(features.items()):
+        digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+        slot = int.from_bytes(digest[:4], "little") % SIMILARITY_DIMENSION
+        vector[slot] += value if digest[4] & 1 else -value
+    return vector
+
+
+def compute_graded_novelty(
+    vector: Sequence[float], nearest: Callable[[Sequence[float], int], list[Any]]
+) -> float:
+    matches = nearest(vector, 1)
+    if not matches:
+        return 1.0
+    return 1.0 - min(1.0, max(0.0, matches[0][1]))
+
+
 def compute_metrics(
     features: Any,
     degeneracy: Any,
@@ -49,6 +130,7 @@ def compute_metrics(
     smallest_model_size: Optional[int],
     novelty_vs_archive: Optional[float] = None,
     perturbation_neighbors: Optional[list[Any]] = None,
+    skipped_stages: Optional[list[str]] = None,
 ) -> dict[str, Any]:
     model_status_counts = _count_status(model_spectrum, "status")
     implication_status_counts = _count_status(implications, "status")
@@ -109,6 +191,13 @@ def compute_metrics(
         )
         perturbation_robustness = perturbation_exact_signature_match_ratio
 
+    robustness_under_perturbation = (
+        perturbation_robustness if perturbation_neighbors else _ratio(model_decisive, model_total)
+    )
+    if skipped_stages and "perturbation" in skipped_stages:
+        # A skipped stage leaves its metrics undefined rather than falling back.
+        robustness_under_perturbation = None
+
     return {
         "left_size": features.left_size,
         "right_size": features.right_size,
@@ -129,9 +218,7 @@ def compute_metrics(
         "model_cutoff_count": model_cutoff,
         "model_found_ratio": _ratio(model_found, model_total),
         "model_decisive_ratio": _ratio(model_decisive, model_total),
-        "robustness_under_perturbation": perturbation_robustness
-        if perturbation_neighbors
-        else _ratio(model_decisive, model_total),
+        "robustness_under_perturbation": robustness_under_perturbation,
         "perturbation_neighbor_count": perturbation_neighbor_count,
         "perturbation_signature_agreement_ratio": perturbation_signature_agreement_ratio,
         "perturbation_exact_signature_match_ratio": perturbation_exact_signature_match_ratio,
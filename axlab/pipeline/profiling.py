@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.spans: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            totals = self.spans.setdefault(name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += time.perf_counter() - start
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_stats(self, prefix: str, stats: Optional[Dict[str, int]]) -> None:
+        if stats is None:
+            return
+        for name, amount in stats.items():
+            self.count(f"{prefix}.{name}", amount)
+
+    def to_dict(self) -> dict:
+        return {
+            "spans": {
+                name: {"calls": int(calls), "seconds": seconds}
+                for name, (calls, seconds) in sorted(self.spans.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+def reused_profile(source: str) -> dict:
+    # Results served without analysis only record where they came from, so run
+    # aggregates count the work that actually happened.
+    return {"spans": {}, "counters": {f"{source}.hits": 1}}
+
+
+def merge_profiles(profiles: Iterable[Optional[dict]]) -> dict:
+    spans: Dict[str, dict] = {}
+    counters: Dict[str, int] = {}
+    for profile in profiles:
+        if profile is None:
+            continue
+        for name, span in profile.get("spans", {}).items():
+            totals = spans.setdefault(name, {"calls": 0, "seconds": 0.0})
+            totals["calls"] += span["calls"]
+            totals["seconds"] += span["seconds"]
+        for name, amount in profile.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + amount
+    return {
+        "spans": dict(sorted(spans.items())),
+        "counters": dict(sorted(counters.items())),
+    }
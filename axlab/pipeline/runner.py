@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import hashlib
 import json
-from dataclasses import dataclass
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from axlab.core.canonicalization import canonicalize_equation
 from axlab.core.term import Term
 from axlab.core.universe_spec import UniverseSpec
 from axlab.pipeline.battery import (
@@ -14,13 +20,31 @@ from axlab.pipeline.battery import (
     DegeneracyReport,
     ModelSpectrumEntry,
     PerturbationNeighbor,
+    SignatureTable,
     SyntacticFeatures,
     analyze_axiom,
 )
 from axlab.engines.prover.interface import ProofStep
+from axlab.pipeline.cache import ProofCache
+from axlab.pipeline.columnar import ColumnarResults, encode_columns
 from axlab.pipeline.implications import ImplicationProbe
-from axlab.pipeline.metrics import compute_metrics
-from axlab.store import ArtifactStore, ImplicationRecord, ModelRecord, RunRecord
+from axlab.pipeline.metrics import (
+    METRIC_KEYS,
+    compute_graded_novelty,
+    compute_metrics,
+    compute_novelty_vs_archive,
+    similarity_vector,
+)
+from axlab.pipeline.profiling import Profiler, merge_profiles, reused_profile
+from axlab.pipeline.scheduler import RunBudget, schedule_escalations
+from axlab.store import (
+    ArtifactStore,
+    ImplicationRecord,
+    ModelRecord,
+    RunRecord,
+    StoreSession,
+    StoreWriter,
+)
 
 
 @dataclass(frozen=True)
@@ -30,33 +54,102 @@ class RunManifest:
     battery_config: dict
     axiom_count: int
     results_path: str
+    result_cache: Optional[dict] = None
+    profile: Optional[dict] = None
+    schedule: Optional[dict] = None
+    parent_run_id: Optional[str] = None
+    results_format: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        # Optional fields are omitted while unset. Every run written since the
+        # results format was versioned sets ``results_format``, so its run.json
+        # differs from a manifest of the same run written before (the run_id does
+        # not). ``result_cache`` (this call's cache hits and misses) depends on what
+        # the store held, so it goes to the results.cache.json sidecar instead of
+        # run.json.
+        return {
+            key: value
+            for key, value in self.__dict__.items()
+            if value is not None and key != "result_cache"
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunManifest":
+        return cls(
+            run_id=data["run_id"],
+            spec=data["spec"],
+            battery_config=data["battery_config"],
+            axiom_count=data["axiom_count"],
+            results_path=data["results_path"],
+            profile=data.get("profile"),
+            schedule=data.get("schedule"),
+            parent_run_id=data.get("parent_run_id"),
+            results_format=data.get("results_format"),
+        )
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    # How a run executes; none of these change its run_id.
+    workers: int = 1
+    resume: bool = False
+    use_result_cache: bool = True
+    profile: bool = False
+    store_batch_size: int = 32
+    graded_novelty: bool = False
+    columnar: bool = False
+    background_store: bool = False
+    store_queue_size: int = 64
+
+
+# Version of the results.jsonl line layout. Lines of the current version hold
+# every field and metric a rehydrate/serialize round trip would produce, so
+# replay can pass them through; unversioned (legacy) runs are rehydrated.
+RESULTS_FORMAT = 1
 
 
 def _stable_json(data: object) -> str:
     return json.dumps(data, sort_keys=True, separators=(",", ":"))
 
 
-def _run_id(spec: UniverseSpec, axioms: Iterable[Tuple[Term, Term]], config: BatteryConfig) -> str:
+def _run_id(
+    spec: UniverseSpec,
+    axioms: Iterable[Tuple[Term, Term]],
+    config: BatteryConfig,
+    budget: Optional[RunBudget] = None,
+    parent_run_id: Optional[str] = None,
+) -> str:
     payload = {
         "spec": spec.to_dict(),
-        "battery_config": config.__dict__,
+        "battery_config": config.to_dict(),
         "axioms": [
             {"left": left.serialize(), "right": right.serialize()} for left, right in axioms
         ],
     }
+    if budget is not None:
+        payload["budget"] = budget.__dict__
+    if parent_run_id is not None:
+        payload["parent_run_id"] = parent_run_id
     digest = hashlib.sha256(_stable_json(payload).encode("utf-8")).hexdigest()
     return digest[:16]
 
 
 def _axiom_id(left: Term, right: Term) -> str:
-    payload = {"left": left.serialize(), "right": right.serialize()}
+    return _axiom_id_from_payload({"left": left.serialize(), "right": right.serialize()})
+
+
+def _axiom_id_from_payload(payload: dict) -> str:
     return hashlib.sha256(_stable_json(payload).encode("utf-8")).hexdigest()
 
 
 def compute_run_id(
-    spec: UniverseSpec, axioms: Iterable[Tuple[Term, Term]], config: BatteryConfig
+    spec: UniverseSpec,
+    axioms: Iterable[Tuple[Term, Term]],
+    config: BatteryConfig,
+    budget: Optional[RunBudget] = None,
+    parent_run_id: Optional[str] = None,
 ) -> str:
-    return _run_id(spec, axioms, config)
+    return _run_id(spec, axioms, config, budget, parent_run_id)
 
 
 def compute_axiom_id(left: Term, right: Term) -> str:
@@ -64,7 +157,7 @@ def compute_axiom_id(left: Term, right: Term) -> str:
 
 
 def _features_to_dict(result: BatteryResult, metrics_override: dict | None = None) -> dict:
-    return {
+    data = {
         "features": result.features.__dict__,
         "degeneracy": result.degeneracy.__dict__,
         "model_spectrum": [entry.__dict__ for entry in result.model_spectrum],
@@ -75,6 +168,15 @@ def _features_to_dict(result: BatteryResult, metrics_override: dict | None = Non
         ],
         "metrics": metrics_override or result.metrics,
     }
+    if result.skipped_stages:
+        data["skipped_stages"] = list(result.skipped_stages)
+    if result.derived_stages:
+        data["derived_stages"] = list(result.derived_stages)
+    if result.profile is not None:
+        data["profile"] = result.profile
+    if result.escalations:
+        data["escalations"] = list(result.escalations)
+    return data
 
 
 def _implication_to_dict(probe: ImplicationProbe) -> dict:
@@ -93,6 +195,8 @@ def _implication_to_dict(probe: ImplicationProbe) -> dict:
             {"rule": step.rule, "left": step.left, "right": step.right}
             for step in probe.proof_steps
         ]
+    if probe.derived_from is not None:
+        data["derived_from"] = probe.derived_from
     return data
 
 
@@ -106,7 +210,7 @@ def _perturbation_neighbor_to_dict(neighbor: PerturbationNeighbor) -> dict:
 
 
 def serialize_battery_results(
-    results: List[Tuple[Tuple[Term, Term], BatteryResult]]
+    results: Iterable[Tuple[Tuple[Term, Term], BatteryResult]]
 ) -> List[dict]:
     serialized: List[dict] = []
     for (left, right), result in results:
@@ -119,106 +223,941 @@ def serialize_battery_results(
     return serialized
 
 
+_RESULT_CACHE_KIND = "battery"
+# Part of the cached results' config digest; bumped whenever analyze_axiom's
+# output for a given config changes, so results cached before are not served.
+_RESULT_CACHE_VERSION = 2
+
+
+def _digest(data: object) -> str:
+    return hashlib.sha256(_stable_json(data).encode("utf-8")).hexdigest()
+
+
+def _canonical_key(spec: UniverseSpec, left: Term, right: Term) -> str:
+    canon_left, canon_right = canonicalize_equation(left, right, spec)
+    return f"{canon_left.serialize()}={canon_right.serialize()}"
+
+
+def _is_cacheable(result: BatteryResult) -> bool:
+    # Wall-clock timeouts (and inconclusive probes, which may hide one) would make
+    # a cached result depend on the machine that produced it.
+    statuses = [entry.status for entry in result.model_spectrum]
+    for neighbor in result.perturbation_neighbors:
+        statuses.extend(neighbor.model_statuses)
+    statuses.extend(probe.proof_status for probe in result.implications if probe.proof_status)
+    if "timeout" in statuses:
+        return False
+    return all(probe.status != "inconclusive" for probe in result.implications)
+
+
+class BatteryResultCache:
+    def __init__(
+        self,
+        store: ArtifactStore,
+        spec: UniverseSpec,
+        config: BatteryConfig,
+        run_id: Optional[str] = None,
+    ) -> None:
+        self.store = store
+        self.spec = spec
+        self.config = config
+        self.run_id = run_id
+        self.scope_digest = _digest(spec.to_dict())
+        self.config_digest = _digest(
+            {"battery_config": config.to_dict(), "version": _RESULT_CACHE_VERSION}
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, left: Term, right: Term) -> Optional[BatteryResult]:
+        records = self.store.load_cached_results(
+            _RESULT_CACHE_KIND, _canonical_key(self.spec, left, right), self.scope_digest
+        )
+        for record in records:
+            if record.config_digest == self.config_digest:
+                self.hits += 1
+                entry = {
+                    "axiom": {"left": left.serialize(), "right": right.serialize()},
+                    **record.payload,
+                }
+                return _rehydrate_entry(entry)[1]
+        self.misses += 1
+        return None
+
+    def record(self, left: Term, right: Term, result: BatteryResult) -> None:
+        if not _is_cacheable(result):
+            return
+        self.store.record_cached_result(
+            _RESULT_CACHE_KIND,
+            _canonical_key(self.spec, left, right),
+            self.scope_digest,
+            self.config_digest,
+            "decisive",
+            self.config.to_dict(),
+            _features_to_dict(replace(result, profile=None, escalations=[])),
+            self.run_id,
+        )
+
+    def analyze(
+        self, left: Term, right: Term, proof_cache: Optional[ProofCache] = None
+    ) -> BatteryResult:
+        result = self.lookup(left, right)
+        if result is None:
+            result = analyze_axiom(self.spec, left, right, self.config, proof_cache=proof_cache)
+            self.record(left, right, result)
+        return result
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_WORKER_STATE: dict = {}
+
+
+def _worker_shard_prefix(run_id: Optional[str]) -> str:
+    return f"{run_id or 'run'}-worker-"
+
+
+def _init_worker(
+    spec: UniverseSpec,
+    config: BatteryConfig,
+    store_roots: Optional[Tuple[str, Optional[str]]],
+    profile: bool,
+    run_id: Optional[str] = None,
+) -> None:
+    _WORKER_STATE["spec"] = spec
+    _WORKER_STATE["config"] = config
+    _WORKER_STATE["profile"] = profile
+    _WORKER_STATE["signatures"] = SignatureTable()
+    _WORKER_STATE["run_id"] = run_id
+    _WORKER_STATE["proof_cache"] = None
+    _WORKER_STATE["shard"] = None
+    if store_roots is not None:
+        root, parent_root = store_roots
+        parent = ArtifactStore(parent_root) if parent_root is not None else None
+        store = ArtifactStore(root, parent=parent)
+        _WORKER_STATE["proof_cache"] = ProofCache(store, deferred=True)
+        _WORKER_STATE["shard"] = store.shard(f"{_worker_shard_prefix(run_id)}{os.getpid()}")
+
+
+def _analyze_in_worker(item: Tuple[Tuple[Term, Term], Optional[BatteryResult]]) -> BatteryResult:
+    # Lookups read the store; cache rows go to this worker's shard, which the
+    # calling process merges once the run is done.
+    (left, right), previous = item
+    proof_cache = _WORKER_STATE["proof_cache"]
+    result = analyze_axiom(
+        _WORKER_STATE["spec"],
+        left,
+        right,
+        _WORKER_STATE["config"],
+        proof_cache=proof_cache,
+        profiler=Profiler() if _WORKER_STATE["profile"] else None,
+        previous=previous,
+        signatures=_WORKER_STATE["signatures"],
+    )
+    if proof_cache is not None:
+        _WORKER_STATE["shard"].record_cached_results(proof_cache.take(), _WORKER_STATE["run_id"])
+    return result
+
+
+def _analyze_all(
+    spec: UniverseSpec,
+    axioms: List[Tuple[Term, Term]],
+    config: BatteryConfig,
+    proof_cache: ProofCache | None,
+    workers: int,
+    result_cache: BatteryResultCache | None = None,
+    profile: bool = False,
+    previous: Optional[dict[str, BatteryResult]] = None,
+    signatures: SignatureTable | None = None,
+    run_id: Optional[str] = None,
+) -> Iterator[BatteryResult]:
+    # analyze_axiom only sees the canonical equation, so every member of a
+    # symmetry class gets the same result: analyze one representative per class
+    # and fan it out, keeping each result only until its last member is yielded.
+    keys = [_canonical_key(spec, left, right) for left, right in axioms]
+    remaining: dict[str, int] = {}
+    representatives: dict[str, Tuple[Term, Term]] = {}
+    for key, axiom in zip(keys, axioms):
+        remaining[key] = remaining.get(key, 0) + 1
+        representatives.setdefault(key, axiom)
+    results: dict[str, BatteryResult] = {}
+    if result_cache is not None:
+        for key, (left, right) in representatives.items():
+            hit = result_cache.lookup(left, right)
+            if hit is not None:
+                results[key] = replace(hit, profile=reused_profile("result_cache")) if profile else hit
+    previous = previous or {}
+    pending = [
+        (axiom, previous.get(key)) for key, axiom in representatives.items() if key not in results
+    ]
+    computed = _analyze_pending(
+        spec, pending, config, proof_cache, workers, profile, signatures, run_id
+    )
+    yielded: set[str] = set()
+    for key in keys:
+        result = results.get(key)
+        if result is None:
+            result = next(computed)
+            results[key] = result
+            if result_cache is not None:
+                left, right = representatives[key]
+                result_cache.record(left, right, result)
+        if key in yielded and profile:
+            result = replace(result, profile=reused_profile("dedup"))
+        yielded.add(key)
+        remaining[key] -= 1
+        if remaining[key] == 0:
+            del results[key]
+        yield result
+
+
+def _analyze_pending(
+    spec: UniverseSpec,
+    items: List[Tuple[Tuple[Term, Term], Optional[BatteryResult]]],
+    config: BatteryConfig,
+    proof_cache: ProofCache | None,
+    workers: int,
+    profile: bool = False,
+    signatures: SignatureTable | None = None,
+    run_id: Optional[str] = None,
+) -> Iterator[BatteryResult]:
+    # ``proof_cache`` defers its writes and worker rows wait in shards, so each
+    # analysis reads the store as it was before the run however the work is spread.
+    if workers <= 1 or len(items) <= 1:
+        for (left, right), previous in items:
+            yield analyze_axiom(
+                spec,
+                left,
+                right,
+                config,
+                proof_cache=proof_cache,
+                profiler=Profiler() if profile else None,
+                previous=previous,
+                signatures=signatures,
+            )
+        return
+    # Each worker writes its own shard and keeps its own table of stored signatures.
+    store_roots = None
+    if proof_cache is not None:
+        store = proof_cache.store
+        parent_root = str(store.parent.root) if store.parent is not None else None
+        store_roots = (str(store.root), parent_root)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(spec, config, store_roots, profile, run_id),
+    ) as executor:
+        yield from executor.map(_analyze_in_worker, items)
+
+
+def _merge_worker_shards(store: ArtifactStore, run_id: str) -> None:
+    # Includes shards left behind by an interrupted attempt of the same run.
+    prefix = _worker_shard_prefix(run_id)
+    names = [name for name in store.shard_names() if name.startswith(prefix)]
+    if names:
+        store.merge_shards(names, remove=True)
+
+
+def _escalation_analyzer(
+    spec: UniverseSpec,
+    proof_cache: ProofCache | None,
+    profile: bool,
+    signatures: SignatureTable | None = None,
+    run_id: str | None = None,
+) -> Callable[[Term, Term, BatteryConfig, BatteryResult], BatteryResult]:
+    store = proof_cache.store if proof_cache is not None else None
+
+    def analyze(
+        left: Term, right: Term, config: BatteryConfig, previous: BatteryResult
+    ) -> BatteryResult:
+        cache = None
+        if store is not None:
+            cache = BatteryResultCache(store, spec, config, run_id)
+            hit = cache.lookup(left, right)
+            if hit is not None:
+                return replace(hit, profile=reused_profile("result_cache")) if profile else hit
+        result = analyze_axiom(
+            spec,
+            left,
+            right,
+            config,
+            proof_cache=proof_cache,
+            profiler=Profiler() if profile else None,
+            previous=previous,
+            signatures=signatures,
+        )
+        if cache is not None:
+            cache.record(left, right, result)
+        return result
+
+    return analyze
+
+
+def _with_archive_novelty(
+    result: BatteryResult, archive_lookup: Optional[Callable[[str], Any]]
+) -> BatteryResult:
+    if archive_lookup is None:
+        return result
+    metrics = dict(result.metrics)
+    metrics["novelty_vs_archive"] = compute_novelty_vs_archive(
+        result.features.symmetry_class, archive_lookup
+    )
+    return replace(result, metrics=metrics)
+
+
+def _with_graded_novelty(result: BatteryResult, store: ArtifactStore | None) -> BatteryResult:
+    if store is None:
+        return result
+    metrics = dict(result.metrics)
+    metrics["novelty_graded"] = compute_graded_novelty(
+        _result_vector(result), store.vector_index().query
+    )
+    return replace(result, metrics=metrics)
+
+
+def _result_vector(result: BatteryResult) -> List[float]:
+    return similarity_vector(result.model_spectrum, result.implications, result.metrics)
+
+
+def _record_result(
+    store: ArtifactStore, run_id: str, left: Term, right: Term, result: BatteryResult
+) -> None:
+    axiom_id = _axiom_id(left, right)
+    store.record_axiom(
+        run_id,
+        axiom_id,
+        left.serialize(),
+        right.serialize(),
+        result.features.symmetry_class,
+    )
+    store.record_metrics(run_id, axiom_id, result.metrics)
+    models = [
+        ModelRecord(
+            run_id=run_id,
+            axiom_id=axiom_id,
+            size=entry.size,
+            status=entry.status,
+            fingerprint=entry.fingerprint,
+            candidates=entry.candidates,
+            elapsed_seconds=entry.elapsed_seconds,
+        )
+        for entry in result.model_spectrum
+    ]
+    store.record_models(run_id, axiom_id, models)
+    implications = [
+        ImplicationRecord(
+            run_id=run_id,
+            axiom_id=axiom_id,
+            theory=probe.theory,
+            status=probe.status,
+            checked_max_size=probe.checked_max_size,
+            counterexample_size=probe.counterexample_size,
+            counterexample_fingerprint=probe.counterexample_fingerprint,
+            proof_status=probe.proof_status,
+            proof_elapsed_seconds=probe.proof_elapsed_seconds,
+            proof_steps=[
+                {"rule": step.rule, "left": step.left, "right": step.right}
+                for step in probe.proof_steps
+            ]
+            if probe.proof_steps is not None
+            else None,
+        )
+        for probe in result.implications
+    ]
+    store.record_implications(run_id, axiom_id, implications)
+    store.record_vector(run_id, axiom_id, _result_vector(result))
+
+
+def _persist_result(
+    handle: Any,
+    store: ArtifactStore | None,
+    run_id: str,
+    left: Term,
+    right: Term,
+    result: BatteryResult,
+    archive_lookup: Optional[Callable[[str], Any]],
+    graded_novelty: bool = False,
+    writer: StoreWriter | None = None,
+) -> int:
+    # Novelty depends on the axioms recorded so far, so it is resolved here in
+    # input order rather than inside the (possibly parallel) analysis.
+    result = _with_archive_novelty(result, archive_lookup)
+    if graded_novelty:
+        result = _with_graded_novelty(result, store)
+    payload = {
+        "axiom": {"left": left.serialize(), "right": right.serialize()},
+        **_features_to_dict(result),
+    }
+    line = _stable_json(payload) + "\n"
+    if writer is None:
+        _write_result(handle, store, run_id, left, right, result, line)
+        return len(line)
+    # The writer records this axiom later, so the in-memory novelty indexes are
+    # updated now: the next axiom must see it exactly as it would synchronously.
+    store.archive_index().add(result.features.symmetry_class)
+    if graded_novelty:
+        store.vector_index().add((run_id, _axiom_id(left, right)), _result_vector(result))
+    writer.submit(_write_result, handle, store, run_id, left, right, result, line)
+    return len(line)
+
+
+def _write_result(
+    handle: Any,
+    store: ArtifactStore | None,
+    run_id: str,
+    left: Term,
+    right: Term,
+    result: BatteryResult,
+    line: str,
+) -> None:
+    handle.write(line)
+    handle.flush()
+    os.fsync(handle.fileno())
+    if store is not None:
+        _record_result(store, run_id, left, right, result)
+
+
+def _finish_result(
+    session: Optional[StoreSession], checkpoint_path: Path, run_id: str, completed: int
+) -> None:
+    if session is not None:
+        session.mark()
+    _write_checkpoint(checkpoint_path, run_id, completed)
+
+
+def _write_checkpoint(
+    path: Path, run_id: str, completed: int, schedule: Optional[dict] = None
+) -> None:
+    checkpoint: dict = {"run_id": run_id, "completed": completed}
+    if schedule is not None:
+        checkpoint["schedule"] = schedule
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(_stable_json(checkpoint), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _previous_run_id(output_path: Path) -> Optional[str]:
+    for name in ("checkpoint.json", "run.json"):
+        path = output_path / name
+        if path.exists():
+            return json.loads(path.read_text(encoding="utf-8")).get("run_id")
+    return None
+
+
+def _completed_entries(
+    results_path: Path, axioms: List[Tuple[Term, Term]]
+) -> Tuple[List[dict], List[int]]:
+    # Keep the longest prefix of complete lines that matches the input order and
+    # truncate anything after it (a torn final line or stale trailing entries).
+    if not results_path.exists():
+        return [], []
+    completed: List[dict] = []
+    lengths: List[int] = []
+    offset = 0
+    with results_path.open("rb") as handle:
+        for raw in handle:
+            if len(completed) >= len(axioms) or not raw.endswith(b"\n"):
+                break
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                break
+            left, right = axioms[len(completed)]
+            if _axiom_id_from_payload(entry["axiom"]) != _axiom_id(left, right):
+                break
+            completed.append(entry)
+            lengths.append(len(raw))
+            offset += len(raw)
+    with results_path.open("r+b") as handle:
+        handle.truncate(offset)
+    return completed, lengths
+
+
+def _results_index_path(results_path: Path) -> Path:
+    return results_path.with_name("results.index.json")
+
+
+def _results_columns_path(results_path: Path) -> Path:
+    return results_path.with_name("results.columns")
+
+
+def _results_cache_stats_path(results_path: Path) -> Path:
+    return results_path.with_name("results.cache.json")
+
+
+def _results_index(axiom_ids: List[str], lengths: List[int]) -> bytes:
+    # axiom_id -> [offset, length] of its results.jsonl line; a repeated axiom
+    # keeps its last line, as a linear scan would.
+    spans: dict = {}
+    offset = 0
+    for axiom_id, length in zip(axiom_ids, lengths):
+        spans[axiom_id] = [offset, length]
+        offset += length
+    return (_stable_json(spans) + "\n").encode("utf-8")
+
+
+def _store_session(
+    store: ArtifactStore | None, batch_size: int
+) -> ContextManager[Optional[StoreSession]]:
+    if store is None:
+        return nullcontext()
+    return store.session(batch_size=batch_size)
+
+
+def _store_lease(store: ArtifactStore | None, run_id: str) -> ContextManager[None]:
+    if store is None:
+        return nullcontext()
+    return store.run_lease(run_id)
+
+
+def _store_writer(
+    store: ArtifactStore | None, background_store: bool, queue_size: int
+) -> ContextManager[Optional[StoreWriter]]:
+    if store is None or not background_store:
+        return nullcontext()
+    return store.writer(queue_size)
+
+
+def _escalation_log_path(output_path: Path) -> Path:
+    return output_path / "escalations.jsonl"
+
+
+def _read_escalation_log(path: Path) -> List[Tuple[int, BatteryResult]]:
+    # Escalations made before an interruption, oldest first; a torn final line is
+    # dropped and its escalation is simply made again.
+    if not path.exists():
+        return []
+    logged: List[Tuple[int, BatteryResult]] = []
+    offset = 0
+    with path.open("rb") as handle:
+        for raw in handle:
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                break
+            logged.append((record["index"], _rehydrate_entry(record["entry"])[1]))
+            offset += len(raw)
+    with path.open("r+b") as handle:
+        handle.truncate(offset)
+    return logged
+
+
+# Metrics resolved while persisting rather than by the analysis; an escalated
+# entry keeps the values its first-pass line was written with.
+_PERSISTED_METRICS = ("novelty_vs_archive", "novelty_graded")
+
+
+def _escalate_results(
+    spec: UniverseSpec,
+    axioms: List[Tuple[Term, Term]],
+    config: BatteryConfig,
+    budget: RunBudget,
+    proof_cache: ProofCache | None,
+    profile: bool,
+    started: float,
+    output_path: Path,
+    schedule: Optional[dict],
+    signatures: SignatureTable,
+    run_id: str,
+) -> Tuple[dict, Dict[int, BatteryResult]]:
+    # Runs the schedule over the persisted first pass and returns it with the
+    # replacement result of every entry whose class was escalated. Each escalation
+    # is appended to escalations.jsonl as it completes; a resumed run replays the
+    # log instead of searching again, and only rebuilds replacements once the
+    # schedule itself was checkpointed.
+    log_path = _escalation_log_path(output_path)
+    logged = _read_escalation_log(log_path)
+    keys = [_canonical_key(spec, left, right) for left, right in axioms]
+    if schedule is None:
+        results = [result for _, result in iter_results_as_battery(output_path / "results.jsonl")]
+        replayed = list(logged)
+        with log_path.open("ab") as log:
+
+            def record(first: int, result: BatteryResult) -> None:
+                left, right = axioms[first]
+                entry = {
+                    "axiom": {"left": left.serialize(), "right": right.serialize()},
+                    **_features_to_dict(result),
+                }
+                log.write((_stable_json({"index": first, "entry": entry}) + "\n").encode("utf-8"))
+                log.flush()
+                os.fsync(log.fileno())
+                logged.append((first, result))
+
+            schedule = schedule_escalations(
+                axioms,
+                keys,
+                results,
+                config,
+                budget,
+                _escalation_analyzer(spec, proof_cache, profile, signatures, run_id),
+                started,
+                replayed=replayed,
+                on_escalation=record,
+            )
+    # The last escalation of a class is its final result.
+    latest = {keys[first]: result for first, result in logged}
+    replacements: Dict[int, BatteryResult] = {}
+    seen: set = set()
+    for index, key in enumerate(keys):
+        result = latest.get(key)
+        if result is None:
+            continue
+        if key in seen and result.profile is not None:
+            result = replace(result, profile=reused_profile("dedup"))
+        seen.add(key)
+        replacements[index] = result
+    return schedule, replacements
+
+
+def _replace_results(
+    results_path: Path,
+    axioms: List[Tuple[Term, Term]],
+    replacements: Dict[int, BatteryResult],
+    store: ArtifactStore | None,
+    run_id: str,
+) -> Tuple[List[int], List[Optional[dict]]]:
+    # Rewrites results.jsonl with the replacement lines and swaps it in atomically,
+    # so an interruption leaves either the first pass or the final file. Returns
+    # the new line lengths and profiles.
+    tmp_path = results_path.with_name(results_path.name + ".tmp")
+    lengths: List[int] = []
+    profiles: List[Optional[dict]] = []
+    with results_path.open("rb") as source, tmp_path.open("wb") as target:
+        for index, raw in enumerate(source):
+            result = replacements.get(index)
+            if result is not None:
+                first_pass = json.loads(raw)["metrics"]
+                metrics = dict(result.metrics)
+                for name in _PERSISTED_METRICS:
+                    if name in first_pass:
+                        metrics[name] = first_pass[name]
+                result = replace(result, metrics=metrics)
+                left, right = axioms[index]
+                payload = {
+                    "axiom": {"left": left.serialize(), "right": right.serialize()},
+                    **_features_to_dict(result),
+                }
+                raw = (_stable_json(payload) + "\n").encode("utf-8")
+                if store is not None:
+                    _record_result(store, run_id, left, right, result)
+                profiles.append(result.profile)
+            else:
+                profiles.append(json.loads(raw).get("profile"))
+            target.write(raw)
+            lengths.append(len(raw))
+        target.flush()
+        os.fsync(target.fileno())
+    os.replace(tmp_path, results_path)
+    return lengths, profiles
+
+
 def run_battery_and_persist(
     spec: UniverseSpec,
     axioms: Iterable[Tuple[Term, Term]],
     output_dir: str | Path,
     config: BatteryConfig | None = None,
     store: ArtifactStore | None = None,
+    options: RunOptions | None = None,
+    budget: RunBudget | None = None,
+    parent_run_id: str | None = None,
+    parent_results: List[Tuple[Tuple[Term, Term], BatteryResult]] | None = None,
 ) -> RunManifest:
+    started = time.monotonic()
     if config is None:
         config = BatteryConfig()
+    if options is None:
+        options = RunOptions()
     axiom_list = list(axioms)
-    run_id = _run_id(spec, axiom_list, config)
+    run_id = _run_id(spec, axiom_list, config, budget, parent_run_id)
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     results_path = output_path / "results.jsonl"
+    checkpoint_path = output_path / "checkpoint.json"
+    log_path = _escalation_log_path(output_path)
 
-    archive_lookup = None
-    if store is not None:
-        archive_lookup = store.lookup_axiom_by_symmetry
-    with results_path.open("w", encoding="utf-8") as handle:
-        for left, right in axiom_list:
-            result = analyze_axiom(spec, left, right, config, archive_lookup=archive_lookup)
-            metrics = result.metrics
-            payload = {
-                "axiom": {"left": left.serialize(), "right": right.serialize()},
-                **_features_to_dict(result, metrics),
+    completed: List[dict] = []
+    line_lengths: List[int] = []
+    schedule = None
+    if options.resume:
+        previous_run_id = _previous_run_id(output_path)
+        if previous_run_id is not None and previous_run_id != run_id:
+            raise ValueError(
+                f"Cannot resume run {run_id}: {output_path} holds run {previous_run_id}."
+            )
+        if previous_run_id is not None:
+            completed, line_lengths = _completed_entries(results_path, axiom_list)
+            # A schedule is kept once it has run; a finished run keeps its own.
+            if checkpoint_path.exists():
+                schedule = json.loads(checkpoint_path.read_text(encoding="utf-8")).get("schedule")
+            elif budget is not None:
+                schedule = load_run_manifest(output_path / "run.json").schedule
+    if not options.resume or not completed:
+        if log_path.exists():
+            log_path.unlink()
+    # One store connection serves the whole run; store rows commit every
+    # ``store_batch_size`` axioms, and resume re-records whatever a crash lost. The
+    # lease outlives the session, so a sweep never sees the run unleased before
+    # its last rows commit.
+    with _store_lease(store, run_id), _store_session(store, options.store_batch_size) as session:
+        if store is not None:
+            # Store rows of the last completed entries may not have landed before the
+            # interruption; re-recording is idempotent and keeps novelty lookups exact.
+            for (left, right), result in _rehydrate_results(completed):
+                _record_result(store, run_id, left, right, result)
+
+        archive_lookup = None
+        result_cache = None
+        # Without ``use_result_cache`` the run neither reads nor writes any cache, so
+        # its results do not depend on what the store already holds.
+        cache_store = store if options.use_result_cache else None
+        if store is not None:
+            archive_lookup = store.archive_index().contains
+        proof_cache = None
+        if cache_store is not None:
+            result_cache = BatteryResultCache(cache_store, spec, config, run_id)
+            proof_cache = ProofCache(cache_store, deferred=True)
+        remaining = axiom_list[len(completed) :]
+        previous = None
+        if parent_results is not None:
+            previous = {
+                _canonical_key(spec, left, right): result for (left, right), result in parent_results
             }
-            handle.write(_stable_json(payload))
-            handle.write("\n")
-            if store is not None:
-                axiom_id = _axiom_id(left, right)
-                store.record_axiom(
-                    run_id,
-                    axiom_id,
-                    left.serialize(),
-                    right.serialize(),
-                    result.features.symmetry_class,
-                )
-                store.record_metrics(run_id, axiom_id, metrics)
-                models = [
-                    ModelRecord(
-                        run_id=run_id,
-                        axiom_id=axiom_id,
-                        size=entry.size,
-                        status=entry.status,
-                        fingerprint=entry.fingerprint,
-                        candidates=entry.candidates,
-                        elapsed_seconds=entry.elapsed_seconds,
-                    )
-                    for entry in result.model_spectrum
-                ]
-                store.record_models(run_id, axiom_id, models)
-                implications = [
-                    ImplicationRecord(
-                        run_id=run_id,
-                        axiom_id=axiom_id,
-                        theory=probe.theory,
-                        status=probe.status,
-                        checked_max_size=probe.checked_max_size,
-                        counterexample_size=probe.counterexample_size,
-                        counterexample_fingerprint=probe.counterexample_fingerprint,
-                        proof_status=probe.proof_status,
-                        proof_elapsed_seconds=probe.proof_elapsed_seconds,
-                        proof_steps=[
-                            {"rule": step.rule, "left": step.left, "right": step.right}
-                            for step in probe.proof_steps
-                        ]
-                        if probe.proof_steps is not None
-                        else None,
+        signatures = SignatureTable()
+        results = _analyze_all(
+            spec,
+            remaining,
+            config,
+            proof_cache,
+            options.workers,
+            result_cache,
+            options.profile,
+            previous,
+            signatures,
+            run_id,
+        )
+        run_profiler = Profiler() if options.profile else None
+        profiles = [entry.get("profile") for entry in completed] if options.profile else []
+        _write_checkpoint(checkpoint_path, run_id, len(completed), schedule)
+        # With ``background_store``, lines, store rows and checkpoints are written
+        # in order by a writer thread while the next axioms are analyzed. Budgeted
+        # runs persist their first pass the same way before escalating.
+        with results_path.open("a" if completed else "w", encoding="utf-8") as handle, _store_writer(
+            store, options.background_store, options.store_queue_size
+        ) as writer:
+            for index, ((left, right), result) in enumerate(zip(remaining, results)):
+                if run_profiler is None:
+                    length = _persist_result(
+                        handle,
+                        store,
+                        run_id,
+                        left,
+                        right,
+                        result,
+                        archive_lookup,
+                        options.graded_novelty,
+                        writer,
                     )
-                    for probe in result.implications
-                ]
-                store.record_implications(run_id, axiom_id, implications)
-
-    manifest = RunManifest(
-        run_id=run_id,
-        spec=spec.to_dict(),
-        battery_config=config.__dict__,
-        axiom_count=len(axiom_list),
-        results_path=str(results_path),
+                else:
+                    profiles.append(result.profile)
+                    with run_profiler.span("run.persist"):
+                        length = _persist_result(
+                            handle,
+                            store,
+                            run_id,
+                            left,
+                            right,
+                            result,
+                            archive_lookup,
+                            options.graded_novelty,
+                            writer,
+                        )
+                line_lengths.append(length)
+                finish = (session, checkpoint_path, run_id, len(completed) + index + 1)
+                if writer is None:
+                    _finish_result(*finish)
+                else:
+                    writer.submit(_finish_result, *finish)
+        if budget is not None:
+            schedule, replacements = _escalate_results(
+                spec,
+                axiom_list,
+                config,
+                budget,
+                proof_cache,
+                options.profile,
+                started,
+                output_path,
+                schedule,
+                signatures,
+                run_id,
+            )
+            _write_checkpoint(checkpoint_path, run_id, len(axiom_list), schedule)
+            if replacements:
+                line_lengths, line_profiles = _replace_results(
+                    results_path, axiom_list, replacements, store, run_id
+                )
+                if options.profile:
+                    profiles = line_profiles
+        if proof_cache is not None:
+            # Worker shards merge on their own connection, so the session's rows
+            # must be committed first; this run's own rows land after them.
+            session.commit()
+            _merge_worker_shards(proof_cache.store, run_id)
+            proof_cache.flush(run_id)
+        axiom_ids = [_axiom_id(left, right) for left, right in axiom_list]
+        results_index = _results_index(axiom_ids, line_lengths)
+        _results_index_path(results_path).write_bytes(results_index)
+        # Counts of the call that finished the run.
+        stats_path = _results_cache_stats_path(results_path)
+        if result_cache is not None:
+            stats_path.write_text(_stable_json(result_cache.stats()) + "\n", encoding="utf-8")
+        elif stats_path.exists():
+            stats_path.unlink()
+        results_columns = None
+        if options.columnar:
+            # Built from the finished file so resumed prefixes and novelty
+            # overrides land exactly as results.jsonl records them.
+            results_columns = encode_columns(zip(axiom_ids, iter_results(results_path)))
+            _results_columns_path(results_path).write_bytes(results_columns)
+
+        manifest = RunManifest(
+            run_id=run_id,
+            spec=spec.to_dict(),
+            battery_config=config.to_dict(),
+            axiom_count=len(axiom_list),
+            results_path=str(results_path),
+            result_cache=result_cache.stats() if result_cache is not None else None,
+            profile=merge_profiles([*profiles, run_profiler.to_dict()])
+            if run_profiler is not None
+            else None,
+            schedule=schedule,
+            parent_run_id=parent_run_id,
+            results_format=RESULTS_FORMAT,
+        )
+        manifest_path = output_path / "run.json"
+        manifest_path.write_text(_stable_json(manifest.to_dict()) + "\n", encoding="utf-8")
+        if store is not None:
+            manifest_digest = store.write_bytes("run_manifest", manifest_path.read_bytes())
+            results_digest = store.write_bytes("run_results", results_path.read_bytes())
+            store.record_run(run_id, spec.to_dict(), config.to_dict(), manifest_digest, results_digest)
+            store.record_results_index(
+                run_id, store.write_bytes("run_results_index", results_index)
+            )
+            if results_columns is not None:
+                store.record_results_columns(
+                    run_id, store.write_bytes("run_results_columns", results_columns)
+                )
+    checkpoint_path.unlink()
+    if log_path.exists():
+        log_path.unlink()
+    return manifest
+
+
+_UPGRADE_FIELDS = (
+    "max_model_size",
+    "max_model_candidates",
+    "max_model_seconds",
+    "perturbation_max_neighbors",
+)
+
+
+def _effective_budget(config: BatteryConfig) -> dict:
+    budget = {name: getattr(config, name) for name in _UPGRADE_FIELDS}
+    for stage in ("implication", "perturbation"):
+        for name in ("max_model_size", "max_model_candidates", "max_model_seconds"):
+            value = getattr(config, f"{stage}_{name}")
+            budget[f"{stage}_{name}"] = value if value is not None else getattr(config, name)
+    budget["perturbation_max_model_size"] = min(
+        budget["perturbation_max_model_size"], config.max_model_size
     )
-    manifest_path = output_path / "run.json"
-    manifest_path.write_text(_stable_json(manifest.__dict__) + "\n", encoding="utf-8")
+    return budget
+
+
+def _check_upgrade(parent: BatteryConfig, config: BatteryConfig) -> None:
+    for name in ("model_finder", "early_exit", "proof_strategy"):
+        if getattr(parent, name) != getattr(config, name):
+            raise ValueError(f"Cannot upgrade a run with a different {name}.")
+    parent_budget = _effective_budget(parent)
+    for name, value in _effective_budget(config).items():
+        if value < parent_budget[name]:
+            raise ValueError(
+                f"Cannot upgrade a run with a smaller {name} ({value} < {parent_budget[name]})."
+            )
+
+
+def load_run(
+    run_id: str, store: ArtifactStore | None = None, run_dir: str | Path | None = None
+) -> Tuple[RunManifest, List[Tuple[Tuple[Term, Term], BatteryResult]]]:
+    if store is not None and store.load_run(run_id) is not None:
+        return load_run_from_store(store, run_id)
+    if run_dir is not None and (Path(run_dir) / "run.json").exists():
+        manifest = load_run_manifest(Path(run_dir) / "run.json")
+        if manifest.run_id != run_id:
+            raise ValueError(f"{run_dir} holds run {manifest.run_id}, not {run_id}.")
+        results = load_results_as_battery(resolve_results_path(manifest.results_path, run_dir))
+        return manifest, results
+    raise ValueError(f"Unknown run_id: {run_id}")
+
+
+def load_run_columns(
+    run_id: str, store: ArtifactStore | None = None, run_dir: str | Path | None = None
+) -> ColumnarResults:
+    # Memory-maps the columnar sidecar; runs persisted without ``columnar`` have none.
     if store is not None:
-        manifest_digest = store.write_bytes("run_manifest", manifest_path.read_bytes())
-        results_digest = store.write_bytes("run_results", results_path.read_bytes())
-        store.record_run(run_id, spec.to_dict(), config.__dict__, manifest_digest, results_digest)
-    return manifest
+        digest = store.load_results_columns(run_id)
+        if digest is not None:
+            with store.open_bytes(digest) as handle:
+                return ColumnarResults.map(handle)
+    if run_dir is not None and (Path(run_dir) / "run.json").exists():
+        manifest = load_run_manifest(Path(run_dir) / "run.json")
+        if manifest.run_id != run_id:
+            raise ValueError(f"{run_dir} holds run {manifest.run_id}, not {run_id}.")
+        path = _results_columns_path(resolve_results_path(manifest.results_path, run_dir))
+        if path.exists():
+            return ColumnarResults.open(path)
+    raise ValueError(f"No columnar results for run_id: {run_id}")
 
 
-def load_run_manifest(path: str | Path) -> RunManifest:
-    data = json.loads(Path(path).read_text(encoding="utf-8"))
-    return RunManifest(
-        run_id=data["run_id"],
-        spec=data["spec"],
-        battery_config=data["battery_config"],
-        axiom_count=data["axiom_count"],
-        results_path=data["results_path"],
+def upgrade_run_and_persist(
+    spec: UniverseSpec,
+    parent_manifest: RunManifest,
+    parent_results: List[Tuple[Tuple[Term, Term], BatteryResult]],
+    output_dir: str | Path,
+    config: BatteryConfig,
+    store: ArtifactStore | None = None,
+    options: RunOptions | None = None,
+) -> RunManifest:
+    if parent_manifest.spec != spec.to_dict():
+        raise ValueError("Cannot upgrade a run recorded for a different UniverseSpec.")
+    _check_upgrade(BatteryConfig(**parent_manifest.battery_config), config)
+    # Every entry is re-analyzed against its parent result, so only outcomes that
+    # the stronger config can change (open searches, sizes above the old caps)
+    # are searched again.
+    return run_battery_and_persist(
+        spec,
+        [axiom for axiom, _ in parent_results],
+        output_dir,
+        config=config,
+        store=store,
+        options=options,
+        parent_run_id=parent_manifest.run_id,
+        parent_results=parent_results,
     )
 
 
+def load_run_manifest(path: str | Path) -> RunManifest:
+    path = Path(path)
+    manifest = RunManifest.from_dict(json.loads(path.read_text(encoding="utf-8")))
+    stats_path = _results_cache_stats_path(resolve_results_path(manifest.results_path, path.parent))
+    if stats_path.exists():
+        manifest = replace(manifest, result_cache=json.loads(stats_path.read_bytes()))
+    return manifest
+
+
 def resolve_results_path(results_path: str | Path, run_dir: str | Path | None = None) -> Path:
     path = Path(results_path)
     if path.is_absolute():
@@ -234,98 +1173,252 @@ def resolve_results_path(results_path: str | Path, run_dir: str | Path | None =
 
 
 def load_results(path: str | Path) -> List[dict]:
-    with Path(path).open("r", encoding="utf-8") as handle:
-        return _parse_results_jsonl(handle.read())
+    return list(iter_results(path))
+
+
+def iter_results(path: str | Path) -> Iterator[dict]:
+    with Path(path).open("rb") as handle:
+        yield from _iter_results_jsonl(handle)
 
 
 def load_results_as_battery(
     path: str | Path,
 ) -> List[Tuple[Tuple[Term, Term], BatteryResult]]:
-    return _rehydrate_results(load_results(path))
+    return list(iter_results_as_battery(path))
+
+
+def iter_results_as_battery(
+    path: str | Path, lazy: bool = False
+) -> Iterator[Tuple[Tuple[Term, Term], BatteryResult]]:
+    for entry in iter_results(path):
+        yield _rehydrate_entry(entry, lazy)
 
 
 def load_run_from_store(
     store: ArtifactStore, run_id: str
 ) -> Tuple[RunManifest, List[Tuple[Tuple[Term, Term], BatteryResult]]]:
+    manifest, results = iter_run_from_store(store, run_id)
+    return manifest, list(results)
+
+
+def iter_run_from_store(
+    store: ArtifactStore, run_id: str, lazy: bool = False
+) -> Tuple[RunManifest, Iterator[Tuple[Tuple[Term, Term], BatteryResult]]]:
+    record = store.load_run(run_id)
+    if record is None:
+        raise ValueError(f"Unknown run_id: {run_id}")
+    manifest = _manifest_from_store(record, store)
+    entries = _iter_results_from_store(record, store)
+    return manifest, (_rehydrate_entry(entry, lazy) for entry in entries)
+
+
+def replay_results(
+    manifest: RunManifest, results_path: str | Path, start: int = 0, stop: Optional[int] = None
+) -> List[dict]:
+    with Path(results_path).open("rb") as handle:
+        return _replay_lines(manifest, handle, start, stop)
+
+
+def replay_run_from_store(
+    store: ArtifactStore, run_id: str, start: int = 0, stop: Optional[int] = None
+) -> Tuple[RunManifest, List[dict]]:
+    # The whole blob is hashed even when only a page is decoded, so a corrupted
+    # artifact is reported instead of replayed.
     record = store.load_run(run_id)
     if record is None:
         raise ValueError(f"Unknown run_id: {run_id}")
     manifest = _manifest_from_store(record, store)
-    results = _rehydrate_results(_load_results_from_store(record, store))
+    digest = hashlib.sha256()
+    with store.open_bytes(record.results_digest) as handle:
+
+        def lines() -> Iterator[bytes]:
+            for raw in handle:
+                digest.update(raw)
+                yield raw
+
+        stream = lines()
+        results = _replay_lines(manifest, stream, start, stop)
+        for _ in stream:
+            pass
+    if digest.hexdigest() != record.results_digest:
+        raise ValueError(f"Stored results of run {run_id} do not match their digest.")
     return manifest, results
 
 
+def _replay_lines(
+    manifest: RunManifest, lines: Iterable[bytes], start: int, stop: Optional[int]
+) -> List[dict]:
+    entries = islice(_iter_results_jsonl(lines), start, stop)
+    if manifest.results_format == RESULTS_FORMAT:
+        return list(entries)
+    return serialize_battery_results(_rehydrate_entry(entry) for entry in entries)
+
+
+def load_result_entries(
+    results_path: str | Path, axiom_ids: Iterable[str]
+) -> List[Tuple[str, Tuple[Term, Term], BatteryResult]]:
+    # Decodes only the requested lines, in request order; unknown ids are skipped.
+    # Runs without a sidecar index fall back to scanning the file once.
+    path = Path(results_path)
+    wanted = list(dict.fromkeys(axiom_ids))
+    index_path = _results_index_path(path)
+    if index_path.exists():
+        spans = json.loads(index_path.read_bytes())
+        with path.open("rb") as handle:
+            entries = []
+            for axiom_id in wanted:
+                if axiom_id in spans:
+                    offset, length = spans[axiom_id]
+                    handle.seek(offset)
+                    entries.append(json.loads(handle.read(length)))
+    else:
+        entries = _select_entries(load_results(path), wanted)
+    return _with_axiom_ids(entries)
+
+
+def load_stored_result_entries(
+    store: ArtifactStore, run_id: str, axiom_ids: Iterable[str]
+) -> Tuple[RunManifest, List[Tuple[str, Tuple[Term, Term], BatteryResult]]]:
+    record = store.load_run(run_id)
+    if record is None:
+        raise ValueError(f"Unknown run_id: {run_id}")
+    manifest = _manifest_from_store(record, store)
+    wanted = list(dict.fromkeys(axiom_ids))
+    index_digest = store.load_results_index(run_id)
+    if index_digest is None:
+        entries = _select_entries(_load_results_from_store(record, store), wanted)
+    else:
+        spans = store.read_json(index_digest)
+        entries = [
+            json.loads(store.read_range(record.results_digest, *spans[axiom_id]))
+            for axiom_id in wanted
+            if axiom_id in spans
+        ]
+    return manifest, _with_axiom_ids(entries)
+
+
+def _select_entries(entries: List[dict], axiom_ids: List[str]) -> List[dict]:
+    by_id = {_axiom_id_from_payload(entry["axiom"]): entry for entry in entries}
+    return [by_id[axiom_id] for axiom_id in axiom_ids if axiom_id in by_id]
+
+
+def _with_axiom_ids(
+    entries: List[dict],
+) -> List[Tuple[str, Tuple[Term, Term], BatteryResult]]:
+    return [
+        (_axiom_id(left, right), (left, right), result)
+        for (left, right), result in _rehydrate_results(entries)
+    ]
+
+
 def _load_results_from_store(record: RunRecord, store: ArtifactStore) -> List[dict]:
-    payload = store.read_bytes(record.results_digest).decode("utf-8")
-    return _parse_results_jsonl(payload)
+    return list(_iter_results_from_store(record, store))
+
+
+def _iter_results_from_store(record: RunRecord, store: ArtifactStore) -> Iterator[dict]:
+    with store.open_bytes(record.results_digest) as handle:
+        yield from _iter_results_jsonl(handle)
 
 
 def _manifest_from_store(record: RunRecord, store: ArtifactStore) -> RunManifest:
     data = store.read_json(record.manifest_digest)
-    return RunManifest(
-        run_id=data["run_id"],
-        spec=data["spec"],
-        battery_config=data["battery_config"],
-        axiom_count=data["axiom_count"],
-        results_path=data["results_path"],
-    )
+    return RunManifest.from_dict(data)
 
 
-def _parse_results_jsonl(text: str) -> List[dict]:
-    results: List[dict] = []
-    for line in text.splitlines():
+def _iter_results_jsonl(handle: Any) -> Iterator[dict]:
+    for line in handle:
         line = line.strip()
         if not line:
             continue
-        results.append(json.loads(line))
-    return results
+        yield json.loads(line)
 
 
 def _rehydrate_results(
-    results: List[dict],
+    results: Iterable[dict],
 ) -> List[Tuple[Tuple[Term, Term], BatteryResult]]:
-    hydrated: List[Tuple[Tuple[Term, Term], BatteryResult]] = []
-    for entry in results:
-        axiom_data = entry["axiom"]
-        left = Term.parse(axiom_data["left"])
-        right = Term.parse(axiom_data["right"])
-        features = SyntacticFeatures(**entry["features"])
-        degeneracy = DegeneracyReport(**entry["degeneracy"])
-        model_spectrum = [ModelSpectrumEntry(**item) for item in entry["model_spectrum"]]
-        implications = [_implication_from_dict(item) for item in entry["implications"]]
-        perturbation_neighbors = [
+    return [_rehydrate_entry(entry) for entry in results]
+
+
+def _rehydrate_entry(
+    entry: dict, lazy: bool = False
+) -> Tuple[Tuple[Term, Term], BatteryResult]:
+    axiom_data = entry["axiom"]
+    terms = (Term.parse(axiom_data["left"]), Term.parse(axiom_data["right"]))
+    result = LazyBatteryResult(entry)
+    return terms, result if lazy else result.materialize()
+
+
+class LazyBatteryResult:
+    # Read-only stand-in for a BatteryResult that decodes each field from its
+    # results.jsonl entry on first access, so streaming consumers that touch one
+    # field (say, implications) never build the rest.
+    _DECODERS: Dict[str, Callable[[dict], Any]] = {
+        "features": lambda entry: SyntacticFeatures(**entry["features"]),
+        "degeneracy": lambda entry: DegeneracyReport(**entry["degeneracy"]),
+        "model_spectrum": lambda entry: [
+            ModelSpectrumEntry(**item) for item in entry["model_spectrum"]
+        ],
+        "smallest_model_size": lambda entry: entry["smallest_model_size"],
+        "implications": lambda entry: [
+            _implication_from_dict(item) for item in entry["implications"]
+        ],
+        "perturbation_neighbors": lambda entry: [
             _perturbation_neighbor_from_dict(item)
             for item in entry.get("perturbation_neighbors", [])
-        ]
-        metrics = entry.get("metrics")
+        ],
+        "skipped_stages": lambda entry: list(entry.get("skipped_stages", [])),
+        "derived_stages": lambda entry: list(entry.get("derived_stages", [])),
+        "profile": lambda entry: entry.get("profile"),
+        "escalations": lambda entry: list(entry.get("escalations", [])),
+    }
+
+    def __init__(self, entry: dict) -> None:
+        self._entry = entry
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "metrics":
+            value = self._metrics()
+        elif name in self._DECODERS:
+            value = self._DECODERS[name](self._entry)
+        else:
+            raise AttributeError(name)
+        setattr(self, name, value)
+        return value
+
+    def _metrics(self) -> dict:
+        metrics = self._entry.get("metrics")
+        # Entries that already store every metric skip the recomputation.
+        if metrics is not None and all(key in metrics for key in METRIC_KEYS):
+            return metrics
         computed = compute_metrics(
-            features,
-            degeneracy,
-            model_spectrum,
-            implications,
-            entry["smallest_model_size"],
-            perturbation_neighbors=perturbation_neighbors,
+            self.features,
+            self.degeneracy,
+            self.model_spectrum,
+            self.implications,
+            self.smallest_model_size,
+            perturbation_neighbors=self.perturbation_neighbors,
+            skipped_stages=self.skipped_stages,
         )
         if metrics is None:
-            metrics = computed
-        else:
-            for key, value in computed.items():
-                metrics.setdefault(key, value)
-        hydrated.append(
-            (
-                (left, right),
-                BatteryResult(
-                    features=features,
-                    degeneracy=degeneracy,
-                    model_spectrum=model_spectrum,
-                    smallest_model_size=entry["smallest_model_size"],
-                    implications=implications,
-                    perturbation_neighbors=perturbation_neighbors,
-                    metrics=metrics,
-                ),
-            )
+            return computed
+        for key, value in computed.items():
+            metrics.setdefault(key, value)
+        return metrics
+
+    def materialize(self) -> BatteryResult:
+        return BatteryResult(
+            features=self.features,
+            degeneracy=self.degeneracy,
+            model_spectrum=self.model_spectrum,
+            smallest_model_size=self.smallest_model_size,
+            implications=self.implications,
+            perturbation_neighbors=self.perturbation_neighbors,
+            metrics=self.metrics,
+            skipped_stages=self.skipped_stages,
+            derived_stages=self.derived_stages,
+            profile=self.profile,
+            escalations=self.escalations,
         )
-    return hydrated
 
 
 def _implication_from_dict(data: dict) -> ImplicationProbe:
@@ -344,6 +1437,7 @@ def _implication_from_dict(data: dict) -> ImplicationProbe:
         proof_status=data.get("proof_status"),
         proof_elapsed_seconds=data.get("proof_elapsed_seconds"),
         proof_steps=steps,
+        derived_from=data.get("derived_from"),
     )
 
 
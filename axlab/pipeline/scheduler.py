@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import heapq
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from axlab.core.term import Term
+from axlab.pipeline.battery import BatteryConfig, BatteryResult
+from axlab.pipeline.profiling import merge_profiles, reused_profile
+
+
+_OPEN_STATUSES = {"timeout", "cutoff"}
+
+
+@dataclass(frozen=True)
+class RunBudget:
+    max_seconds: Optional[float] = None
+    max_escalations: Optional[int] = None
+    max_rounds: int = 2
+    growth: float = 2.0
+
+
+def open_outcomes(result: BatteryResult) -> int:
+    # Outcomes that a larger model-search budget could still change. Proof budgets
+    # are not part of BatteryConfig, so open proofs are left alone.
+    count = sum(1 for entry in result.model_spectrum if entry.status in _OPEN_STATUSES)
+    for neighbor in result.perturbation_neighbors:
+        count += sum(1 for status in neighbor.model_statuses if status in _OPEN_STATUSES)
+    count += sum(1 for probe in result.implications if probe.status == "inconclusive")
+    return count
+
+
+def escalate_config(config: BatteryConfig, round_index: int, growth: float) -> BatteryConfig:
+    factor = growth**round_index
+
+    def seconds(value: Optional[float]) -> Optional[float]:
+        return value * factor if value is not None else None
+
+    def candidates(value: Optional[int]) -> Optional[int]:
+        return int(value * factor) if value is not None else None
+
+    return replace(
+        config,
+        max_model_seconds=config.max_model_seconds * factor,
+        max_model_candidates=int(config.max_model_candidates * factor),
+        implication_max_model_seconds=seconds(config.implication_max_model_seconds),
+        implication_max_model_candidates=candidates(config.implication_max_model_candidates),
+        perturbation_max_model_seconds=seconds(config.perturbation_max_model_seconds),
+        perturbation_max_model_candidates=candidates(config.perturbation_max_model_candidates),
+    )
+
+
+def cap_seconds(config: BatteryConfig, base: BatteryConfig, seconds: float) -> BatteryConfig:
+    # No search may outlast the time left, but none gets less than the first pass.
+    def cap(value: Optional[float], floor: Optional[float]) -> Optional[float]:
+        if value is None:
+            return None
+        return min(value, max(seconds, floor if floor is not None else base.max_model_seconds))
+
+    return replace(
+        config,
+        max_model_seconds=cap(config.max_model_seconds, base.max_model_seconds),
+        implication_max_model_seconds=cap(
+            config.implication_max_model_seconds, base.implication_max_model_seconds
+        ),
+        perturbation_max_model_seconds=cap(
+            config.perturbation_max_model_seconds, base.perturbation_max_model_seconds
+        ),
+    )
+
+
+def schedule_escalations(
+    axioms: Sequence[Tuple[Term, Term]],
+    keys: Sequence[str],
+    results: List[BatteryResult],
+    config: BatteryConfig,
+    budget: RunBudget,
+    analyze: Callable[[Term, Term, BatteryConfig, BatteryResult], BatteryResult],
+    started: float,
+    clock: Callable[[], float] = time.monotonic,
+    replayed: Sequence[Tuple[int, BatteryResult]] = (),
+    on_escalation: Optional[Callable[[int, BatteryResult], None]] = None,
+) -> dict:
+    # Members of a symmetry class share one result, so each class is escalated
+    # once. Classes closest to decisive go first; ties keep input order. The time
+    # budget is checked before every escalation and caps the searches it starts.
+    # ``replayed`` holds the escalations an interrupted run already made, as (first
+    # member index, escalated result) in order; they are applied without analysis
+    # or budget checks. Every new one is passed to ``on_escalation`` the same way.
+    members: Dict[str, List[int]] = {}
+    for index, key in enumerate(keys):
+        members.setdefault(key, []).append(index)
+    queue: List[Tuple[int, int, int, str]] = []
+    for key, indices in members.items():
+        pending = open_outcomes(results[indices[0]])
+        if pending:
+            heapq.heappush(queue, (1, pending, indices[0], key))
+
+    escalations = 0
+    exhausted = False
+    while queue:
+        if budget.max_escalations is not None and escalations >= budget.max_escalations:
+            exhausted = True
+            break
+        replay = replayed[escalations] if escalations < len(replayed) else None
+        time_left = None
+        if replay is None and budget.max_seconds is not None:
+            time_left = budget.max_seconds - (clock() - started)
+            if time_left <= 0:
+                exhausted = True
+                break
+        round_index, pending, first, key = heapq.heappop(queue)
+        if replay is not None:
+            if replay[0] != first:
+                raise ValueError("Recorded escalations do not match this run.")
+            result = replay[1]
+        else:
+            escalated_config = escalate_config(config, round_index, budget.growth)
+            if time_left is not None:
+                escalated_config = cap_seconds(escalated_config, config, time_left)
+            left, right = axioms[first]
+            previous = results[first]
+            record = {
+                "round": round_index,
+                "open_outcomes": pending,
+                "battery_config": escalated_config.to_dict(),
+            }
+            result = analyze(left, right, escalated_config, previous)
+            profile = result.profile
+            if profile is not None and previous.profile is not None:
+                profile = merge_profiles([previous.profile, profile])
+            result = replace(result, escalations=[*previous.escalations, record], profile=profile)
+            if on_escalation is not None:
+                on_escalation(first, result)
+        escalations += 1
+        for index in members[key]:
+            if index != first and result.profile is not None:
+                results[index] = replace(result, profile=reused_profile("dedup"))
+            else:
+                results[index] = result
+        remaining = open_outcomes(result)
+        if remaining and round_index < budget.max_rounds:
+            heapq.heappush(queue, (round_index + 1, remaining, first, key))
+
+    return {
+        "budget": budget.__dict__,
+        "escalations": escalations,
+        "exhausted": exhausted,
+    }
@@ -68,3 +68,15 @@ CREATE TABLE IF NOT EXISTS notes (
     body TEXT NOT NULL,
     created_at TEXT NOT NULL
 );
+
+CREATE TABLE IF NOT EXISTS result_cache (
+    kind TEXT NOT NULL,
+    pair_key TEXT NOT NULL,
+    scope_digest TEXT NOT NULL,
+    config_digest TEXT NOT NULL,
+    status TEXT NOT NULL,
+    budget_json TEXT NOT NULL,
+    payload_json TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (kind, pair_key, scope_digest, config_digest)
+);
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
+import bisect
 import hashlib
+import io
 import json
+import lzma
+import math
+import os
+import queue
+import random
+import shutil
+import socket
 import sqlite3
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 
 @dataclass(frozen=True)
@@ -61,6 +75,17 @@ class MetricRecord:
     value_json: Optional[str]
 
 
+@dataclass(frozen=True)
+class CachedResultRecord:
+    kind: str
+    pair_key: str
+    scope_digest: str
+    config_digest: str
+    status: str
+    budget: dict[str, Any]
+    payload: dict[str, Any]
+
+
 @dataclass(frozen=True)
 class NoteRecord:
     note_id: int
@@ -71,7 +96,13 @@ class NoteRecord:
 
 
 def _utc_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _parse_time(value: str) -> datetime:
+    # Older rows may lack the fraction, so timestamps are compared as datetimes.
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
 
 
 def _stable_json(data: Any) -> str:
@@ -86,6 +117,126 @@ def _artifact_path(root: Path, digest: str) -> Path:
     return root / "artifacts" / digest[:2] / digest
 
 
+def _chunk_path(root: Path, chunk_digest: str) -> Path:
+    return root / "chunks" / chunk_digest[:2] / chunk_digest
+
+
+_CODECS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+# Kinds missing here (or mapped to None) are stored as plain files, which keeps
+# them seekable and mappable; columnar results are memory-mapped in place.
+_DEFAULT_CODECS: Dict[str, Optional[str]] = {
+    "run_manifest": "zlib",
+    "run_results": "zlib",
+    "run_results_index": "zlib",
+}
+
+# Tables whose rows belong to one run; a merge takes them from whichever store
+# holds the winning ``runs`` row.
+_RUN_TABLES = (
+    "axioms",
+    "models",
+    "implications",
+    "metrics",
+    "vectors",
+    "results_indexes",
+    "results_columns",
+)
+
+_CHUNK_MIN_SIZE = 16 * 1024
+_CHUNK_MAX_SIZE = 1024 * 1024
+_CHUNK_MASK = 0xF
+
+
+def _chunk_spans(data: bytes) -> Iterator[Tuple[int, int]]:
+    # Content-defined at line granularity: a chunk ends after a line whose hash
+    # matches the mask, so an edit only moves the boundaries next to it and the
+    # shared lines of overlapping runs chunk identically. Lines longer than the
+    # maximum (or data without newlines) fall back to fixed-size cuts.
+    start = position = 0
+    while position < len(data):
+        newline = data.find(b"\n", position)
+        line_end = len(data) if newline < 0 else newline + 1
+        if line_end - start > _CHUNK_MAX_SIZE:
+            if position > start:
+                yield start, position
+                start = position
+            while line_end - start > _CHUNK_MAX_SIZE:
+                yield start, start + _CHUNK_MAX_SIZE
+                start += _CHUNK_MAX_SIZE
+        elif line_end - start >= _CHUNK_MIN_SIZE and not (
+            zlib.crc32(data[position:line_end]) & _CHUNK_MASK
+        ):
+            yield start, line_end
+            start = line_end
+        position = line_end
+    if start < len(data):
+        yield start, len(data)
+
+
+def _copy_blob(source: Path, target: Path) -> int:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, target)
+    return target.stat().st_size
+
+
+def _lease_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _lease_alive(owner: str) -> bool:
+    # A lease taken on another host, or where processes cannot be probed, is
+    # assumed alive; one whose process is gone from this host is stale.
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or os.name != "posix":
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+
+def _stray_files(directory: Path, known: set, cutoff_time: float) -> List[Path]:
+    if not directory.exists():
+        return []
+    return [
+        path
+        for path in directory.glob("*/*")
+        if path.name not in known and path.stat().st_mtime < cutoff_time
+    ]
+
+
+class _ChunkedReader(io.RawIOBase):
+    def __init__(self, store: "ArtifactStore", recipe: List[Tuple[int, str, str]]) -> None:
+        self._store = store
+        self._recipe = recipe
+        self._next = 0
+        self._buffer = b""
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target: Any) -> int:
+        while self._offset >= len(self._buffer):
+            if self._next >= len(self._recipe):
+                return 0
+            _, chunk_digest, codec = self._recipe[self._next]
+            self._buffer = self._store._read_chunk(chunk_digest, codec)
+            self._offset = 0
+            self._next += 1
+        size = min(len(target), len(self._buffer) - self._offset)
+        target[:size] = self._buffer[self._offset : self._offset + size]
+        self._offset += size
+        return size
+
+
 def _metric_payload(value: Any) -> tuple[Optional[float], Optional[str]]:
     if value is None:
         return None, None
@@ -114,43 +265,952 @@ def _deserialize_proof_steps(payload: Optional[str]) -> Optional[list[dict[str,
     return json.loads(payload)
 
 
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# Applied in order on open; ``PRAGMA user_version`` records how many have run.
+# Append new steps, never edit shipped ones.
+_MIGRATIONS = (
+    "CREATE INDEX IF NOT EXISTS axioms_by_symmetry ON axioms(symmetry_class, created_at);"
+    "CREATE INDEX IF NOT EXISTS metrics_by_value ON metrics(name, value);"
+    "CREATE INDEX IF NOT EXISTS implications_by_status ON implications(status, theory);"
+    "CREATE INDEX IF NOT EXISTS models_by_fingerprint ON models(fingerprint);",
+    "CREATE TABLE IF NOT EXISTS vectors ("
+    " run_id TEXT NOT NULL, axiom_id TEXT NOT NULL, vector BLOB NOT NULL,"
+    " created_at TEXT NOT NULL, PRIMARY KEY (run_id, axiom_id));",
+    "CREATE TABLE IF NOT EXISTS results_indexes ("
+    " run_id TEXT PRIMARY KEY, index_digest TEXT NOT NULL, created_at TEXT NOT NULL);",
+    "CREATE TABLE IF NOT EXISTS results_columns ("
+    " run_id TEXT PRIMARY KEY, columns_digest TEXT NOT NULL, created_at TEXT NOT NULL);",
+    "CREATE TABLE IF NOT EXISTS chunks ("
+    " chunk_digest TEXT PRIMARY KEY, codec TEXT NOT NULL, size INTEGER NOT NULL,"
+    " stored_size INTEGER NOT NULL, created_at TEXT NOT NULL);"
+    "CREATE TABLE IF NOT EXISTS artifact_chunks ("
+    " digest TEXT NOT NULL, position INTEGER NOT NULL, offset INTEGER NOT NULL,"
+    " chunk_digest TEXT NOT NULL, PRIMARY KEY (digest, position));"
+    "CREATE INDEX IF NOT EXISTS artifact_chunks_by_chunk ON artifact_chunks(chunk_digest);",
+    # result_cache was first keyed without scope_digest, so rows of different
+    # specs or engines overwrote each other.
+    "CREATE TABLE result_cache_rekeyed ("
+    " kind TEXT NOT NULL, pair_key TEXT NOT NULL, scope_digest TEXT NOT NULL,"
+    " config_digest TEXT NOT NULL, status TEXT NOT NULL, budget_json TEXT NOT NULL,"
+    " payload_json TEXT NOT NULL, created_at TEXT NOT NULL,"
+    " PRIMARY KEY (kind, pair_key, scope_digest, config_digest));"
+    "INSERT INTO result_cache_rekeyed SELECT kind, pair_key, scope_digest, config_digest,"
+    " status, budget_json, payload_json, created_at FROM result_cache;"
+    "DROP TABLE result_cache;"
+    "ALTER TABLE result_cache_rekeyed RENAME TO result_cache;",
+    # The run that wrote a cache row, if any, so garbage collection can drop the
+    # rows of runs that were never recorded.
+    "ALTER TABLE result_cache ADD COLUMN run_id TEXT;",
+    # Every symmetry class ever archived, in arrival order, and the persisted Bloom
+    # filter of the archive index, which covers the log up to ``covered``.
+    "CREATE TABLE archive_classes ("
+    " seq INTEGER PRIMARY KEY AUTOINCREMENT, symmetry_class TEXT NOT NULL UNIQUE);"
+    "INSERT OR IGNORE INTO archive_classes(symmetry_class)"
+    " SELECT symmetry_class FROM axioms ORDER BY created_at, run_id, axiom_id;"
+    "CREATE TRIGGER archive_classes_on_axiom AFTER INSERT ON axioms BEGIN"
+    " INSERT OR IGNORE INTO archive_classes(symmetry_class) VALUES (NEW.symmetry_class); END;"
+    "CREATE TABLE archive_filter ("
+    " id INTEGER PRIMARY KEY CHECK (id = 1), capacity INTEGER NOT NULL,"
+    " covered INTEGER NOT NULL, count INTEGER NOT NULL, bits BLOB NOT NULL);",
+    # Runs in progress, so garbage collection leaves what they have written alone.
+    "CREATE TABLE run_leases ("
+    " run_id TEXT PRIMARY KEY, owner TEXT NOT NULL, created_at TEXT NOT NULL);",
+)
+
+# Row tables a shard reads through to its parent, with the key under which a
+# shard row shadows the parent's. Blob tables are not listed: blobs a shard did
+# not write are read from the parent store itself.
+_READ_THROUGH = {
+    "runs": ("run_id",),
+    "axioms": ("run_id", "axiom_id"),
+    "models": ("run_id", "axiom_id", "size"),
+    "implications": ("run_id", "axiom_id", "theory"),
+    "metrics": ("run_id", "axiom_id", "name"),
+    "vectors": ("run_id", "axiom_id"),
+    "results_indexes": ("run_id",),
+    "results_columns": ("run_id",),
+    "result_cache": ("kind", "pair_key", "scope_digest", "config_digest"),
+    "notes": (),
+}
+
+
+def _attach_parent(conn: sqlite3.Connection, parent_db: Path) -> None:
+    # Temp views named after the tables shadow them for unqualified reads; writes
+    # name ``main.<table>`` and never reach the read-only parent.
+    conn.execute("ATTACH DATABASE ? AS parent", (parent_db.resolve().as_uri() + "?mode=ro",))
+    for table, key in _READ_THROUGH.items():
+        parent_rows = f"SELECT * FROM parent.{table}"
+        if key:
+            match = " AND ".join(f"m.{column} = p.{column}" for column in key)
+            parent_rows += f" AS p WHERE NOT EXISTS (SELECT 1 FROM main.{table} AS m WHERE {match})"
+        conn.execute(
+            f"CREATE TEMP VIEW {table} AS SELECT * FROM main.{table} UNION ALL {parent_rows}"
+        )
+
+
+class StoreSession:
+    # ``lock`` serializes use of the connection when a StoreWriter thread shares it.
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        batch_size: int,
+        lock: Optional[threading.RLock] = None,
+    ) -> None:
+        self.conn = conn
+        self.batch_size = batch_size
+        self.lock = lock if lock is not None else threading.RLock()
+        self.pending = 0
+        self.commits = 0
+
+    def mark(self) -> None:
+        with self.lock:
+            self.pending += 1
+            if self.pending >= self.batch_size:
+                self.commit()
+
+    def commit(self) -> None:
+        with self.lock:
+            self.conn.commit()
+            self.pending = 0
+            self.commits += 1
+
+
+class StoreWriter:
+    # Runs submitted calls in order on one background thread. The thread adopts
+    # the caller's store session, so rows land on the same connection and commit
+    # at the same marks as synchronous writes. ``submit`` blocks while
+    # ``queue_size`` calls are pending. A failed call stops the writer; the error
+    # is re-raised by the next ``submit`` or by ``close``, which otherwise waits
+    # for every pending call.
+    def __init__(self, store: "ArtifactStore", queue_size: int = 64) -> None:
+        if queue_size < 1:
+            raise ValueError("queue_size must be >= 1.")
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        session = getattr(store._local, "session", None)
+        self._thread = threading.Thread(
+            target=self._run, args=(store, session), name="store-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, store: "ArtifactStore", session: Optional[StoreSession]) -> None:
+        store._local.session = session
+        try:
+            for fn, args in iter(self._queue.get, None):
+                fn(*args)
+        except BaseException as exc:
+            self._error = exc
+            # Keep consuming so a producer blocked on a full queue wakes up.
+            for _ in iter(self._queue.get, None):
+                pass
+        finally:
+            store._local.session = None
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        self._check()
+        self._queue.put((fn, args))
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._check()
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+
+# False-positive rate of the archive index's Bloom filter at capacity.
+_ARCHIVE_ERROR_RATE = 0.01
+
+
+class ArchiveIndex:
+    # Every archived symmetry class. A Bloom filter answers most novel classes from
+    # memory; a hit is confirmed by ``lookup`` against the axioms table, so false
+    # positives never change an answer. Classes added by this process are also held
+    # exactly, since the background store writer may not have recorded them yet.
+    # The writer thread adds classes while the runner checks them, so both take
+    # the lock; ``lookup`` runs outside it.
+    def __init__(
+        self,
+        capacity: int,
+        lookup: Callable[[str], bool],
+        bits: Optional[bytes] = None,
+        count: int = 0,
+    ) -> None:
+        self.capacity = max(capacity, 1)
+        self.count = count
+        bit_count = -self.capacity * math.log(_ARCHIVE_ERROR_RATE) / (math.log(2) ** 2)
+        self._bit_count = max(64, int(bit_count))
+        self._hash_count = max(1, round(self._bit_count / self.capacity * math.log(2)))
+        self._bits = bytearray(bits) if bits is not None else bytearray((self._bit_count + 7) // 8)
+        if len(self._bits) != (self._bit_count + 7) // 8:
+            raise ValueError("Archive filter does not match its capacity.")
+        self._lookup = lookup
+        self._added: set[bytes] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(symmetry_class: str) -> bytes:
+        return hashlib.blake2b(symmetry_class.encode("utf-8"), digest_size=16).digest()
+
+    def _positions(self, key: bytes) -> Iterator[int]:
+        first = int.from_bytes(key[:8], "little")
+        step = int.from_bytes(key[8:], "little") | 1
+        for index in range(self._hash_count):
+            yield (first + index * step) % self._bit_count
+
+    def _set_bits(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def load(self, symmetry_class: str) -> None:
+        # A class already recorded in the store: only the filter needs it.
+        with self._lock:
+            self._set_bits(self._key(symmetry_class))
+            self.count += 1
+
+    def add(self, symmetry_class: str) -> None:
+        key = self._key(symmetry_class)
+        with self._lock:
+            if key not in self._added:
+                self._added.add(key)
+                self._set_bits(key)
+
+    def contains(self, symmetry_class: str) -> bool:
+        key = self._key(symmetry_class)
+        with self._lock:
+            if key in self._added:
+                return True
+            for position in self._positions(key):
+                if not self._bits[position >> 3] & (1 << (position & 7)):
+                    return False
+        return self._lookup(symmetry_class)
+
+    def bits(self) -> bytes:
+        with self._lock:
+            return bytes(self._bits)
+
+
+def _pack_vector(vector: Sequence[float]) -> bytes:
+    return struct.pack(f"<{len(vector)}d", *vector)
+
+
+def _unpack_vector(payload: bytes) -> tuple[float, ...]:
+    return struct.unpack(f"<{len(payload) // 8}d", payload)
+
+
+def _cosine(left: Sequence[float], right: Sequence[float]) -> float:
+    norm = math.sqrt(sum(value * value for value in left) * sum(value * value for value in right))
+    if norm == 0.0:
+        return 1.0 if not any(left) and not any(right) else 0.0
+    return sum(a * b for a, b in zip(left, right)) / norm
+
+
+class VectorIndex:
+    # Random-hyperplane LSH. Each band buckets a vector by the signs of
+    # ``band_bits`` projections; vectors sharing a bucket in any band are
+    # candidates, ranked by exact cosine similarity. Hyperplanes come from a fixed
+    # seed, so bucket keys are stable across processes.
+    def __init__(self, bands: int = 12, band_bits: int = 6, seed: int = 0) -> None:
+        self.bands = bands
+        self.band_bits = band_bits
+        self.seed = seed
+        self.dimension: Optional[int] = None
+        self._planes: list[list[float]] = []
+        self._buckets: list[dict[int, set[tuple[str, str]]]] = [{} for _ in range(bands)]
+        self._vectors: dict[tuple[str, str], tuple[float, ...]] = {}
+        self._lock = threading.Lock()
+
+    def _band_keys(self, vector: Sequence[float]) -> list[int]:
+        if self.dimension is None:
+            self.dimension = len(vector)
+            rng = random.Random(self.seed)
+            self._planes = [
+                [rng.gauss(0.0, 1.0) for _ in range(self.dimension)]
+                for _ in range(self.bands * self.band_bits)
+            ]
+        if len(vector) != self.dimension:
+            raise ValueError(f"Expected a vector of length {self.dimension}, got {len(vector)}.")
+        keys = []
+        for band in range(self.bands):
+            key = 0
+            for plane in self._planes[band * self.band_bits : (band + 1) * self.band_bits]:
+                key = (key << 1) | (sum(a * b for a, b in zip(plane, vector)) >= 0.0)
+            keys.append(key)
+        return keys
+
+    def add(self, key: tuple[str, str], vector: Sequence[float]) -> None:
+        vector = tuple(vector)
+        with self._lock:
+            previous = self._vectors.get(key)
+            if previous == vector:
+                return
+            if previous is not None:
+                for band, bucket in enumerate(self._band_keys(previous)):
+                    self._buckets[band][bucket].discard(key)
+            self._vectors[key] = vector
+            for band, bucket in enumerate(self._band_keys(vector)):
+                self._buckets[band].setdefault(bucket, set()).add(key)
+
+    def query(self, vector: Sequence[float], k: int) -> list[tuple[tuple[str, str], float]]:
+        if not self._vectors:
+            return []
+        candidates: set[tuple[str, str]] = set()
+        with self._lock:
+            for band, bucket in enumerate(self._band_keys(vector)):
+                candidates.update(self._buckets[band].get(bucket, ()))
+        scored = [(key, _cosine(vector, self._vectors[key])) for key in candidates]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:k]
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+
 class ArtifactStore:
-    def __init__(self, root: str | Path) -> None:
+    def __init__(
+        self,
+        root: str | Path,
+        codecs: Optional[Dict[str, Optional[str]]] = None,
+        parent: Optional["ArtifactStore"] = None,
+    ) -> None:
         self.root = Path(root)
+        self.parent = parent
         self.root.mkdir(parents=True, exist_ok=True)
         (self.root / "artifacts").mkdir(exist_ok=True)
+        self.codecs = {**_DEFAULT_CODECS, **(codecs or {})}
+        for kind, codec in self.codecs.items():
+            if codec is not None and codec not in _CODECS:
+                raise ValueError(f"Unknown codec for {kind}: {codec}")
         self.db_path = self.root / "store.db"
+        self._local = threading.local()
+        self._archive_index: Optional[ArchiveIndex] = None
+        self._archive_lock = threading.Lock()
+        self._vector_index: Optional[VectorIndex] = None
         self._init_db()
 
     def _init_db(self) -> None:
         schema_path = Path(__file__).with_name("schema.sql")
         schema = schema_path.read_text(encoding="utf-8")
-        with sqlite3.connect(self.db_path) as conn:
+        conn = sqlite3.connect(self.db_path)
+        try:
             conn.executescript(schema)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for index, migration in enumerate(_MIGRATIONS[version:], start=version + 1):
+                conn.executescript(migration)
+                conn.execute(f"PRAGMA user_version = {index}")
+        finally:
+            conn.close()
+
+    def schema_version(self) -> int:
+        with self._connect() as conn:
+            return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+    def _open(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread, uri=True)
+        if self.parent is not None:
+            _attach_parent(conn, self.parent.db_path)
+        return conn
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            with session.lock:
+                yield session.conn
+            return
+        conn = self._open()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def session(self, batch_size: int = 1, synchronous: str = "NORMAL") -> Iterator[StoreSession]:
+        # Store calls made by this thread inside the block share one connection and
+        # commit every ``batch_size`` marked units of work (and at exit).
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1.")
+        current = getattr(self._local, "session", None)
+        if current is not None:
+            # Nested sessions share the outer connection but keep their own batching.
+            nested = StoreSession(current.conn, batch_size, current.lock)
+            try:
+                yield nested
+            finally:
+                nested.commit()
+            return
+        synchronous = synchronous.upper()
+        if synchronous not in _SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown synchronous mode: {synchronous}")
+        conn = self._open(check_same_thread=False)
+        conn.execute("PRAGMA main.journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+        session = StoreSession(conn, batch_size)
+        self._local.session = session
+        try:
+            yield session
+        finally:
+            self._local.session = None
+            try:
+                session.commit()
+            finally:
+                conn.close()
+
+    @contextmanager
+    def writer(self, queue_size: int = 64) -> Iterator[StoreWriter]:
+        # Pending calls are flushed on exit; an error raised inside the block wins
+        # over one from the writer.
+        writer = StoreWriter(self, queue_size)
+        try:
+            yield writer
+        except BaseException:
+            try:
+                writer.close()
+            except BaseException:
+                pass
+            raise
+        writer.close()
+
+    @contextmanager
+    def run_lease(self, run_id: str) -> Iterator[None]:
+        # Held while a run writes, so collect_garbage keeps its rows and anything
+        # written since. Taken and released on a connection of its own, so a sweep
+        # sees it before the run's batched rows commit. A run that dies keeps its
+        # lease until a sweep finds its process gone.
+        self._set_lease(
+            "INSERT OR REPLACE INTO main.run_leases(run_id, owner, created_at) VALUES (?, ?, ?)",
+            (run_id, _lease_owner(), _utc_now()),
+        )
+        try:
+            yield
+        finally:
+            self._set_lease("DELETE FROM main.run_leases WHERE run_id = ?", (run_id,))
+
+    def _set_lease(self, sql: str, params: tuple) -> None:
+        conn = self._open()
+        try:
+            with conn:
+                conn.execute(sql, params)
+        finally:
+            conn.close()
+
+    def archive_index(self) -> ArchiveIndex:
+        # Loaded once per store object, then kept current by record_axiom. Loading
+        # reads the persisted filter plus the archive_classes logged since it was
+        # saved, and saves the extended filter back; it is rebuilt from the whole
+        # log, at twice the size, only once it fills up. A shard starts from its
+        # parent's filter and adds its own classes without saving.
+        with self._archive_lock:
+            if self._archive_index is None:
+                with self._connect() as conn:
+                    self._archive_index = self._load_archive_index(conn)
+            return self._archive_index
+
+    def _load_archive_index(self, conn: sqlite3.Connection) -> ArchiveIndex:
+        schema = "main" if self.parent is None else "parent"
+        row = conn.execute(
+            f"SELECT capacity, covered, count, bits FROM {schema}.archive_filter"
+        ).fetchone()
+        capacity, covered, count, bits = row if row is not None else (0, 0, 0, None)
+        tail = conn.execute(
+            f"SELECT seq, symmetry_class FROM {schema}.archive_classes WHERE seq > ? ORDER BY seq",
+            (covered,),
+        ).fetchall()
+        if row is None or count + len(tail) > capacity:
+            total = conn.execute(f"SELECT COUNT(*) FROM {schema}.archive_classes").fetchone()[0]
+            capacity, covered, count, bits = max(1024, 2 * total), 0, 0, None
+            tail = conn.execute(
+                f"SELECT seq, symmetry_class FROM {schema}.archive_classes ORDER BY seq"
+            ).fetchall()
+        index = ArchiveIndex(capacity, self._archive_lookup, bits, count)
+        for _, symmetry_class in tail:
+            index.load(symmetry_class)
+        if self.parent is None:
+            if tail:
+                conn.execute(
+                    "INSERT OR REPLACE INTO main.archive_filter(id, capacity, covered, count, bits)"
+                    " VALUES (1, ?, ?, ?, ?)",
+                    (index.capacity, tail[-1][0], index.count, index.bits()),
+                )
+        else:
+            for (symmetry_class,) in conn.execute("SELECT symmetry_class FROM main.archive_classes"):
+                index.load(symmetry_class)
+        return index
+
+    def _archive_lookup(self, symmetry_class: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT 1 FROM axioms WHERE symmetry_class = ? LIMIT 1", (symmetry_class,)
+            ).fetchone() is not None
+
+    def vector_index(self) -> VectorIndex:
+        # Same lifecycle as archive_index: loaded once, then kept current by
+        # record_vector.
+        with self._archive_lock:
+            if self._vector_index is None:
+                index = VectorIndex()
+                with self._connect() as conn:
+                    for run_id, axiom_id, payload in conn.execute(
+                        "SELECT run_id, axiom_id, vector FROM vectors"
+                    ):
+                        index.add((run_id, axiom_id), _unpack_vector(payload))
+                self._vector_index = index
+            return self._vector_index
 
     def write_bytes(self, kind: str, data: bytes) -> str:
+        # Artifacts are addressed by the digest of their logical bytes however they
+        # are stored, so plain files written before chunking still resolve.
         digest = _digest_bytes(data)
         artifact_path = _artifact_path(self.root, digest)
-        if not artifact_path.exists():
-            artifact_path.parent.mkdir(parents=True, exist_ok=True)
-            artifact_path.write_bytes(data)
-        with sqlite3.connect(self.db_path) as conn:
+        codec = self.codecs.get(kind)
+        with self._connect() as conn:
+            # The dedupe checks and the artifacts row share one write transaction,
+            # and collect_garbage unlinks files inside its own, so a blob found
+            # here cannot be swept before this row links it again. A connection
+            # already in a transaction holds the write lock from its earlier rows.
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            if codec is None or not data or artifact_path.exists():
+                if not artifact_path.exists():
+                    artifact_path.parent.mkdir(parents=True, exist_ok=True)
+                    artifact_path.write_bytes(data)
+            elif not self._has_chunks(conn, digest):
+                self._write_chunks(conn, digest, data, codec)
+            # Rewrites refresh created_at so garbage collection's grace period covers
+            # a blob that a run is about to link again.
             conn.execute(
-                "INSERT OR IGNORE INTO artifacts(digest, kind, size, created_at) VALUES (?, ?, ?, ?)",
+                "INSERT INTO artifacts(digest, kind, size, created_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(digest) DO UPDATE SET created_at = excluded.created_at",
                 (digest, kind, len(data), _utc_now()),
             )
         return digest
 
+    def _has_chunks(self, conn: sqlite3.Connection, digest: str) -> bool:
+        # A sweep interrupted after unlinking leaves rows whose files are gone.
+        rows = conn.execute(
+            "SELECT chunk_digest FROM artifact_chunks WHERE digest = ?", (digest,)
+        ).fetchall()
+        return bool(rows) and all(_chunk_path(self.root, row[0]).exists() for row in rows)
+
+    def _write_chunks(self, conn: sqlite3.Connection, digest: str, data: bytes, codec: str) -> None:
+        # Chunk files land before their rows, so a row always names a complete file;
+        # a crash in between only leaves an unreferenced file behind.
+        compress = _CODECS[codec][0]
+        recipe = []
+        for position, (start, end) in enumerate(_chunk_spans(data)):
+            chunk = data[start:end]
+            chunk_digest = _digest_bytes(chunk)
+            chunk_path = _chunk_path(self.root, chunk_digest)
+            known = conn.execute(
+                "SELECT 1 FROM chunks WHERE chunk_digest = ?", (chunk_digest,)
+            ).fetchone()
+            if known is None or not chunk_path.exists():
+                stored = compress(chunk)
+                chunk_path.parent.mkdir(parents=True, exist_ok=True)
+                chunk_path.write_bytes(stored)
+                conn.execute(
+                    "INSERT OR REPLACE INTO chunks(chunk_digest, codec, size, stored_size, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (chunk_digest, codec, len(chunk), len(stored), _utc_now()),
+                )
+            recipe.append((digest, position, start, chunk_digest))
+        conn.executemany(
+            "INSERT OR REPLACE INTO artifact_chunks(digest, position, offset, chunk_digest) VALUES (?, ?, ?, ?)",
+            recipe,
+        )
+
+    def _recipe(self, digest: str) -> List[Tuple[int, str, str]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT artifact_chunks.offset, artifact_chunks.chunk_digest, chunks.codec"
+                " FROM artifact_chunks JOIN chunks USING (chunk_digest)"
+                " WHERE artifact_chunks.digest = ? ORDER BY artifact_chunks.position",
+                (digest,),
+            ).fetchall()
+        if not rows:
+            raise FileNotFoundError(f"Unknown artifact: {digest}")
+        return [(int(offset), chunk_digest, codec) for offset, chunk_digest, codec in rows]
+
+    def _holder(self, digest: str) -> "ArtifactStore":
+        if self.parent is None or _artifact_path(self.root, digest).exists():
+            return self
+        with self._connect() as conn:
+            held = conn.execute(
+                "SELECT 1 FROM artifact_chunks WHERE digest = ? LIMIT 1", (digest,)
+            ).fetchone()
+        return self if held else self.parent
+
+    def _read_chunk(self, chunk_digest: str, codec: str) -> bytes:
+        return _CODECS[codec][1](_chunk_path(self.root, chunk_digest).read_bytes())
+
     def write_json(self, kind: str, data: Any) -> str:
         payload = _stable_json(data).encode("utf-8")
         return self.write_bytes(kind, payload)
 
+    # Plain files are tried first and chunks on a miss, so a reader racing
+    # ``collect_garbage(repack=True)`` finds the artifact in one layout or the other.
     def read_bytes(self, digest: str) -> bytes:
-        return _artifact_path(self.root, digest).read_bytes()
+        holder = self._holder(digest)
+        if holder is not self:
+            return holder.read_bytes(digest)
+        try:
+            return _artifact_path(self.root, digest).read_bytes()
+        except FileNotFoundError:
+            pass
+        return b"".join(
+            self._read_chunk(chunk_digest, codec) for _, chunk_digest, codec in self._recipe(digest)
+        )
 
     def read_json(self, digest: str) -> Any:
         return json.loads(self.read_bytes(digest).decode("utf-8"))
 
+    def open_bytes(self, digest: str) -> BinaryIO:
+        holder = self._holder(digest)
+        if holder is not self:
+            return holder.open_bytes(digest)
+        try:
+            return _artifact_path(self.root, digest).open("rb")
+        except FileNotFoundError:
+            pass
+        return io.BufferedReader(_ChunkedReader(self, self._recipe(digest)))
+
+    def read_range(self, digest: str, offset: int, length: int) -> bytes:
+        holder = self._holder(digest)
+        if holder is not self:
+            return holder.read_range(digest, offset, length)
+        try:
+            with _artifact_path(self.root, digest).open("rb") as handle:
+                handle.seek(offset)
+                return handle.read(length)
+        except FileNotFoundError:
+            pass
+        # Only the chunks overlapping the range are decompressed.
+        recipe = self._recipe(digest)
+        first = max(bisect.bisect_right([start for start, _, _ in recipe], offset) - 1, 0)
+        parts = []
+        position = recipe[first][0]
+        for start, chunk_digest, codec in recipe[first:]:
+            if start >= offset + length:
+                break
+            parts.append(self._read_chunk(chunk_digest, codec))
+        return b"".join(parts)[offset - position : offset - position + length]
+
+    def storage_stats(self) -> dict:
+        with self._connect() as conn:
+            artifacts, logical = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts"
+            ).fetchone()
+            chunks, chunk_size, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM chunks"
+            ).fetchone()
+        return {
+            "artifacts": artifacts,
+            "logical_bytes": logical,
+            "chunks": chunks,
+            "chunk_bytes": chunk_size,
+            "chunk_stored_bytes": stored,
+        }
+
+    def collect_garbage(
+        self,
+        grace_seconds: float = 3600.0,
+        dry_run: bool = False,
+        vacuum: bool = False,
+        repack: bool = False,
+    ) -> dict:
+        # Mark: artifacts linked from runs and their sidecars are live; chunks are
+        # live while a surviving artifact lists them. Sweep: rows are dropped and
+        # files unlinked inside one write transaction, which write_bytes' dedupe
+        # checks also take. Readers of live artifacts are never affected. Anything
+        # written within ``grace_seconds`` is kept, and so is anything written
+        # since the oldest live run lease, since a run links its blobs only after
+        # writing them. Leases whose process is gone are dropped.
+        cutoff_time = time.time() - grace_seconds
+        cutoff = datetime.fromtimestamp(cutoff_time, timezone.utc)
+        db_bytes = self._db_bytes()
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            leased = set()
+            stale_leases = []
+            for run_id, owner, created_at in conn.execute(
+                "SELECT run_id, owner, created_at FROM run_leases"
+            ).fetchall():
+                if not _lease_alive(owner):
+                    stale_leases.append((run_id,))
+                    continue
+                leased.add(run_id)
+                cutoff = min(cutoff, _parse_time(created_at))
+            cutoff_time = min(cutoff_time, cutoff.timestamp())
+            conn.executemany("DELETE FROM run_leases WHERE run_id = ?", stale_leases)
+            # Rows of runs that never recorded a runs row (abandoned writers) and the
+            # cache rows those runs wrote go once all of them are past the grace
+            # period; the blobs they would have linked are swept below.
+            recorded = "SELECT run_id FROM runs"
+            newest: Dict[str, datetime] = {}
+            for table in (*_RUN_TABLES, "result_cache"):
+                for run_id, created_at in conn.execute(
+                    f"SELECT run_id, created_at FROM {table}"
+                    f" WHERE run_id IS NOT NULL AND run_id NOT IN ({recorded})"
+                ):
+                    created = _parse_time(created_at)
+                    if run_id not in newest or created > newest[run_id]:
+                        newest[run_id] = created
+            dead_runs = [
+                (run_id,)
+                for run_id, created in newest.items()
+                if created < cutoff and run_id not in leased
+            ]
+            run_rows = 0
+            for table in _RUN_TABLES:
+                run_rows += conn.executemany(
+                    f"DELETE FROM {table} WHERE run_id = ?", dead_runs
+                ).rowcount
+            cache_rows = conn.executemany(
+                "DELETE FROM result_cache WHERE run_id = ?", dead_runs
+            ).rowcount
+            if dead_runs:
+                # Classes only those runs held leave the log; the filter that still
+                # sets their bits is rebuilt on the next load.
+                conn.execute(
+                    "DELETE FROM archive_classes"
+                    " WHERE symmetry_class NOT IN (SELECT symmetry_class FROM axioms)"
+                )
+                conn.execute("DELETE FROM archive_filter")
+            live = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT manifest_digest FROM runs UNION SELECT results_digest FROM runs"
+                    " UNION SELECT index_digest FROM results_indexes"
+                    " UNION SELECT columns_digest FROM results_columns"
+                )
+            }
+            known = set()
+            dead = []
+            for digest, created_at in conn.execute("SELECT digest, created_at FROM artifacts"):
+                known.add(digest)
+                if digest not in live and _parse_time(created_at) < cutoff:
+                    dead.append(digest)
+            chunk_rows = {row[0] for row in conn.execute("SELECT chunk_digest FROM chunks")}
+            conn.executemany("DELETE FROM artifact_chunks WHERE digest = ?", [(d,) for d in dead])
+            conn.executemany("DELETE FROM artifacts WHERE digest = ?", [(d,) for d in dead])
+            dead_chunks = [
+                chunk_digest
+                for chunk_digest, created_at in conn.execute(
+                    "SELECT chunk_digest, created_at FROM chunks"
+                    " WHERE chunk_digest NOT IN (SELECT chunk_digest FROM artifact_chunks)"
+                )
+                if _parse_time(created_at) < cutoff
+            ]
+            conn.executemany("DELETE FROM chunks WHERE chunk_digest = ?", [(c,) for c in dead_chunks])
+            dead_files = [_artifact_path(self.root, digest) for digest in dead]
+            dead_files += [_chunk_path(self.root, chunk_digest) for chunk_digest in dead_chunks]
+            # Files without a row are left over from interrupted writes.
+            dead_files += _stray_files(self.root / "artifacts", known, cutoff_time)
+            dead_files += _stray_files(self.root / "chunks", chunk_rows, cutoff_time)
+            # Unlinked before the commit: a crash in between leaves rows of dead
+            # artifacts without files, which write_bytes rewrites and the next
+            # sweep drops.
+            reclaimed = 0
+            removed = 0
+            for path in dead_files:
+                try:
+                    reclaimed += path.stat().st_size
+                    if not dry_run:
+                        path.unlink()
+                except FileNotFoundError:
+                    continue
+                removed += 1
+            conn.execute("ROLLBACK" if dry_run else "COMMIT")
+        finally:
+            conn.close()
+        report = {
+            "dry_run": dry_run,
+            "live_artifacts": len(live),
+            "artifacts_removed": len(dead),
+            "chunks_removed": len(dead_chunks),
+            "runs_removed": len(dead_runs),
+            "leased_runs": len(leased),
+            "stale_leases_removed": len(stale_leases),
+            "run_rows_removed": run_rows,
+            "cache_rows_removed": cache_rows,
+            "files_removed": removed,
+            "reclaimed_bytes": reclaimed,
+        }
+        if dry_run:
+            return report
+        if dead_runs:
+            with self._archive_lock:
+                self._archive_index = None
+            self._vector_index = None
+        if repack:
+            report["repacked"], report["repacked_bytes"] = self._repack()
+            report["reclaimed_bytes"] += report["repacked_bytes"]
+        if vacuum:
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            try:
+                conn.execute("REINDEX")
+                conn.execute("VACUUM")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
+            report["db_reclaimed_bytes"] = db_bytes - self._db_bytes()
+        return report
+
+    def _repack(self) -> Tuple[int, int]:
+        # Plain files of kinds that now have a codec are rewritten as chunks. The
+        # file is unlinked once the chunks are committed.
+        with self._connect() as conn:
+            rows = conn.execute("SELECT digest, kind FROM artifacts").fetchall()
+        repacked = 0
+        saved = 0
+        for digest, kind in rows:
+            codec = self.codecs.get(kind)
+            artifact_path = _artifact_path(self.root, digest)
+            if codec is None or not artifact_path.exists():
+                continue
+            data = artifact_path.read_bytes()
+            if not data or _digest_bytes(data) != digest:
+                continue
+            with self._connect() as conn:
+                before = conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM chunks").fetchone()[0]
+                self._write_chunks(conn, digest, data, codec)
+                after = conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM chunks").fetchone()[0]
+            artifact_path.unlink()
+            repacked += 1
+            saved += len(data) - (after - before)
+        return repacked, saved
+
+    def _db_bytes(self) -> int:
+        return sum(
+            path.stat().st_size
+            for path in (self.db_path, self.db_path.with_name(self.db_path.name + "-wal"))
+            if path.exists()
+        )
+
+    def shard(self, name: str) -> "ArtifactStore":
+        # A writer-private store under ``shards/<name>``: separate processes write
+        # their own SQLite file and blob tree without contending for this one.
+        # Reads see the shard's rows over this store's, attached read-only.
+        if not name or name.startswith(".") or "/" in name or "\\" in name:
+            raise ValueError(f"Invalid shard name: {name!r}")
+        return ArtifactStore(self.root / "shards" / name, codecs=self.codecs, parent=self)
+
+    def shard_names(self) -> List[str]:
+        shards_root = self.root / "shards"
+        if not shards_root.exists():
+            return []
+        return sorted(path.name for path in shards_root.iterdir() if (path / "store.db").exists())
+
+    def merge_shards(self, names: Optional[Sequence[str]] = None, remove: bool = False) -> dict:
+        # Shards fold in name order. Blobs are deduplicated by digest and copied in
+        # their stored layout before any row names them. A run_id held by several
+        # stores keeps the row with the latest created_at (then the larger digests),
+        # the INSERT OR REPLACE outcome of writing them into one store, and its
+        # per-run rows come from the same store, so the result does not depend on
+        # shard order. Re-merging a shard changes nothing.
+        merged = []
+        report = {"runs": 0, "artifacts": 0, "chunks": 0, "copied_bytes": 0}
+        for name in sorted(self.shard_names() if names is None else names):
+            if not (self.root / "shards" / name / "store.db").exists():
+                raise ValueError(f"Unknown shard: {name}")
+            shard = self.shard(name)
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            try:
+                conn.execute("ATTACH DATABASE ? AS shard", (str(shard.db_path),))
+                # Copied blobs have no row until the commit; holding the write lock
+                # keeps a concurrent sweep from taking them for stray files.
+                conn.execute("BEGIN IMMEDIATE")
+                self._merge_blobs(conn, shard, report)
+                self._merge_rows(conn, report)
+                conn.execute("COMMIT")
+                conn.execute("DETACH DATABASE shard")
+            finally:
+                conn.close()
+            merged.append(name)
+            if remove:
+                shutil.rmtree(shard.root)
+        with self._archive_lock:
+            self._archive_index = None
+        self._vector_index = None
+        return {"shards": merged, **report}
+
+    def _merge_blobs(self, conn: sqlite3.Connection, shard: "ArtifactStore", report: dict) -> None:
+        known_chunks = {row[0] for row in conn.execute("SELECT chunk_digest FROM main.chunks")}
+        for (chunk_digest,) in conn.execute(
+            "SELECT chunk_digest FROM shard.chunks ORDER BY chunk_digest"
+        ).fetchall():
+            if chunk_digest not in known_chunks:
+                report["copied_bytes"] += _copy_blob(
+                    _chunk_path(shard.root, chunk_digest), _chunk_path(self.root, chunk_digest)
+                )
+                report["chunks"] += 1
+        recipes = {row[0] for row in conn.execute("SELECT DISTINCT digest FROM main.artifact_chunks")}
+        for (digest,) in conn.execute(
+            "SELECT digest FROM shard.artifacts WHERE digest NOT IN (SELECT digest FROM main.artifacts)"
+            " ORDER BY digest"
+        ).fetchall():
+            source = _artifact_path(shard.root, digest)
+            target = _artifact_path(self.root, digest)
+            if source.exists() and digest not in recipes and not target.exists():
+                report["copied_bytes"] += _copy_blob(source, target)
+            report["artifacts"] += 1
+
+    def _merge_rows(self, conn: sqlite3.Connection, report: dict) -> None:
+        conn.execute("DROP TABLE IF EXISTS temp.merge_runs")
+        conn.execute(
+            "CREATE TEMP TABLE merge_runs AS SELECT s.run_id FROM shard.runs s"
+            " LEFT JOIN main.runs m ON m.run_id = s.run_id WHERE m.run_id IS NULL"
+            " OR (s.created_at, s.manifest_digest, s.results_digest)"
+            " > (m.created_at, m.manifest_digest, m.results_digest)"
+        )
+        report["runs"] += conn.execute("SELECT COUNT(*) FROM temp.merge_runs").fetchone()[0]
+        conn.execute("INSERT OR IGNORE INTO main.chunks SELECT * FROM shard.chunks")
+        conn.execute(
+            "INSERT OR IGNORE INTO main.artifact_chunks SELECT * FROM shard.artifact_chunks"
+            " WHERE digest NOT IN (SELECT digest FROM main.artifact_chunks)"
+        )
+        conn.execute(
+            "INSERT INTO main.artifacts SELECT * FROM shard.artifacts WHERE true"
+            " ON CONFLICT(digest) DO UPDATE SET created_at = MAX(created_at, excluded.created_at)"
+        )
+        for table in ("runs", *_RUN_TABLES):
+            columns = ", ".join(row[1] for row in conn.execute(f"PRAGMA main.table_info({table})"))
+            winners = "run_id IN (SELECT run_id FROM temp.merge_runs)"
+            conn.execute(f"DELETE FROM main.{table} WHERE {winners}")
+            conn.execute(
+                f"INSERT INTO main.{table}({columns}) SELECT {columns} FROM shard.{table}"
+                f" WHERE {winners}"
+            )
+            if table != "runs":
+                # Rows of runs that never recorded a runs row (interrupted writers).
+                conn.execute(
+                    f"INSERT OR REPLACE INTO main.{table}({columns}) SELECT {columns}"
+                    f" FROM shard.{table} WHERE run_id NOT IN (SELECT run_id FROM shard.runs)"
+                    " AND run_id NOT IN (SELECT run_id FROM main.runs)"
+                )
+        conn.execute(
+            "INSERT INTO main.result_cache SELECT * FROM shard.result_cache WHERE true"
+            " ON CONFLICT(kind, pair_key, scope_digest, config_digest) DO UPDATE SET"
+            " status = excluded.status,"
+            " budget_json = excluded.budget_json, payload_json = excluded.payload_json,"
+            " created_at = excluded.created_at, run_id = excluded.run_id"
+            " WHERE (excluded.created_at, excluded.payload_json)"
+            " > (result_cache.created_at, result_cache.payload_json)"
+        )
+        conn.execute(
+            "INSERT INTO main.notes(run_id, axiom_id, body, created_at)"
+            " SELECT run_id, axiom_id, body, created_at FROM shard.notes s WHERE NOT EXISTS ("
+            "SELECT 1 FROM main.notes m WHERE m.run_id = s.run_id AND m.axiom_id = s.axiom_id"
+            " AND m.body = s.body AND m.created_at = s.created_at) ORDER BY note_id"
+        )
+        conn.execute("DROP TABLE temp.merge_runs")
+
     def record_run(
         self,
         run_id: str,
@@ -159,9 +1219,9 @@ class ArtifactStore:
         manifest_digest: str,
         results_digest: str,
     ) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
-                "INSERT OR REPLACE INTO runs(run_id, created_at, spec_json, battery_config_json, manifest_digest, results_digest)"
+                "INSERT OR REPLACE INTO main.runs(run_id, created_at, spec_json, battery_config_json, manifest_digest, results_digest)"
                 " VALUES (?, ?, ?, ?, ?, ?)",
                 (
                     run_id,
@@ -173,8 +1233,36 @@ class ArtifactStore:
                 ),
             )
 
+    def record_results_index(self, run_id: str, index_digest: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO main.results_indexes(run_id, index_digest, created_at) VALUES (?, ?, ?)",
+                (run_id, index_digest, _utc_now()),
+            )
+
+    def load_results_index(self, run_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT index_digest FROM results_indexes WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def record_results_columns(self, run_id: str, columns_digest: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO main.results_columns(run_id, columns_digest, created_at) VALUES (?, ?, ?)",
+                (run_id, columns_digest, _utc_now()),
+            )
+
+    def load_results_columns(self, run_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT columns_digest FROM results_columns WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
     def load_run(self, run_id: str) -> Optional[RunRecord]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             row = conn.execute(
                 "SELECT spec_json, battery_config_json, manifest_digest, results_digest FROM runs WHERE run_id = ?",
                 (run_id,),
@@ -198,15 +1286,17 @@ class ArtifactStore:
         right_term: str,
         symmetry_class: str,
     ) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
-                "INSERT OR REPLACE INTO axioms(run_id, axiom_id, left_term, right_term, symmetry_class, created_at)"
+                "INSERT OR REPLACE INTO main.axioms(run_id, axiom_id, left_term, right_term, symmetry_class, created_at)"
                 " VALUES (?, ?, ?, ?, ?, ?)",
                 (run_id, axiom_id, left_term, right_term, symmetry_class, _utc_now()),
             )
+        if self._archive_index is not None:
+            self._archive_index.add(symmetry_class)
 
     def load_axiom(self, run_id: str, axiom_id: str) -> Optional[AxiomRecord]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             row = conn.execute(
                 "SELECT left_term, right_term, symmetry_class FROM axioms WHERE run_id = ? AND axiom_id = ?",
                 (run_id, axiom_id),
@@ -223,7 +1313,7 @@ class ArtifactStore:
         )
 
     def list_axioms(self, run_id: str) -> list[AxiomRecord]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute(
                 "SELECT axiom_id, left_term, right_term, symmetry_class FROM axioms WHERE run_id = ?",
                 (run_id,),
@@ -240,7 +1330,7 @@ class ArtifactStore:
         ]
 
     def lookup_axiom_by_symmetry(self, symmetry_class: str) -> Optional[AxiomRecord]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             row = conn.execute(
                 "SELECT run_id, axiom_id, left_term, right_term, symmetry_class"
                 " FROM axioms WHERE symmetry_class = ? ORDER BY created_at LIMIT 1",
@@ -258,12 +1348,79 @@ class ArtifactStore:
         )
 
     def axiom_symmetry_exists(self, symmetry_class: str) -> bool:
-        return self.lookup_axiom_by_symmetry(symmetry_class) is not None
+        return self.archive_index().contains(symmetry_class)
+
+    def axioms_by_symmetry(
+        self, symmetry_class: str, limit: Optional[int] = None
+    ) -> list[AxiomRecord]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT run_id, axiom_id, left_term, right_term FROM axioms"
+                " WHERE symmetry_class = ? ORDER BY created_at, run_id, axiom_id LIMIT ?",
+                (symmetry_class, -1 if limit is None else limit),
+            ).fetchall()
+        return [
+            AxiomRecord(
+                run_id=run_id,
+                axiom_id=axiom_id,
+                left_term=left_term,
+                right_term=right_term,
+                symmetry_class=symmetry_class,
+            )
+            for run_id, axiom_id, left_term, right_term in rows
+        ]
+
+    def top_axioms_by_metric(
+        self, name: str, k: int = 10, descending: bool = True, run_id: Optional[str] = None
+    ) -> list[MetricRecord]:
+        order = "DESC" if descending else "ASC"
+        query = "SELECT run_id, axiom_id, value FROM metrics WHERE name = ? AND value IS NOT NULL"
+        params: list[Any] = [name]
+        if run_id is not None:
+            query += " AND run_id = ?"
+            params.append(run_id)
+        query += f" ORDER BY value {order}, run_id, axiom_id LIMIT ?"
+        params.append(k)
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [
+            MetricRecord(run_id=row_run_id, axiom_id=axiom_id, name=name, value=value, value_json=None)
+            for row_run_id, axiom_id, value in rows
+        ]
+
+    def models_by_fingerprint(self, fingerprint: str) -> list[ModelRecord]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT run_id, axiom_id, size, status, candidates, elapsed_seconds"
+                " FROM models WHERE fingerprint = ? ORDER BY run_id, axiom_id, size",
+                (fingerprint,),
+            ).fetchall()
+        return [
+            ModelRecord(
+                run_id=run_id,
+                axiom_id=axiom_id,
+                size=size,
+                status=status,
+                fingerprint=fingerprint,
+                candidates=candidates,
+                elapsed_seconds=elapsed_seconds,
+            )
+            for (run_id, axiom_id, size, status, candidates, elapsed_seconds) in rows
+        ]
+
+    def record_vector(self, run_id: str, axiom_id: str, vector: Sequence[float]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO main.vectors(run_id, axiom_id, vector, created_at) VALUES (?, ?, ?, ?)",
+                (run_id, axiom_id, _pack_vector(vector), _utc_now()),
+            )
+        if self._vector_index is not None:
+            self._vector_index.add((run_id, axiom_id), vector)
 
     def record_models(self, run_id: str, axiom_id: str, models: list[ModelRecord]) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.executemany(
-                "INSERT OR REPLACE INTO models(run_id, axiom_id, size, status, fingerprint, candidates, elapsed_seconds, created_at)"
+                "INSERT OR REPLACE INTO main.models(run_id, axiom_id, size, status, fingerprint, candidates, elapsed_seconds, created_at)"
                 " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
                 [
                     (
@@ -281,7 +1438,7 @@ class ArtifactStore:
             )
 
     def load_models(self, run_id: str, axiom_id: str) -> list[ModelRecord]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute(
                 "SELECT size, status, fingerprint, candidates, elapsed_seconds"
                 " FROM models WHERE run_id = ? AND axiom_id = ? ORDER BY size",
@@ -303,9 +1460,9 @@ class ArtifactStore:
     def record_implications(
         self, run_id: str, axiom_id: str, implications: list[ImplicationRecord]
     ) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.executemany(
-                "INSERT OR REPLACE INTO implications(run_id, axiom_id, theory, status, checked_max_size,"
+                "INSERT OR REPLACE INTO main.implications(run_id, axiom_id, theory, status, checked_max_size,"
                 " counterexample_size, counterexample_fingerprint, proof_status, proof_elapsed_seconds, proof_steps_json, created_at)"
                 " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
                 [
@@ -327,7 +1484,7 @@ class ArtifactStore:
             )
 
     def load_implications(self, run_id: str, axiom_id: str) -> list[ImplicationRecord]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute(
                 "SELECT theory, status, checked_max_size, counterexample_size, counterexample_fingerprint,"
                 " proof_status, proof_elapsed_seconds, proof_steps_json"
@@ -359,20 +1516,69 @@ class ArtifactStore:
             ) in rows
         ]
 
+    def filter_implications(
+        self,
+        status: Optional[str] = None,
+        theory: Optional[str] = None,
+        run_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[ImplicationRecord]:
+        clauses = []
+        params: list[Any] = []
+        for column, value in (("status", status), ("theory", theory), ("run_id", run_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(-1 if limit is None else limit)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT run_id, axiom_id, theory, status, checked_max_size, counterexample_size,"
+                " counterexample_fingerprint, proof_status, proof_elapsed_seconds, proof_steps_json"
+                f" FROM implications{where} ORDER BY run_id, axiom_id, theory LIMIT ?",
+                params,
+            ).fetchall()
+        return [
+            ImplicationRecord(
+                run_id=row_run_id,
+                axiom_id=axiom_id,
+                theory=row_theory,
+                status=row_status,
+                checked_max_size=checked_max_size,
+                counterexample_size=counterexample_size,
+                counterexample_fingerprint=counterexample_fingerprint,
+                proof_status=proof_status,
+                proof_elapsed_seconds=proof_elapsed_seconds,
+                proof_steps=_deserialize_proof_steps(proof_steps_json),
+            )
+            for (
+                row_run_id,
+                axiom_id,
+                row_theory,
+                row_status,
+                checked_max_size,
+                counterexample_size,
+                counterexample_fingerprint,
+                proof_status,
+                proof_elapsed_seconds,
+                proof_steps_json,
+            ) in rows
+        ]
+
     def record_metrics(self, run_id: str, axiom_id: str, metrics: dict[str, Any]) -> None:
         rows = []
         for name, value in metrics.items():
             numeric, payload = _metric_payload(value)
             rows.append((run_id, axiom_id, name, numeric, payload, _utc_now()))
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.executemany(
-                "INSERT OR REPLACE INTO metrics(run_id, axiom_id, name, value, value_json, created_at)"
+                "INSERT OR REPLACE INTO main.metrics(run_id, axiom_id, name, value, value_json, created_at)"
                 " VALUES (?, ?, ?, ?, ?, ?)",
                 rows,
             )
 
     def load_metrics(self, run_id: str, axiom_id: str) -> dict[str, Any]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute(
                 "SELECT name, value, value_json FROM metrics WHERE run_id = ? AND axiom_id = ?",
                 (run_id, axiom_id),
@@ -381,9 +1587,9 @@ class ArtifactStore:
 
     def add_note(self, run_id: str, axiom_id: str, body: str) -> NoteRecord:
         created_at = _utc_now()
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
-                "INSERT INTO notes(run_id, axiom_id, body, created_at) VALUES (?, ?, ?, ?)",
+                "INSERT INTO main.notes(run_id, axiom_id, body, created_at) VALUES (?, ?, ?, ?)",
                 (run_id, axiom_id, body, created_at),
             )
             note_id = int(cursor.lastrowid)
@@ -396,7 +1602,7 @@ class ArtifactStore:
         )
 
     def load_notes(self, run_id: str, axiom_id: str) -> list[NoteRecord]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute(
                 "SELECT note_id, body, created_at FROM notes WHERE run_id = ? AND axiom_id = ? ORDER BY note_id",
                 (run_id, axiom_id),
@@ -411,3 +1617,71 @@ class ArtifactStore:
             )
             for (note_id, body, created_at) in rows
         ]
+
+    def record_cached_result(
+        self,
+        kind: str,
+        pair_key: str,
+        scope_digest: str,
+        config_digest: str,
+        status: str,
+        budget: dict[str, Any],
+        payload: dict[str, Any],
+        run_id: Optional[str] = None,
+    ) -> None:
+        self.record_cached_results(
+            [(kind, pair_key, scope_digest, config_digest, status, budget, payload)], run_id
+        )
+
+    def record_cached_results(
+        self,
+        rows: Sequence[Tuple[str, str, str, str, str, dict, dict]],
+        run_id: Optional[str] = None,
+    ) -> None:
+        # Rows are (kind, pair_key, scope_digest, config_digest, status, budget,
+        # payload), written in order; a later row replaces an earlier one.
+        # ``run_id`` names the run that produced them.
+        if not rows:
+            return
+        created_at = _utc_now()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO main.result_cache(kind, pair_key, scope_digest, config_digest, status,"
+                " budget_json, payload_json, created_at, run_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        kind,
+                        pair_key,
+                        scope_digest,
+                        config_digest,
+                        status,
+                        _stable_json(budget),
+                        _stable_json(payload),
+                        created_at,
+                        run_id,
+                    )
+                    for kind, pair_key, scope_digest, config_digest, status, budget, payload in rows
+                ],
+            )
+
+    def load_cached_results(
+        self, kind: str, pair_key: str, scope_digest: str
+    ) -> list[CachedResultRecord]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT config_digest, status, budget_json, payload_json FROM result_cache"
+                " WHERE kind = ? AND pair_key = ? AND scope_digest = ? ORDER BY config_digest",
+                (kind, pair_key, scope_digest),
+            ).fetchall()
+        return [
+            CachedResultRecord(
+                kind=kind,
+                pair_key=pair_key,
+                scope_digest=scope_digest,
+                config_digest=config_digest,
+                status=status,
+                budget=json.loads(budget_json),
+                payload=json.loads(payload_json),
+            )
+            for (config_digest, status, budget_json, payload_json) in rows
+        ]
@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from axlab.core.term import Term
+from axlab.core.universe_spec import UniverseSpec
+from axlab.engines.model_finder.interface import ModelSearchConfig
+from axlab.pipeline.cache import ProofCache
+from axlab.pipeline.implications import ImplicationConfig, run_implication_probes
+from axlab.store import ArtifactStore
+
+SPEC = UniverseSpec.from_dict(
+    {
+        "logic": "equational",
+        "max_term_size": 3,
+        "max_vars": 2,
+        "operations": [{"arity": 2, "commutative": False, "name": "f"}],
+        "version": "v0",
+    }
+)
+CONFIG = ImplicationConfig(max_model_size=2, max_model_candidates=100_000)
+
+
+def _comparable(probe):
+    return replace(probe, derived_from=None, proof_elapsed_seconds=None)
+
+
+class ImplicationClosureTests(unittest.TestCase):
+    def test_inferred_probes_match_direct_probes(self) -> None:
+        # A left projection implies associativity, idempotence and the alternative
+        # laws, so most of its confirmations are inferred.
+        axiom = (Term.parse("f(x0,x1)"), Term.parse("x0"))
+        inferred = run_implication_probes(SPEC, axiom, CONFIG)
+        direct = run_implication_probes(SPEC, axiom, replace(CONFIG, infer_closure=False))
+        derived = [
+            probe
+            for probe in inferred
+            if probe.status == "confirmed" and probe.derived_from is not None
+        ]
+        self.assertTrue(derived)
+        self.assertTrue(all(probe.proof_status is not None for probe in derived))
+        self.assertEqual(
+            [_comparable(probe) for probe in inferred], [_comparable(probe) for probe in direct]
+        )
+
+
+class ImplicationCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_counterexample_transfers_only_when_smaller_sizes_were_decided(self) -> None:
+        axioms = [(Term.parse("f(x0,x1)"), Term.parse("x0"))]
+        goal = (Term.parse("f(x0,x1)"), Term.parse("f(x1,x0)"))
+        recorded = ModelSearchConfig(max_candidates=10)
+        requested = ModelSearchConfig(max_candidates=100_000)
+        outcome = ("counterexample", 3, "m3:abc")
+        for decided_below in (False, True):
+            with self.subTest(decided_below=decided_below):
+                cache = ProofCache(ArtifactStore(self.tmp / str(decided_below)))
+                cache.record_implication(
+                    SPEC, axioms, goal, "engine", 4, recorded, outcome, decided_below
+                )
+                self.assertEqual(
+                    cache.lookup_implication(SPEC, axioms, goal, "engine", 4, recorded),
+                    (outcome, True),
+                )
+                expected = (outcome, False) if decided_below else None
+                self.assertEqual(
+                    cache.lookup_implication(SPEC, axioms, goal, "engine", 4, requested),
+                    expected,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from axlab.core.enumerator import enumerate_axioms
+from axlab.core.universe_spec import UniverseSpec
+from axlab.pipeline.battery import BatteryConfig, analyze_axiom
+from axlab.pipeline.metrics import METRIC_KEYS
+from axlab.pipeline.runner import iter_results_as_battery, serialize_battery_results
+
+SPEC = UniverseSpec.from_dict(
+    {
+        "logic": "equational",
+        "max_term_size": 3,
+        "max_vars": 2,
+        "operations": [{"arity": 2, "commutative": False, "name": "f"}],
+        "version": "v0",
+    }
+)
+CONFIG = BatteryConfig(max_model_size=2, max_model_candidates=200, perturbation_max_neighbors=2)
+
+
+class MetricKeyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        left, right = list(enumerate_axioms(SPEC))[5]
+        self.result = analyze_axiom(SPEC, left, right, CONFIG)
+        self.entry = serialize_battery_results([((left, right), self.result)])[0]
+
+    def _lazy(self, entry: dict):
+        path = self.tmp / "results.jsonl"
+        path.write_text(json.dumps(entry) + "\n", encoding="utf-8")
+        [(_, result)] = list(iter_results_as_battery(path, lazy=True))
+        return result
+
+    def test_metric_keys_match_compute_metrics(self) -> None:
+        self.assertEqual(tuple(self.result.metrics), METRIC_KEYS)
+
+    def test_lazy_results_reuse_complete_metrics(self) -> None:
+        stored = dict(self.entry["metrics"], model_found_count=-1)
+        result = self._lazy(dict(self.entry, metrics=stored))
+        self.assertEqual(result.metrics["model_found_count"], -1)
+
+    def test_lazy_results_fill_missing_metrics(self) -> None:
+        stored = dict(self.entry["metrics"], model_found_count=-1)
+        del stored["proof_step_max"]
+        result = self._lazy(dict(self.entry, metrics=stored))
+        self.assertEqual(result.metrics["proof_step_max"], self.result.metrics["proof_step_max"])
+        self.assertEqual(result.metrics["model_found_count"], -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
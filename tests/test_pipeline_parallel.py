@@ -0,0 +1,116 @@
+import json
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from axlab.core.enumerator import enumerate_axioms
+from axlab.core.universe_spec import UniverseSpec
+from axlab.pipeline.battery import BatteryConfig, analyze_axiom
+from axlab.pipeline.runner import RunOptions, run_battery_and_persist, serialize_battery_results
+from axlab.store import ArtifactStore
+
+SPEC = UniverseSpec.from_dict(
+    {
+        "logic": "equational",
+        "max_term_size": 3,
+        "max_vars": 2,
+        "operations": [{"arity": 2, "commutative": False, "name": "f"}],
+        "version": "v0",
+    }
+)
+CONFIG = BatteryConfig(max_model_size=2, max_model_candidates=200, perturbation_max_neighbors=2)
+# Neighbor searches are cut off where the spectrum search of the same equation
+# is decisive, so serving an analyzed axiom's spectrum to a later neighbor would
+# change that neighbor's statuses.
+SIGNATURE_CONFIG = BatteryConfig(
+    max_model_size=2,
+    max_model_candidates=10_000,
+    perturbation_max_neighbors=4,
+    perturbation_max_model_candidates=1,
+)
+
+
+def _untimed(value):
+    if isinstance(value, dict):
+        return {key: _untimed(item) for key, item in value.items() if "elapsed" not in key}
+    if isinstance(value, list):
+        return [_untimed(item) for item in value]
+    return value
+
+
+def _result_lines(path: Path) -> list:
+    return [_untimed(json.loads(line)) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class ParallelRunTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        axioms = list(enumerate_axioms(SPEC))[:12]
+        # Repeated axioms exercise symmetry-class fan-out across workers.
+        self.axioms = axioms + axioms[:3]
+
+    def _run(self, workers: int, config: BatteryConfig = CONFIG) -> tuple:
+        # Every run writes to the same directory so run.json paths match.
+        output = self.tmp / "run"
+        if output.exists():
+            shutil.rmtree(output)
+        store_root = self.tmp / f"store-{workers}"
+        manifest = run_battery_and_persist(
+            SPEC,
+            self.axioms,
+            output,
+            config,
+            store=ArtifactStore(store_root),
+            options=RunOptions(workers=workers),
+        )
+        run_json = (output / "run.json").read_bytes()
+        lines = _result_lines(output / "results.jsonl")
+        with sqlite3.connect(store_root / "store.db") as conn:
+            cache_keys = conn.execute(
+                "SELECT kind, pair_key, scope_digest, config_digest, status, run_id"
+                " FROM result_cache ORDER BY kind, pair_key, scope_digest, config_digest"
+            ).fetchall()
+        return manifest, run_json, lines, cache_keys, ArtifactStore(store_root)
+
+    def test_workers_match_sequential_run(self) -> None:
+        sequential = self._run(1)
+        parallel = self._run(4)
+        self.assertEqual(sequential[0].run_id, parallel[0].run_id)
+        self.assertEqual(sequential[1], parallel[1])
+        self.assertEqual(sequential[2], parallel[2])
+        self.assertEqual(sequential[3], parallel[3])
+
+    def test_signatures_found_in_a_run_are_not_reused_by_it(self) -> None:
+        sequential = self._run(1, SIGNATURE_CONFIG)
+        parallel = self._run(4, SIGNATURE_CONFIG)
+        self.assertEqual(sequential[1], parallel[1])
+        self.assertEqual(sequential[2], parallel[2])
+        alone = [
+            _untimed(
+                serialize_battery_results(
+                    [((left, right), analyze_axiom(SPEC, left, right, SIGNATURE_CONFIG))]
+                )[0]
+            )
+            for left, right in self.axioms
+        ]
+        for line, expected in zip(sequential[2], alone):
+            self.assertEqual(line["perturbation_neighbors"], expected["perturbation_neighbors"])
+        statuses = {
+            status
+            for line in alone
+            for neighbor in line["perturbation_neighbors"]
+            for status in neighbor["model_statuses"]
+        }
+        self.assertIn("cutoff", statuses)
+
+    def test_worker_shards_are_merged(self) -> None:
+        _, _, _, cache_keys, store = self._run(3)
+        self.assertTrue(cache_keys)
+        self.assertEqual(store.shard_names(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
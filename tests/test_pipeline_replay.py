@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from axlab.core.enumerator import enumerate_axioms
+from axlab.core.universe_spec import UniverseSpec
+from axlab.pipeline.battery import BatteryConfig
+from axlab.pipeline.runner import (
+    RunOptions,
+    load_results_as_battery,
+    load_run_manifest,
+    replay_results,
+    replay_run_from_store,
+    run_battery_and_persist,
+    serialize_battery_results,
+)
+from axlab.store import ArtifactStore
+
+SPEC = UniverseSpec.from_dict(
+    {
+        "logic": "equational",
+        "max_term_size": 3,
+        "max_vars": 2,
+        "operations": [{"arity": 2, "commutative": False, "name": "f"}],
+        "version": "v0",
+    }
+)
+CONFIG = BatteryConfig(max_model_size=2, max_model_candidates=200, perturbation_max_neighbors=2)
+LEGACY_RUN = Path(__file__).resolve().parents[1] / "results" / "runs" / "057ea1bd394ac2b6"
+
+
+class ReplayTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_fast_replay_matches_full_load(self) -> None:
+        store = ArtifactStore(self.tmp / "store")
+        axioms = list(enumerate_axioms(SPEC))[:10]
+        manifest = run_battery_and_persist(
+            SPEC,
+            axioms,
+            self.tmp / "run",
+            CONFIG,
+            store=store,
+            options=RunOptions(graded_novelty=True),
+        )
+        results_path = self.tmp / "run" / "results.jsonl"
+        loaded = load_run_manifest(self.tmp / "run" / "run.json")
+        self.assertEqual(loaded.result_cache, manifest.result_cache)
+        self.assertGreater(loaded.result_cache["misses"], 0)
+        full = serialize_battery_results(load_results_as_battery(results_path))
+        self.assertEqual(replay_results(manifest, results_path), full)
+        self.assertEqual(replay_results(manifest, results_path, 2, 5), full[2:5])
+        stored_manifest, stored = replay_run_from_store(store, manifest.run_id)
+        self.assertEqual(stored_manifest.run_id, manifest.run_id)
+        self.assertEqual(stored, full)
+        self.assertEqual(replay_run_from_store(store, manifest.run_id, 3)[1], full[3:])
+
+    def test_legacy_run_replays_through_rehydration(self) -> None:
+        manifest = load_run_manifest(LEGACY_RUN / "run.json")
+        results_path = LEGACY_RUN / "results.jsonl"
+        self.assertIsNone(manifest.results_format)
+        self.assertEqual(
+            replay_results(manifest, results_path),
+            serialize_battery_results(load_results_as_battery(results_path)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from axlab.core.term import Term
+from axlab.core.universe_spec import UniverseSpec
+from axlab.pipeline import runner
+from axlab.pipeline.battery import BatteryConfig
+from axlab.pipeline.runner import RunOptions, run_battery_and_persist
+from axlab.pipeline.scheduler import RunBudget
+from axlab.store import ArtifactStore
+
+SPEC = UniverseSpec.from_dict(
+    {
+        "logic": "equational",
+        "max_term_size": 3,
+        "max_vars": 2,
+        "operations": [{"arity": 2, "commutative": False, "name": "f"}],
+        "version": "v0",
+    }
+)
+CONFIG = BatteryConfig(max_model_size=2, max_model_candidates=4, perturbation_max_neighbors=2)
+BUDGET = RunBudget(max_rounds=3, growth=4.0)
+AXIOMS = [
+    (Term.parse(left), Term.parse(right))
+    for left, right in [
+        ("f(x0,x1)", "f(x1,x0)"),
+        ("f(x1,x0)", "f(x0,x1)"),
+        ("f(x0,x0)", "x0"),
+        ("f(f(x0,x1),x0)", "f(x0,f(x1,x0))"),
+        ("f(x0,f(x0,x1))", "x1"),
+    ]
+]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _failing_after(calls: int, fn):
+    count = [0]
+
+    def wrapper(*args, **kwargs):
+        count[0] += 1
+        if count[0] > calls:
+            raise Interrupted()
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _untimed(value):
+    if isinstance(value, dict):
+        return {
+            key: _untimed(item)
+            for key, item in value.items()
+            if "elapsed" not in key and key != "profile"
+        }
+    if isinstance(value, list):
+        return [_untimed(item) for item in value]
+    return value
+
+
+def _result_lines(path: Path) -> list:
+    return [_untimed(json.loads(line)) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class ResumeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.output = self.tmp / "run"
+
+    def _uninterrupted(self, **kwargs) -> tuple:
+        run_battery_and_persist(
+            SPEC, AXIOMS, self.output, CONFIG, store=ArtifactStore(self.tmp / "full"), **kwargs
+        )
+        expected = (
+            (self.output / "run.json").read_bytes(),
+            _result_lines(self.output / "results.jsonl"),
+        )
+        shutil.rmtree(self.output)
+        return expected
+
+    def _finished(self) -> tuple:
+        # Checkpoints and escalation logs are gone once the run finishes.
+        self.assertEqual(
+            sorted(path.name for path in self.output.iterdir()),
+            ["results.cache.json", "results.index.json", "results.jsonl", "run.json"],
+        )
+        return (
+            (self.output / "run.json").read_bytes(),
+            _result_lines(self.output / "results.jsonl"),
+        )
+
+    def test_resume_after_interrupted_first_pass(self) -> None:
+        expected = self._uninterrupted()
+        store = ArtifactStore(self.tmp / "resumed")
+        with mock.patch.object(runner, "analyze_axiom", _failing_after(2, runner.analyze_axiom)):
+            with self.assertRaises(Interrupted):
+                run_battery_and_persist(SPEC, AXIOMS, self.output, CONFIG, store=store)
+        self.assertTrue((self.output / "checkpoint.json").exists())
+        run_battery_and_persist(
+            SPEC, AXIOMS, self.output, CONFIG, store=store, options=RunOptions(resume=True)
+        )
+        self.assertEqual(self._finished(), expected)
+
+    def test_resume_after_interrupted_escalation(self) -> None:
+        expected = self._uninterrupted(budget=BUDGET)
+        self.assertGreater(json.loads(expected[0])["schedule"]["escalations"], 1)
+        store = ArtifactStore(self.tmp / "resumed")
+        analyzer = runner._escalation_analyzer
+
+        def interrupting(*args):
+            return _failing_after(1, analyzer(*args))
+
+        with mock.patch.object(runner, "_escalation_analyzer", interrupting):
+            with self.assertRaises(Interrupted):
+                run_battery_and_persist(
+                    SPEC, AXIOMS, self.output, CONFIG, store=store, budget=BUDGET
+                )
+        self.assertTrue((self.output / "escalations.jsonl").exists())
+        run_battery_and_persist(
+            SPEC,
+            AXIOMS,
+            self.output,
+            CONFIG,
+            store=store,
+            options=RunOptions(resume=True),
+            budget=BUDGET,
+        )
+        self.assertEqual(self._finished(), expected)
+
+    def test_resume_of_finished_budgeted_run_keeps_schedule(self) -> None:
+        first = run_battery_and_persist(SPEC, AXIOMS, self.output, CONFIG, budget=BUDGET)
+        again = run_battery_and_persist(
+            SPEC, AXIOMS, self.output, CONFIG, options=RunOptions(resume=True), budget=BUDGET
+        )
+        self.assertEqual(again.schedule, first.schedule)
+
+
+if __name__ == "__main__":
+    unittest.main()
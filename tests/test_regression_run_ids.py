@@ -0,0 +1,25 @@
+import unittest
+from pathlib import Path
+
+from axlab.core.universe_spec import UniverseSpec
+from axlab.pipeline.battery import BatteryConfig
+from axlab.pipeline.runner import compute_run_id, load_results_as_battery, load_run_manifest
+
+RUN_DIR = Path(__file__).resolve().parents[1] / "results" / "runs" / "057ea1bd394ac2b6"
+
+
+class RunIdRegressionTests(unittest.TestCase):
+    def test_recorded_run_keeps_its_run_id(self) -> None:
+        # Recorded before the staged battery; new config fields at their defaults
+        # must not change the digest.
+        manifest = load_run_manifest(RUN_DIR / "run.json")
+        spec = UniverseSpec.from_dict(manifest.spec)
+        config = BatteryConfig(**manifest.battery_config)
+        axioms = [axiom for axiom, _ in load_results_as_battery(RUN_DIR / "results.jsonl")]
+        self.assertEqual(len(axioms), manifest.axiom_count)
+        self.assertEqual(compute_run_id(spec, axioms, config), "057ea1bd394ac2b6")
+        self.assertEqual(config.to_dict(), manifest.battery_config)
+
+
+if __name__ == "__main__":
+    unittest.main()
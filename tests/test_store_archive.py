@@ -0,0 +1,74 @@
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from axlab.store import ArtifactStore
+
+RUN = "00archive000000"
+ABANDONED = "00abandoned0000"
+
+
+def _record(store: ArtifactStore, run_id: str, classes: range) -> None:
+    for index in classes:
+        store.record_axiom(run_id, f"{index:064x}", "f(x0,x1)", "x0", f"class-{index}")
+
+
+class ArchiveIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.root = self.tmp / "store"
+        store = ArtifactStore(self.root)
+        _record(store, RUN, range(0, 300))
+        store.record_run(RUN, {}, {}, "a" * 64, "b" * 64)
+
+    def _filter(self) -> tuple:
+        with sqlite3.connect(self.root / "store.db") as conn:
+            return conn.execute("SELECT capacity, covered, count FROM archive_filter").fetchone()
+
+    def _agrees_with_sqlite(self, store: ArtifactStore, classes: range) -> None:
+        index = store.archive_index()
+        for index_class in classes:
+            name = f"class-{index_class}"
+            expected = store.lookup_axiom_by_symmetry(name) is not None
+            self.assertEqual(index.contains(name), expected, name)
+
+    def test_filter_is_saved_and_extended_from_the_log(self) -> None:
+        self._agrees_with_sqlite(ArtifactStore(self.root), range(0, 600))
+        self.assertEqual(self._filter(), (1024, 300, 300))
+        # Another writer's classes are logged and read as a tail on the next load.
+        _record(ArtifactStore(self.root), RUN, range(300, 500))
+        self._agrees_with_sqlite(ArtifactStore(self.root), range(0, 600))
+        self.assertEqual(self._filter(), (1024, 500, 500))
+        # Past capacity the filter is rebuilt at twice the logged classes.
+        _record(ArtifactStore(self.root), RUN, range(500, 1100))
+        self._agrees_with_sqlite(ArtifactStore(self.root), range(0, 1200))
+        self.assertEqual(self._filter(), (2200, 1100, 1100))
+
+    def test_added_classes_are_seen_before_they_are_recorded(self) -> None:
+        index = ArtifactStore(self.root).archive_index()
+        self.assertFalse(index.contains("pending"))
+        index.add("pending")
+        self.assertTrue(index.contains("pending"))
+
+    def test_swept_runs_leave_the_index(self) -> None:
+        store = ArtifactStore(self.root)
+        _record(store, ABANDONED, range(1000, 1010))
+        self.assertTrue(store.archive_index().contains("class-1000"))
+        store.collect_garbage(grace_seconds=0)
+        self.assertIsNone(self._filter())
+        reopened = ArtifactStore(self.root)
+        self._agrees_with_sqlite(reopened, range(0, 1010))
+        self.assertFalse(reopened.archive_index().contains("class-1000"))
+
+    def test_shard_starts_from_its_parent(self) -> None:
+        ArtifactStore(self.root).archive_index()
+        shard = ArtifactStore(self.root).shard("a")
+        _record(shard, "00shard00000000", range(300, 320))
+        self._agrees_with_sqlite(ArtifactStore(self.root).shard("a"), range(0, 400))
+
+
+if __name__ == "__main__":
+    unittest.main()
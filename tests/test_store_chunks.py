@@ -0,0 +1,61 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from axlab.store import ArtifactStore
+
+
+def _lines(start: int, stop: int) -> bytes:
+    return b"".join(
+        f'{{"axiom":{index},"status":"counterexample","size":{index % 7}}}\n'.encode("utf-8")
+        for index in range(start, stop)
+    )
+
+
+class ChunkedStorageTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_round_trip_per_codec(self) -> None:
+        data = _lines(0, 20000)
+        for codec in ("zlib", "lzma"):
+            with self.subTest(codec=codec):
+                store = ArtifactStore(self.tmp / codec, codecs={"blob": codec})
+                digest = store.write_bytes("blob", data)
+                stats = store.storage_stats()
+                self.assertGreater(stats["chunks"], 1)
+                self.assertEqual(stats["chunk_bytes"], len(data))
+                self.assertLess(stats["chunk_stored_bytes"], len(data))
+                self.assertEqual(store.read_bytes(digest), data)
+                with store.open_bytes(digest) as handle:
+                    self.assertEqual(handle.read(), data)
+                for offset, length in ((0, 10), (50000, 4096), (len(data) - 7, 100)):
+                    self.assertEqual(
+                        store.read_range(digest, offset, length), data[offset : offset + length]
+                    )
+
+    def test_overlapping_artifacts_share_chunks(self) -> None:
+        store = ArtifactStore(self.tmp / "store", codecs={"blob": "zlib"})
+        store.write_bytes("blob", _lines(0, 20000))
+        first = store.storage_stats()["chunks"]
+        extended = _lines(0, 21000)
+        digest = store.write_bytes("blob", extended)
+        self.assertLess(store.storage_stats()["chunks"], 2 * first)
+        self.assertEqual(store.read_bytes(digest), extended)
+
+    def test_plain_kinds_stay_files(self) -> None:
+        store = ArtifactStore(self.tmp / "store", codecs={"blob": None})
+        digest = store.write_bytes("blob", b"plain")
+        self.assertEqual(store.storage_stats()["chunks"], 0)
+        self.assertEqual(store.read_bytes(digest), b"plain")
+        self.assertEqual(store.read_range(digest, 1, 3), b"lai")
+
+    def test_unknown_codec_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            ArtifactStore(self.tmp / "store", codecs={"blob": "brotli"})
+
+
+if __name__ == "__main__":
+    unittest.main()
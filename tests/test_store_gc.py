@@ -0,0 +1,144 @@
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from axlab.core.enumerator import enumerate_axioms
+from axlab.core.universe_spec import UniverseSpec
+from axlab.pipeline.battery import BatteryConfig
+from axlab.pipeline.runner import (
+    RunOptions,
+    load_run_columns,
+    replay_run_from_store,
+    run_battery_and_persist,
+)
+from axlab.store import ArtifactStore
+
+SPEC = UniverseSpec.from_dict(
+    {
+        "logic": "equational",
+        "max_term_size": 3,
+        "max_vars": 2,
+        "operations": [{"arity": 2, "commutative": False, "name": "f"}],
+        "version": "v0",
+    }
+)
+CONFIG = BatteryConfig(max_model_size=2, max_model_candidates=200, perturbation_max_neighbors=2)
+ABANDONED = "00abandoned0000"
+IN_PROGRESS = "00inprogress000"
+
+
+class GarbageCollectionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.root = self.tmp / "store"
+        store = ArtifactStore(self.root, codecs={"blob": "zlib"})
+        axioms = list(enumerate_axioms(SPEC))
+        self.run_ids = [
+            run_battery_and_persist(
+                SPEC,
+                axioms[start : start + 8],
+                self.tmp / f"run-{start}",
+                CONFIG,
+                store=store,
+                options=RunOptions(columnar=True),
+            ).run_id
+            for start in (0, 4)
+        ]
+        self.orphan = store.write_bytes("blob", b"orphan\n" * 5000)
+        # A writer that died before recording its runs row.
+        store.record_axiom(ABANDONED, "a" * 64, "f(x0,x1)", "x0", "f(x0,x1)=x0")
+        store.record_cached_result("implication", "k", "s", "c", "proved", {}, {}, ABANDONED)
+
+    def _snapshot(self) -> dict:
+        store = ArtifactStore(self.root)
+        snapshot = {}
+        for run_id in self.run_ids:
+            manifest, results = replay_run_from_store(store, run_id)
+            columns = load_run_columns(run_id, store=store)
+            snapshot[run_id] = (
+                manifest,
+                results,
+                {name: columns.column(name) for name in columns.columns},
+            )
+            columns.close()
+        return snapshot
+
+    def _cache_rows(self) -> list:
+        with sqlite3.connect(self.root / "store.db") as conn:
+            return conn.execute(
+                "SELECT * FROM result_cache WHERE run_id IS NOT ? ORDER BY kind, pair_key",
+                (ABANDONED,),
+            ).fetchall()
+
+    def test_grace_period_keeps_recent_writes(self) -> None:
+        report = ArtifactStore(self.root).collect_garbage(grace_seconds=3600)
+        self.assertEqual(report["artifacts_removed"], 0)
+        self.assertEqual(report["runs_removed"], 0)
+        self.assertEqual(ArtifactStore(self.root).read_bytes(self.orphan), b"orphan\n" * 5000)
+
+    def test_sweep_keeps_everything_reachable(self) -> None:
+        before = self._snapshot()
+        cache_rows = self._cache_rows()
+        report = ArtifactStore(self.root).collect_garbage(grace_seconds=0, repack=True, vacuum=True)
+        self.assertEqual(report["artifacts_removed"], 1)
+        self.assertGreater(report["chunks_removed"], 0)
+        self.assertEqual(report["runs_removed"], 1)
+        self.assertEqual(report["run_rows_removed"], 1)
+        self.assertEqual(report["cache_rows_removed"], 1)
+        self.assertEqual(self._snapshot(), before)
+        self.assertEqual(self._cache_rows(), cache_rows)
+        store = ArtifactStore(self.root)
+        with self.assertRaises(FileNotFoundError):
+            store.read_bytes(self.orphan)
+        self.assertEqual(store.list_axioms(ABANDONED), [])
+        again = store.collect_garbage(grace_seconds=0)
+        self.assertEqual(again["artifacts_removed"] + again["files_removed"], 0)
+
+    def test_leased_run_is_kept_until_it_finishes(self) -> None:
+        store = ArtifactStore(self.root, codecs={"blob": "zlib"})
+        with store.run_lease(IN_PROGRESS):
+            store.record_axiom(IN_PROGRESS, "b" * 64, "f(x0,x1)", "x1", "f(x0,x1)=x1")
+            pending = store.write_bytes("blob", b"pending\n" * 5000)
+            report = ArtifactStore(self.root).collect_garbage(grace_seconds=0)
+            self.assertEqual(report["leased_runs"], 1)
+            self.assertEqual(report["artifacts_removed"], 1)
+            self.assertEqual(report["runs_removed"], 1)
+            self.assertEqual(store.read_bytes(pending), b"pending\n" * 5000)
+            self.assertEqual(len(store.list_axioms(IN_PROGRESS)), 1)
+        report = store.collect_garbage(grace_seconds=0)
+        self.assertEqual(report["leased_runs"], 0)
+        self.assertEqual(report["runs_removed"], 1)
+        self.assertEqual(report["artifacts_removed"], 1)
+
+    def test_leases_of_dead_processes_are_dropped(self) -> None:
+        dead = subprocess.run(
+            [sys.executable, "-c", "import os; print(os.getpid())"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        with sqlite3.connect(self.root / "store.db") as conn:
+            conn.execute(
+                "INSERT INTO run_leases VALUES (?, ?, ?)",
+                (ABANDONED, f"{socket.gethostname()}:{dead}", "2000-01-01T00:00:00+00:00"),
+            )
+        report = ArtifactStore(self.root).collect_garbage(grace_seconds=0)
+        self.assertEqual(report["stale_leases_removed"], 1)
+        self.assertEqual(report["runs_removed"], 1)
+
+    def test_rewrite_restores_files_of_an_interrupted_sweep(self) -> None:
+        # A sweep that unlinked files but never committed leaves their rows behind.
+        shutil.rmtree(self.root / "chunks")
+        store = ArtifactStore(self.root, codecs={"blob": "zlib"})
+        self.assertEqual(store.write_bytes("blob", b"orphan\n" * 5000), self.orphan)
+        self.assertEqual(store.read_bytes(self.orphan), b"orphan\n" * 5000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from axlab.core.enumerator import enumerate_axioms
+from axlab.core.universe_spec import UniverseSpec
+from axlab.pipeline.battery import BatteryConfig
+from axlab.pipeline.runner import replay_run_from_store, run_battery_and_persist
+from axlab.store import ArtifactStore
+
+SPEC = UniverseSpec.from_dict(
+    {
+        "logic": "equational",
+        "max_term_size": 3,
+        "max_vars": 2,
+        "operations": [{"arity": 2, "commutative": False, "name": "f"}],
+        "version": "v0",
+    }
+)
+CONFIG = BatteryConfig(max_model_size=2, max_model_candidates=200, perturbation_max_neighbors=2)
+TABLES = (
+    "runs",
+    "axioms",
+    "models",
+    "implications",
+    "metrics",
+    "vectors",
+    "results_indexes",
+    "results_columns",
+    "result_cache",
+    "artifacts",
+    "chunks",
+    "artifact_chunks",
+)
+
+
+def _dump(root: Path) -> dict:
+    with sqlite3.connect(root / "store.db") as conn:
+        dump = {table: sorted(conn.execute(f"SELECT * FROM {table}")) for table in TABLES}
+        dump["notes"] = sorted(conn.execute("SELECT run_id, axiom_id, body, created_at FROM notes"))
+    return dump
+
+
+class ShardTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.root = self.tmp / "store"
+        self.store = ArtifactStore(self.root)
+        axioms = list(enumerate_axioms(SPEC))
+        self.main_run = self._run(self.store, axioms[:6], "main")
+        self.shard_runs = {
+            name: self._run(self.store.shard(name), axioms[start : start + 8], name)
+            for name, start in (("a", 4), ("b", 10))
+        }
+        self.store.shard("b").add_note(self.shard_runs["b"], "a" * 64, "seen in b")
+
+    def _run(self, store: ArtifactStore, axioms: list, name: str) -> str:
+        return run_battery_and_persist(
+            SPEC, axioms, self.tmp / f"run-{name}", CONFIG, store=store
+        ).run_id
+
+    def test_shard_reads_through_to_main_store(self) -> None:
+        shard = self.store.shard("a")
+        main_replay = replay_run_from_store(self.store, self.main_run)
+        self.assertEqual(replay_run_from_store(shard, self.main_run), main_replay)
+        main_classes = {record.symmetry_class for record in self.store.list_axioms(self.main_run)}
+        index = shard.archive_index()
+        self.assertTrue(all(index.contains(name) for name in main_classes))
+        # Writes stay in the shard.
+        self.assertIsNone(self.store.load_run(self.shard_runs["a"]))
+        self.assertIsNone(self.store.shard("b").load_run(self.shard_runs["a"]))
+
+    def test_merge_round_trip(self) -> None:
+        expected = {
+            run_id: replay_run_from_store(self.store.shard(name), run_id)
+            for name, run_id in self.shard_runs.items()
+        }
+        copy = self.tmp / "copy"
+        shutil.copytree(self.root, copy)
+        report = self.store.merge_shards()
+        self.assertEqual(report["shards"], ["a", "b"])
+        self.assertEqual(report["runs"], 2)
+        for run_id, replay in expected.items():
+            self.assertEqual(replay_run_from_store(ArtifactStore(self.root), run_id), replay)
+        self.assertEqual(
+            [note.body for note in self.store.load_notes(self.shard_runs["b"], "a" * 64)],
+            ["seen in b"],
+        )
+        merged = _dump(self.root)
+        again = self.store.merge_shards()
+        self.assertEqual(again["runs"], 0)
+        self.assertEqual(_dump(self.root), merged)
+        # Folding the shards one at a time in the other order gives the same store.
+        reordered = ArtifactStore(copy)
+        reordered.merge_shards(["b"], remove=True)
+        reordered.merge_shards(["a"], remove=True)
+        self.assertEqual(reordered.shard_names(), [])
+        self.assertEqual(_dump(copy), merged)
+
+
+if __name__ == "__main__":
+    unittest.main()